@@ -0,0 +1,308 @@
+"""
+Runs matching, parsing and normalization for every file of a directory, like an
+upload would, and reports the time spent per technique.
+
+    python -m nomad_perotf.ingest tests/data --workers 4 --json report.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+from nomad.datamodel.context import ServerLocalContext
+
+from nomad_perotf.parsers.archive_writer import timed
+from nomad_perotf.parsers.measurement_files import split_measurement_file_name
+from nomad_perotf.schema_packages.parsers.layouts import layout_cache_stats
+from nomad_perotf.schema_packages.raw_files import io_counters
+
+STAGES = ('match', 'parse', 'normalize')
+REPORT_COLUMNS = (
+    'technique',
+    'files',
+    'errors',
+    'total_s',
+    'median_s',
+    'p95_s',
+    'bytes',
+    'bytes_read',
+    'layout_hits',
+    'layout_misses',
+    'peak_rss_mb',
+)
+
+
+def list_files(directory):
+    """All files below ``directory`` that NOMAD would look at, sorted."""
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        paths.extend(
+            os.path.join(root, f) for f in sorted(files) if not f.startswith(('.', '~'))
+        )
+    return paths
+
+
+# the modules that look up samples by lab id, which needs the search index
+SAMPLE_REFERENCE_MODULES = (
+    'nomad_perotf.parsers.perotf_measurement_parser',
+    'nomad_perotf.schema_packages.perotf_package',
+)
+INGEST_UPLOAD_ID = 'ingest'
+
+
+class IngestContext(ServerLocalContext):
+    """
+    The context of a local upload of ``directory``. Files that parsers and
+    normalizers write, like the archives of child entries, go to
+    ``output_directory``, so the directory itself is left as it is. Files whose
+    processing they request are collected in ``updated``.
+    """
+
+    def __init__(self, directory, output_directory):
+        super().__init__(directory)
+        self.output_directory = output_directory
+        self.updated = []
+
+    @property
+    def upload_id(self):
+        return INGEST_UPLOAD_ID
+
+    def local_path(self, path, write=False):
+        output = os.path.join(self.output_directory, path)
+        if write or os.path.exists(output):
+            return output
+        return os.path.join(self._mainfile_dir, path)
+
+    def raw_file(self, path, mode='r', *args, **kwargs):
+        write = any(flag in mode for flag in 'wax+')
+        local_path = self.local_path(path, write)
+        if write:
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            source = os.path.join(self._mainfile_dir, path)
+            # files that are updated in place start from the one of the upload
+            if (
+                '+' in mode
+                and not os.path.exists(local_path)
+                and os.path.exists(source)
+            ):
+                shutil.copyfile(source, local_path)
+        return open(local_path, mode, *args, **kwargs)
+
+    def raw_path_exists(self, path):
+        return os.path.exists(self.local_path(path))
+
+    def process_updated_raw_file(self, path, allow_modify=False):
+        self.updated.append(path)
+
+
+@contextmanager
+def _without_sample_references():
+    """Skips the sample lookups, there is no search index to run them on."""
+    with ExitStack() as stack:
+        for module in SAMPLE_REFERENCE_MODULES:
+            stack.enter_context(
+                mock.patch(f'{module}.set_sample_reference', lambda *args: None)
+            )
+        yield
+
+
+def _parse(parser, path, context, logger):
+    """Runs ``parser`` on the file ``path`` of ``context`` like NOMAD does."""
+    from nomad.datamodel import EntryArchive, EntryMetadata
+
+    mainfile = os.path.abspath(context.local_path(path))
+    archive = EntryArchive(
+        m_context=context,
+        metadata=EntryMetadata(mainfile=mainfile, upload_id=INGEST_UPLOAD_ID),
+    )
+    cwd = os.getcwd()
+    try:
+        os.chdir(os.path.dirname(mainfile))
+        parser.parse(mainfile, archive, logger=logger)
+    finally:
+        os.chdir(cwd)
+    if archive.metadata.domain is None:
+        archive.metadata.domain = parser.domain
+    return archive
+
+
+def technique_of(path, parser_name):
+    if parser_name is None:
+        return 'unmatched'
+    if parser_name == 'PeroTFParser':
+        return split_measurement_file_name(path)[2]
+    if parser_name == 'PeroTFExperimentParser':
+        return 'batch'
+    return parser_name
+
+
+def _peak_rss_mb():
+    # kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _layout_lookups():
+    stats = layout_cache_stats().values()
+    return sum(s['hits'] for s in stats), sum(s['misses'] for s in stats)
+
+
+def ingest_file(path):
+    """
+    Matches, parses and normalizes one file, returns its timings. The entries
+    the file creates, like the measurement entry of a raw measurement file, are
+    parsed and normalized as well and counted for the file, their archives are
+    written to a temporary directory.
+    """
+    from nomad.client import normalize_all
+    from nomad.parsing.parsers import match_parser
+    from nomad.utils import get_logger
+
+    record = {'path': path, 'bytes': os.path.getsize(path), 'error': None}
+    record.update(dict.fromkeys(STAGES, 0.0))
+    bytes_read = io_counters['bytes_read']
+    layout_hits, layout_misses = _layout_lookups()
+    logger = get_logger(__name__)
+    parser_name = None
+    start = time.perf_counter()
+
+    try:
+        with (
+            tempfile.TemporaryDirectory() as output_directory,
+            _without_sample_references(),
+        ):
+            context = IngestContext(os.path.dirname(path), output_directory)
+            pending = [os.path.basename(path)]
+            done = set()
+            while pending:
+                name = pending.pop(0)
+                done.add(name)
+                with timed(record, 'match'):
+                    parser, _ = match_parser(context.local_path(name))
+                if parser is None:
+                    continue
+                if parser_name is None:
+                    parser_name = parser.name
+                with timed(record, 'parse'):
+                    archive = _parse(parser, name, context, logger)
+                with timed(record, 'normalize'):
+                    normalize_all(archive, logger=logger)
+                pending.extend(p for p in context.updated if p not in done)
+                context.updated.clear()
+    except Exception:
+        record['error'] = traceback.format_exc(limit=3)
+    record['total'] = time.perf_counter() - start
+    record['parser'] = parser_name
+    record['technique'] = technique_of(path, parser_name)
+    record['bytes_read'] = io_counters['bytes_read'] - bytes_read
+    hits, misses = _layout_lookups()
+    record['layout_hits'] = hits - layout_hits
+    record['layout_misses'] = misses - layout_misses
+    record['peak_rss_mb'] = _peak_rss_mb()
+    return record
+
+
+def ingest(directory, workers=1):
+    """
+    Ingests every file of ``directory``, in a pool of ``workers`` processes if
+    more than one, and returns one record per file.
+    """
+    paths = list_files(directory)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(ingest_file, paths))
+    return [ingest_file(path) for path in paths]
+
+
+def _percentile(values, q):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+def summarize(records):
+    """
+    Per technique: files, errors, total, median and p95 latency, bytes, layout
+    cache lookups and peak RSS.
+    """
+    by_technique = {}
+    for record in records:
+        by_technique.setdefault(record['technique'], []).append(record)
+
+    summary = []
+    for technique, group in sorted(by_technique.items()):
+        latencies = sorted(r['total'] for r in group)
+        summary.append(
+            {
+                'technique': technique,
+                'files': len(group),
+                'errors': sum(r['error'] is not None for r in group),
+                'total_s': sum(latencies),
+                'median_s': statistics.median(latencies),
+                'p95_s': _percentile(latencies, 95),
+                'bytes': sum(r['bytes'] for r in group),
+                'bytes_read': sum(r['bytes_read'] for r in group),
+                'layout_hits': sum(r.get('layout_hits', 0) for r in group),
+                'layout_misses': sum(r.get('layout_misses', 0) for r in group),
+                'peak_rss_mb': max(r['peak_rss_mb'] for r in group),
+                **{
+                    f'{stage}_s': sum(r.get(stage, 0.0) for r in group)
+                    for stage in STAGES
+                },
+            }
+        )
+    return summary
+
+
+def format_report(summary):
+    rows = [REPORT_COLUMNS] + [
+        tuple(
+            f'{row[c]:.3f}' if isinstance(row[c], float) else str(row[c])
+            for c in REPORT_COLUMNS
+        )
+        for row in summary
+    ]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(REPORT_COLUMNS))]
+    return '\n'.join(
+        '  '.join(value.rjust(width) for value, width in zip(row, widths))
+        for row in rows
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('directory')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--json', help='writes the records and the summary here')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = ingest(args.directory, args.workers)
+    wall = time.perf_counter() - start
+    summary = summarize(records)
+
+    print(format_report(summary))
+    print(f'{len(records)} files in {wall:.2f} s with {args.workers} worker(s)')
+    for record in records:
+        if record['error'] is not None:
+            print(f'\n{record["path"]}:\n{record["error"]}', file=sys.stderr)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(
+                {'wall_s': wall, 'summary': summary, 'records': records}, f, indent=2
+            )
+
+
+if __name__ == '__main__':
+    main()
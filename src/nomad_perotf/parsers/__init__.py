@@ -1,4 +1,5 @@
 from nomad.config.models.plugins import ParserEntryPoint
+from pydantic import Field
 
 
 class PeroTFParserEntryPoint(ParserEntryPoint):
@@ -9,6 +10,10 @@ class PeroTFParserEntryPoint(ParserEntryPoint):
 
 
 class PeroTFExperimentParserEntryPoint(ParserEntryPoint):
+    archive_workers: int = Field(
+        4, description='Threads that serialize and write the batch child entries.'
+    )
+
     def load(self):
         from nomad_perotf.parsers.perotf_batch_parser import (
             PeroTFExperimentParser,
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+ARCHIVE_WORKERS = 4
+FINGERPRINTS_SUFFIX = '.fingerprints.json'
+
+
+@contextmanager
+def timed(timings, stage):
+    """Adds the wall time spent in the block to ``timings[stage]``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def serialize_archive(entity):
+    return json.dumps({'data': entity.m_to_dict(with_root_def=True)})
+
+
+def archive_fingerprint(content):
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def fingerprints_path(mainfile):
+    return f'{mainfile}{FINGERPRINTS_SUFFIX}'
+
+
+def load_fingerprints(archive):
+    """
+    The fingerprints of the child entries stored by the last parse of the
+    mainfile of ``archive``, empty if there are none or they cannot be read.
+    """
+    path = fingerprints_path(archive.metadata.mainfile)
+    try:
+        with archive.m_context.raw_file(path, 'r') as f:
+            fingerprints = json.load(f)
+    except (KeyError, OSError, ValueError):
+        return {}
+    return fingerprints if isinstance(fingerprints, dict) else {}
+
+
+def save_fingerprints(archive, fingerprints):
+    path = fingerprints_path(archive.metadata.mainfile)
+    with archive.m_context.raw_file(path, 'w') as f:
+        json.dump(fingerprints, f, indent=0, sort_keys=True)
+
+
+def write_archives(
+    entries, archive, workers=ARCHIVE_WORKERS, timings=None, fingerprints=None
+):
+    """
+    Writes the child entries ``(file_name, entity)`` of ``archive`` like
+    `create_archive` does for a single one, files that exist already are kept.
+
+    With a ``fingerprints`` dict of file name to content hash, as stored by an
+    earlier parse, existing files are only overwritten if they have a stored
+    hash and it changed. Existing files without one, e.g. from before
+    fingerprints were stored, are kept as they may have been edited since. The
+    dict is updated with the hashes of all entries.
+
+    Entities are serialized and the files written by a pool of ``workers``
+    threads. The upload is told about the new files afterwards, in the order of
+    ``entries``, so the processing order does not depend on the pool.
+    """
+    from nomad.datamodel.context import ClientContext
+
+    if timings is None:
+        timings = {}
+    if isinstance(archive.m_context, ClientContext):
+        return []
+
+    context = archive.m_context
+    exists = {file_name: context.raw_path_exists(file_name) for file_name, _ in entries}
+    if fingerprints is None:
+        entries = [entry for entry in entries if not exists[entry[0]]]
+
+    def write(file_name, content):
+        with context.raw_file(file_name, 'w') as outfile:
+            outfile.write(content)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        with timed(timings, 'serialize'):
+            contents = list(pool.map(serialize_archive, [e for _, e in entries]))
+
+        changed = []
+        for (file_name, _), content in zip(entries, contents):
+            if fingerprints is not None:
+                fingerprint = archive_fingerprint(content)
+                stored = fingerprints.get(file_name)
+                fingerprints[file_name] = fingerprint
+                if exists[file_name] and stored in (None, fingerprint):
+                    continue
+            changed.append((file_name, content))
+
+        with timed(timings, 'write'):
+            list(pool.map(write, [f for f, _ in changed], [c for _, c in changed]))
+
+    with timed(timings, 'process'):
+        for file_name, _ in changed:
+            context.process_updated_raw_file(file_name, allow_modify=exists[file_name])
+    return [file_name for file_name, _ in changed]
+
+
+def write_child_archives(entries, archive, workers=ARCHIVE_WORKERS, timings=None):
+    """
+    Writes the child entries of ``archive`` with `write_archives`, checked
+    against the fingerprints stored by the last parse of its mainfile. The
+    fingerprints are stored again whenever they are missing or changed, also if
+    no file was written, so that later changes of the entries are applied.
+    """
+    from nomad.datamodel.context import ClientContext
+
+    if isinstance(archive.m_context, ClientContext):
+        return []
+
+    stored = load_fingerprints(archive)
+    fingerprints = dict(stored)
+    written = write_archives(entries, archive, workers, timings, fingerprints)
+    fingerprints = {file_name: fingerprints[file_name] for file_name, _ in entries}
+    if fingerprints != stored:
+        save_fingerprints(archive, fingerprints)
+    return written
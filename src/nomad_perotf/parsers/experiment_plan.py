@@ -0,0 +1,188 @@
+import functools
+import os
+import posixpath
+import zipfile
+from xml.etree import ElementTree
+
+import pandas as pd
+
+PLAN_ID_COLUMN = ('Experiment Info', 'Nomad ID')
+PLAN_VERDICT_CACHE_SIZE = 256
+
+
+def row_hashes(df):
+    """
+    One uint64 per row of ``df``. Rows with equal values, NaN included, get equal
+    hashes, so duplicates are the same as for `DataFrame.drop_duplicates`.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False)
+    return pd.Series(hashes.to_numpy(), index=df.index)
+
+
+def group_process_rows(df, col):
+    """
+    Yields the distinct parameter rows of the process column group ``col`` in
+    order of first occurrence, as ``(index, row, lab_ids)``. ``lab_ids`` holds the
+    Nomad IDs of all samples that share the row.
+
+    Samples are grouped by row hash in a single pass instead of comparing every
+    distinct row against every sample.
+    """
+    hashes = row_hashes(df[col])
+    nomad_ids = df['Experiment Info']['Nomad ID']
+    lab_ids = nomad_ids.groupby(hashes, sort=False).agg(list)
+    for j, row in df[col][~hashes.duplicated()].iterrows():
+        yield j, row, lab_ids[hashes[j]]
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _first_sheet_path(xlsx):
+    """Zip member of the first worksheet, the one `pd.read_excel` reads."""
+    rels = ElementTree.fromstring(xlsx.read('xl/_rels/workbook.xml.rels'))
+    worksheets = {
+        e.get('Id'): e.get('Target')
+        for e in rels.iter()
+        if _local_name(e.tag) == 'Relationship'
+        and e.get('Type', '').endswith('/worksheet')
+    }
+    workbook = ElementTree.fromstring(xlsx.read('xl/workbook.xml'))
+    for sheet in workbook.iter():
+        if _local_name(sheet.tag) != 'sheet':
+            continue
+        rel_id = next(v for k, v in sheet.attrib.items() if _local_name(k) == 'id')
+        if rel_id in worksheets:
+            target = worksheets[rel_id]
+            if target.startswith('/'):
+                return target[1:]
+            return posixpath.normpath(posixpath.join('xl', target))
+    raise KeyError('workbook has no worksheet')
+
+
+def _column_index(reference):
+    index = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord('A') + 1
+    return index - 1
+
+
+def _cell_text(cell):
+    """Value of a cell as text and whether it points into the shared strings."""
+    kind = cell.get('t')
+    if kind == 'inlineStr':
+        text = ''.join(e.text or '' for e in cell.iter() if _local_name(e.tag) == 't')
+        return text, False
+    value = next((e.text for e in cell if _local_name(e.tag) == 'v'), None)
+    return value, kind == 's'
+
+
+def _header_cells(xlsx, sheet_path, n_rows):
+    rows = [{} for _ in range(n_rows)]
+    row_number = 0
+    with xlsx.open(sheet_path) as sheet:
+        for _, element in ElementTree.iterparse(sheet):
+            if _local_name(element.tag) != 'row':
+                continue
+            row_number = int(element.get('r', row_number + 1))
+            if row_number > n_rows:
+                break
+            cells = {}
+            for position, cell in enumerate(
+                e for e in element if _local_name(e.tag) == 'c'
+            ):
+                reference = cell.get('r')
+                column = _column_index(reference) if reference else position
+                value, shared = _cell_text(cell)
+                if value is not None:
+                    cells[column] = (value, shared)
+            element.clear()
+            rows[row_number - 1] = cells
+    return rows
+
+
+def _shared_strings(xlsx, count):
+    """The first ``count`` entries of the shared strings table."""
+    strings = []
+    if count == 0 or 'xl/sharedStrings.xml' not in xlsx.namelist():
+        return strings
+    with xlsx.open('xl/sharedStrings.xml') as table:
+        for _, element in ElementTree.iterparse(table):
+            if _local_name(element.tag) != 'si':
+                continue
+            # phonetic runs (rPh) are not part of the value
+            runs = [element] + [e for e in element if _local_name(e.tag) == 'r']
+            strings.append(
+                ''.join(
+                    e.text or ''
+                    for run in runs
+                    for e in run
+                    if _local_name(e.tag) == 't'
+                )
+            )
+            element.clear()
+            if len(strings) == count:
+                break
+    return strings
+
+
+def read_plan_header(path, n_rows=2):
+    """
+    The first ``n_rows`` rows of the first sheet of an xlsx file, each as a list of
+    cell texts. Only the start of the sheet and of the shared strings table are
+    decompressed, so the size of the workbook hardly matters.
+    """
+    with zipfile.ZipFile(path) as xlsx:
+        rows = _header_cells(xlsx, _first_sheet_path(xlsx), n_rows)
+        shared_indices = [
+            int(value) for row in rows for value, shared in row.values() if shared
+        ]
+        strings = _shared_strings(xlsx, max(shared_indices, default=-1) + 1)
+
+    header = []
+    for row in rows:
+        values = [None] * (max(row, default=-1) + 1)
+        for column, (value, shared) in row.items():
+            values[column] = strings[int(value)] if shared else value
+        header.append(values)
+    return header
+
+
+def plan_columns(header):
+    """
+    Column tuples of a two row header, the group names in the first row are
+    forward filled over merged cells like ``pd.read_excel(header=[0, 1])`` does.
+    """
+    groups, names = header
+    columns = []
+    group = None
+    for column in range(max(len(groups), len(names))):
+        if column < len(groups) and groups[column] is not None:
+            group = groups[column]
+        columns.append((group, names[column] if column < len(names) else None))
+    return columns
+
+
+@functools.lru_cache(maxsize=PLAN_VERDICT_CACHE_SIZE)
+def _is_experiment_plan(path, mtime, size):
+    try:
+        header = read_plan_header(path)
+    except Exception:
+        return False
+    return PLAN_ID_COLUMN in plan_columns(header)
+
+
+def is_experiment_plan(path):
+    """
+    Whether ``path`` is a batch xlsx file, i.e. its first sheet has a
+    ``Nomad ID`` column below ``Experiment Info``. The verdict is cached per
+    path and modification time.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return _is_experiment_plan(path, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,103 @@
+import functools
+import os
+
+# techniques whose file names can carry the junction of a multijunction device
+MULTIJUNCTION_TECHNIQUES = frozenset({'jv', 'eqe', 'jvg', 'jvt'})
+# checked in this order, a later match wins
+MULTIJUNCTION_POSITIONS = (('top', 'top'), ('mid', 'mid'), ('bot', 'bottom'))
+# techniques matched regardless of the case of technique and extension
+CASE_INSENSITIVE_TECHNIQUES = frozenset({'sem'})
+
+
+def split_measurement_file_name(mainfile):
+    """
+    Splits ``<sample id>.<notes>.<technique>.<extension>`` into the sample id,
+    the notes, the technique, the extension and the multijunction position.
+    """
+    parts = os.path.basename(mainfile).split('.')
+    notes = parts[1] if len(parts) > 2 else ''
+    technique, extension = parts[-2], parts[-1]
+    position = None
+    if technique in MULTIJUNCTION_TECHNIQUES and len(parts) > 2:
+        for marker, name in MULTIJUNCTION_POSITIONS:
+            if marker in notes:
+                position = name
+    return parts[0], notes, technique, extension, position
+
+
+def _measurement_entry(file_name):
+    from nomad_perotf.schema_packages.perotf_package import peroTF_Measurement
+
+    return peroTF_Measurement()
+
+
+def _jv_entry(file_name):
+    from nomad_perotf.schema_packages.perotf_package import peroTF_JVmeasurement
+
+    return peroTF_JVmeasurement()
+
+
+def _eqe_entry(file_name, header_lines):
+    from nomad_perotf.schema_packages.perotf_package import (
+        SolarCellEQE,
+        peroTF_TFL_GammaBox_EQEmeasurement,
+    )
+
+    sc_eqe = SolarCellEQE()
+    sc_eqe.eqe_data_file = file_name
+    sc_eqe.header_lines = header_lines
+    entry = peroTF_TFL_GammaBox_EQEmeasurement()
+    entry.eqe_data = [sc_eqe]
+    return entry
+
+
+def _mpp_entry(file_name):
+    from nomad_perotf.schema_packages.perotf_package import peroTF_MPPTracking
+
+    return peroTF_MPPTracking()
+
+
+def _uvvis_entry(file_name):
+    from nomad_perotf.schema_packages.perotf_package import peroTF_UVvisMeasurement
+
+    return peroTF_UVvisMeasurement()
+
+
+def _sem_entry(file_name):
+    from nomad_perotf.schema_packages.perotf_package import peroTF_SEM
+
+    entry = peroTF_SEM()
+    entry.detector_data = [file_name]
+    return entry
+
+
+def _abspl_entry(file_name):
+    from nomad_perotf.schema_packages.perotf_package import peroTF_AbsPLMeasurement
+
+    return peroTF_AbsPLMeasurement()
+
+
+# (technique, extension) -> factory(file_name), None matches every extension
+MEASUREMENT_FACTORIES = {
+    ('jv', None): _jv_entry,
+    # Bentham EQE system
+    ('eqe', 'dat'): functools.partial(_eqe_entry, header_lines=63),
+    # Enlitec EQE system
+    ('eqe', 'txt'): functools.partial(_eqe_entry, header_lines=5),
+    ('mpp', 'csv'): _mpp_entry,
+    ('mpp', 'txt'): _mpp_entry,
+    ('uvvis', 'csv'): _uvvis_entry,
+    ('sem', 'tif'): _sem_entry,
+    ('sem', 'tiff'): _sem_entry,
+    ('abspl', 'txt'): _abspl_entry,
+}
+
+
+def measurement_factory(technique, extension):
+    """The factory of the entry of a measurement file, `peroTF_Measurement` if none."""
+    if technique.lower() in CASE_INSENSITIVE_TECHNIQUES:
+        technique, extension = technique.lower(), extension.lower()
+    factory = MEASUREMENT_FACTORIES.get((technique, extension))
+    if factory is None:
+        factory = MEASUREMENT_FACTORIES.get((technique, None), _measurement_entry)
+    return factory
@@ -42,7 +42,6 @@ from baseclasses.helper.solar_cell_batch_mapping import (
     map_sputtering,
     map_substrate,
 )
-from baseclasses.helper.utilities import create_archive
 from nomad.datamodel import EntryArchive
 from nomad.datamodel.data import (
     EntryData,
@@ -55,6 +54,16 @@ from nomad.metainfo import (
 )
 from nomad.parsing import MatchingParser
 
+from nomad_perotf.parsers.archive_writer import (
+    ARCHIVE_WORKERS,
+    timed,
+    write_child_archives,
+)
+from nomad_perotf.parsers.experiment_plan import (
+    group_process_rows,
+    is_experiment_plan,
+    row_hashes,
+)
 from nomad_perotf.schema_packages.perotf_package import (
     peroTF_ALD,
     peroTF_Batch,
@@ -73,12 +82,92 @@ from nomad_perotf.schema_packages.perotf_package import (
     peroTF_ThermalAnnealing,
 )
 
+# (column group pattern, mapper, schema class, needs a material name, options),
+# options turns the column group name into extra arguments of the mapper
+PROCESS_MAPPERS = []
+
+
+def register_process_mapper(
+    pattern, mapper, schema, requires_material=False, options=None
+):
+    """
+    Maps every column group whose name contains ``pattern`` with
+    ``mapper(i, j, lab_ids, row, upload_id, schema, *options(col))``. Mappers run
+    in the order they are registered, those with ``requires_material`` only for
+    rows with a ``Material name``.
+    """
+    PROCESS_MAPPERS.append((pattern, mapper, schema, requires_material, options))
+
+
+def _bind_process_mapper(mapper, schema, extra_args):
+    def map_row(i, j, lab_ids, row, upload_id):
+        return mapper(i, j, lab_ids, row, upload_id, schema, *extra_args)
+
+    return map_row
+
+
+def resolve_process_mappers(col):
+    """The ``(requires_material, map_row)`` pairs of a process column group."""
+    return [
+        (
+            requires_material,
+            _bind_process_mapper(mapper, schema, options(col) if options else ()),
+        )
+        for pattern, mapper, schema, requires_material, options in PROCESS_MAPPERS
+        if pattern in col
+    ]
+
+
+register_process_mapper('Cleaning', map_cleaning, peroTF_Cleaning)
+# register_process_mapper('Laser Scribing', map_laser_scribing, peroTF_LaserScribing)
+register_process_mapper('Generic Process', map_generic, peroTF_Process)
+register_process_mapper('Annealing', map_annealing_class, peroTF_ThermalAnnealing)
+register_process_mapper('Lamination', map_lamination, peroTF_Lamination)
+register_process_mapper(
+    'Evaporation',
+    map_evaporation,
+    peroTF_Evaporation,
+    requires_material=True,
+    options=lambda col: ('Co-Evaporation' in col,),
+)
+register_process_mapper(
+    'Close Space Sublimation',
+    map_close_space_sublimation,
+    peroTF_CloseSpaceSublimation,
+    requires_material=True,
+)
+register_process_mapper(
+    'Spin Coating', map_spin_coating, peroTF_SpinCoating, requires_material=True
+)
+register_process_mapper(
+    'Inkjet Printing',
+    map_inkjet_printing,
+    peroTF_InkjetPrinting,
+    requires_material=True,
+)
+register_process_mapper(
+    'Dip Coating', map_dip_coating, peroTF_DipCoating, requires_material=True
+)
+register_process_mapper(
+    'Slot Die Coating', map_sdc, peroTF_SlotDieCoating, requires_material=True
+)
+register_process_mapper(
+    'Sputtering', map_sputtering, peroTF_Sputtering, requires_material=True
+)
+register_process_mapper(
+    'ALD', map_atomic_layer_deposition, peroTF_ALD, requires_material=True
+)
+
 
 class RawHySprintExperiment(EntryData):
     processed_archive = Quantity(type=Entity, shape=['*'])
 
 
 class PeroTFExperimentParser(MatchingParser):
+    def __init__(self, archive_workers=ARCHIVE_WORKERS, **kwargs):
+        super().__init__(**kwargs)
+        self.archive_workers = archive_workers
+
     def is_mainfile(
         self,
         filename: str,
@@ -92,18 +181,33 @@ class PeroTFExperimentParser(MatchingParser):
         )
         if not is_mainfile_super:
             return False
-        try:
-            df = pd.read_excel(filename, header=[0, 1])
-            df['Experiment Info']['Nomad ID'].dropna().to_list()
-        except Exception:
-            return False
-        return True
+        return is_experiment_plan(filename)
 
     def parse(self, mainfile: str, archive: EntryArchive, logger):
         upload_id = archive.metadata.upload_id
-        # xls = pd.ExcelFile(mainfile)
-        df = pd.read_excel(mainfile, header=[0, 1])
-        df = df[~df['Experiment Info']['Nomad ID'].isna()]
+        timings = {}
+        with timed(timings, 'read'):
+            # xls = pd.ExcelFile(mainfile)
+            df = pd.read_excel(mainfile, header=[0, 1])
+            df = df[~df['Experiment Info']['Nomad ID'].isna()]
+        with timed(timings, 'map'):
+            archives = self._map_plan(df, upload_id)
+
+        entries = [(f'{name}.archive.json', entity) for name, entity in archives]
+        written = write_child_archives(entries, archive, self.archive_workers, timings)
+        refs = [get_reference(upload_id, file_name) for file_name, _ in entries]
+
+        archive.data = RawHySprintExperiment(processed_archive=refs)
+        logger.info(
+            'Batch archives written',
+            archives=len(entries),
+            changed=len(written),
+            workers=self.archive_workers,
+            **{f'{stage}_seconds': round(t, 3) for stage, t in timings.items()},
+        )
+
+    def _map_plan(self, df, upload_id):
+        """The substrate, sample and process entities of a plan, as (name, entity)."""
         sample_ids = df['Experiment Info']['Nomad ID'].dropna().to_list()
         batch_id = '_'.join(sample_ids[0].split('_')[:-1])
         archives = [map_batch(sample_ids, batch_id, upload_id, peroTF_Batch)]
@@ -119,24 +223,22 @@ class PeroTFExperimentParser(MatchingParser):
         substrates_col = [
             s for s in substrates_col if s in df['Experiment Info'].columns
         ]
+        substrate_hashes = row_hashes(df['Experiment Info'][substrates_col])
+        substrate_names = {}
         for i, sub in (
-            df['Experiment Info'][substrates_col].drop_duplicates().iterrows()
-        ):
+            df['Experiment Info'][substrates_col][~substrate_hashes.duplicated()]
+        ).iterrows():
             if pd.isna(sub).all():
                 continue
             substrates.append(
                 (f'{i}_substrate', sub, map_substrate(sub, peroTF_Substrate))
             )
-
-        def find_substrate(d):
-            for s in substrates:
-                if d.equals(s[1]):
-                    return s[0]
+            substrate_names[substrate_hashes[i]] = f'{i}_substrate'
 
         for i, row in df['Experiment Info'].iterrows():
             if pd.isna(row).all():
                 continue
-            substrate_name = find_substrate(row[substrates_col]) + '.archive.json'
+            substrate_name = substrate_names.get(substrate_hashes[i]) + '.archive.json'
             archives.append(
                 map_basic_sample(row, substrate_name, upload_id, peroTF_Sample)
             )
@@ -145,113 +247,18 @@ class PeroTFExperimentParser(MatchingParser):
             if col == 'Experiment Info':
                 continue
 
-            df_dropped = df[col].drop_duplicates()
-            for j, row in df_dropped.iterrows():
+            mappers = resolve_process_mappers(col)
+            if not mappers:
+                continue
+            for j, row, lab_ids in group_process_rows(df, col):
                 if row.isnull().all():
                     continue
-                lab_ids = [
-                    x['Experiment Info']['Nomad ID']
-                    for _, x in df[['Experiment Info', col]].iterrows()
-                    if x[col].astype('object').equals(row.astype('object'))
-                ]
-                if 'Cleaning' in col:
-                    archives.append(
-                        map_cleaning(i, j, lab_ids, row, upload_id, peroTF_Cleaning)
-                    )
-
-                # if 'Laser Scribing' in col:
-                #     archives.append(map_laser_scribing(i, j, lab_ids, row, upload_id))
-
-                if 'Generic Process' in col:  # move up
-                    archives.append(
-                        map_generic(i, j, lab_ids, row, upload_id, peroTF_Process)
-                    )
+                has_material = not pd.isna(row.get('Material name'))
+                for requires_material, map_row in mappers:
+                    if requires_material and not has_material:
+                        continue
+                    archives.append(map_row(i, j, lab_ids, row, upload_id))
 
-                if 'Annealing' in col:  # move up
-                    archives.append(
-                        map_annealing_class(
-                            i, j, lab_ids, row, upload_id, peroTF_ThermalAnnealing
-                        )
-                    )
-
-                if 'Lamination' in col:  # move up
-                    archives.append(
-                        map_lamination(i, j, lab_ids, row, upload_id, peroTF_Lamination)
-                    )
-
-                if pd.isna(row.get('Material name')):
-                    continue
-
-                if 'Evaporation' in col:
-                    coevaporation = False
-                    if 'Co-Evaporation' in col:
-                        coevaporation = True
-                    archives.append(
-                        map_evaporation(
-                            i,
-                            j,
-                            lab_ids,
-                            row,
-                            upload_id,
-                            peroTF_Evaporation,
-                            coevaporation,
-                        )
-                    )
-
-                if 'Close Space Sublimation' in col:
-                    archives.append(
-                        map_close_space_sublimation(
-                            i, j, lab_ids, row, upload_id, peroTF_CloseSpaceSublimation
-                        )
-                    )
-
-                if 'Spin Coating' in col:
-                    archives.append(
-                        map_spin_coating(
-                            i, j, lab_ids, row, upload_id, peroTF_SpinCoating
-                        )
-                    )
-
-                if 'Inkjet Printing' in col:
-                    archives.append(
-                        map_inkjet_printing(
-                            i, j, lab_ids, row, upload_id, peroTF_InkjetPrinting
-                        )
-                    )
-
-                if 'Dip Coating' in col:
-                    archives.append(
-                        map_dip_coating(
-                            i, j, lab_ids, row, upload_id, peroTF_DipCoating
-                        )
-                    )
-
-                if 'Slot Die Coating' in col:
-                    archives.append(
-                        map_sdc(i, j, lab_ids, row, upload_id, peroTF_SlotDieCoating)
-                    )
-
-                if 'Sputtering' in col:
-                    archives.append(
-                        map_sputtering(i, j, lab_ids, row, upload_id, peroTF_Sputtering)
-                    )
-
-                if 'ALD' in col:
-                    archives.append(
-                        map_atomic_layer_deposition(
-                            i, j, lab_ids, row, upload_id, peroTF_ALD
-                        )
-                    )
-
-        refs = []
-        for subs in substrates:
-            file_name = f'{subs[0]}.archive.json'
-            create_archive(subs[2], archive, file_name)
-            refs.append(get_reference(upload_id, file_name))
-
-        for a in archives:
-            file_name = f'{a[0]}.archive.json'
-            create_archive(a[1], archive, file_name)
-            refs.append(get_reference(upload_id, file_name))
-
-        archive.data = RawHySprintExperiment(processed_archive=refs)
+        return [(name, entity) for name, _, entity in substrates] + [
+            (a[0], a[1]) for a in archives
+        ]
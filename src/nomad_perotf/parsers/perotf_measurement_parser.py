@@ -40,16 +40,10 @@ from nomad.metainfo import (
 )
 from nomad.parsing import MatchingParser
 
-from nomad_perotf.schema_packages.perotf_package import (
-    SolarCellEQE,
-    peroTF_AbsPLMeasurement,
-    peroTF_JVmeasurement,
-    peroTF_Measurement,
-    peroTF_MPPTracking,
-    peroTF_SEM,
-    peroTF_TFL_GammaBox_EQEmeasurement,
-    peroTF_UVvisMeasurement,
-)  # its the copied one from FAIRMAT
+from nomad_perotf.parsers.measurement_files import (
+    measurement_factory,
+    split_measurement_file_name,
+)
 
 """
 This is a hello world style example for an example parser/converter.
@@ -69,68 +63,25 @@ class PeroTFParser(MatchingParser):
     def parse(self, mainfile: str, archive: EntryArchive, logger):
         # Log a hello world, just to get us started. TODO remove from an actual parser.
 
-        mainfile_split = os.path.basename(mainfile).split('.')
+        search_id, notes, technique, extension, position = split_measurement_file_name(
+            mainfile
+        )
         archive.data = RawFileperoTF()
-        notes = ''
-        if len(mainfile_split) > 2:
-            notes = mainfile_split[1]
-        entry = peroTF_Measurement()
-        if mainfile_split[-2] == 'jv':
-            if 'rev' in mainfile:
-                return
-            entry = peroTF_JVmeasurement()
-
-        if mainfile_split[-1] == 'dat' and mainfile_split[-2] == 'eqe':
-            # Bentham EQE system
-            header_lines = 63
-            sc_eqe = SolarCellEQE()
-            sc_eqe.eqe_data_file = os.path.basename(mainfile)
-            sc_eqe.header_lines = header_lines
-            entry = peroTF_TFL_GammaBox_EQEmeasurement()
-            entry.eqe_data = [sc_eqe]
-
-        if mainfile_split[-1] == 'txt' and mainfile_split[-2] == 'eqe':
-            # Enlitec EQE system
-            header_lines = 5
-            sc_eqe = SolarCellEQE()
-            sc_eqe.eqe_data_file = os.path.basename(mainfile)
-            sc_eqe.header_lines = header_lines
-            entry = peroTF_TFL_GammaBox_EQEmeasurement()
-            entry.eqe_data = [sc_eqe]
-
-        if mainfile_split[-1] in ['csv', 'txt'] and mainfile_split[-2] == 'mpp':
-            entry = peroTF_MPPTracking()
-        if mainfile_split[-1] in ['csv'] and mainfile_split[-2] == 'uvvis':
-            entry = peroTF_UVvisMeasurement()
-        if (
-            mainfile_split[-1].lower() in ['tif', 'tiff']
-            and mainfile_split[-2].lower() == 'sem'
-        ):
-            entry = peroTF_SEM()
-            entry.detector_data = [os.path.basename(mainfile)]
-        if (
-            mainfile_split[-2] in ['jv', 'eqe', 'jvg', 'jvt']
-            and len(mainfile_split) > 2
-        ):
-            if 'top' in mainfile_split[1]:
-                entry.multijunction_position = 'top'
-            if 'mid' in mainfile_split[1]:
-                entry.multijunction_position = 'mid'
-            if 'bot' in mainfile_split[1]:
-                entry.multijunction_position = 'bottom'
-        if mainfile_split[-1] in ['txt'] and mainfile_split[-2] == 'abspl':
-            entry = peroTF_AbsPLMeasurement()
+        if technique == 'jv' and 'rev' in mainfile:
+            return
+        entry = measurement_factory(technique, extension)(os.path.basename(mainfile))
+        if position is not None:
+            entry.multijunction_position = position
 
         archive.metadata.entry_name = os.path.basename(mainfile)
-        search_id = mainfile_split[0]
         set_sample_reference(archive, entry, search_id)
 
         entry.name = f'{search_id} {notes}'
         entry.description = f'Notes from file name: {notes}'
         entry.datetime = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
-        if not mainfile_split[-2] == 'eqe' and not mainfile_split[-2] == 'uvvis':
+        if technique not in ('eqe', 'uvvis'):
             entry.data_file = os.path.basename(mainfile)
-        elif mainfile_split[-2] == 'uvvis':
+        elif technique == 'uvvis':
             entry.data_file = [os.path.basename(mainfile)]
             print(entry.data_file)
             entry.datetime = None
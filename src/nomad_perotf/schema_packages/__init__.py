@@ -1,7 +1,33 @@
 from nomad.config.models.plugins import SchemaPackageEntryPoint
+from pydantic import Field
 
 
 class PeroTFPackageEntryPoint(SchemaPackageEntryPoint):
+    mpp_preview_points: dict[str, int] = Field(
+        {},
+        description=(
+            'Per measurement program, the number of points MPP tracks are '
+            'decimated to for plotting, every point is kept in an HDF5 file next '
+            'to the data file. Programs that are not listed keep every point.'
+        ),
+    )
+    hdf5_array_points: int = Field(
+        0,
+        description=(
+            'Arrays of AbsPL results and EQE spectra with more points are kept in '
+            'an HDF5 file next to the data file instead of the archive, 0 keeps '
+            'all of them in the archive.'
+        ),
+    )
+    resume_mpp_files: bool = Field(
+        False,
+        description=(
+            'Keep the parsed rows of LabVIEW, Python and TFL PURI MPP files in an '
+            'HDF5 file next to the data file, so that a file that grew since is '
+            'only parsed from where the last processing stopped.'
+        ),
+    )
+
     def load(self):
         from nomad_perotf.schema_packages.perotf_package import m_package
 
@@ -0,0 +1,141 @@
+import numpy as np
+
+HDF5_CHUNK_POINTS = 16_384
+HDF5_COMPRESSION_LEVEL = 4
+# quantities named after an array with this suffix reference it once it is moved
+HDF5_REFERENCE_SUFFIX = '_hdf5'
+
+
+def hdf5_file_name(data_file):
+    # a second extension, so the parsers do not match the file as a measurement
+    return f'{data_file}.h5'
+
+
+def write_hdf5_arrays(
+    archive, path, arrays, attrs=None, compress=True, *, resizable=False
+):
+    """
+    Writes ``{dataset: array}`` to the HDF5 file ``path`` of the upload with a
+    single open, replacing the file. Datasets are chunked and, with
+    ``compress``, gzip compressed. With ``resizable``, they can be extended by
+    `append_hdf5_arrays`. Units of pint quantities go into a ``units``
+    attribute, ``attrs`` are attributes of the file.
+    """
+    import h5py
+
+    with archive.m_context.raw_file(path, 'wb') as f, h5py.File(f, 'w') as h5:
+        h5.attrs.update(attrs or {})
+        for name, value in arrays.items():
+            data = np.asarray(getattr(value, 'magnitude', value))
+            chunk_points = HDF5_CHUNK_POINTS
+            if not resizable:
+                chunk_points = max(min(len(data), HDF5_CHUNK_POINTS), 1)
+            dataset = h5.create_dataset(
+                name,
+                data=data,
+                chunks=(chunk_points,) + data.shape[1:],
+                maxshape=(None,) + data.shape[1:] if resizable else None,
+                compression='gzip' if compress else None,
+                compression_opts=HDF5_COMPRESSION_LEVEL if compress else None,
+                shuffle=compress,
+            )
+            if hasattr(value, 'units'):
+                dataset.attrs['units'] = str(value.units)
+
+
+def append_hdf5_arrays(archive, path, arrays, start, attrs=None):
+    """
+    Writes ``{dataset: array}`` from row ``start`` on into the resizable datasets
+    of the HDF5 file ``path`` of the upload, dropping rows after them. Rows
+    before ``start`` are neither read nor written, ``attrs`` are updated.
+    """
+    import h5py
+
+    with archive.m_context.raw_file(path, 'r+b') as f, h5py.File(f, 'r+') as h5:
+        for name, value in arrays.items():
+            data = np.asarray(getattr(value, 'magnitude', value))
+            dataset = h5[name]
+            dataset.resize(start + len(data), axis=0)
+            dataset[start:] = data
+        h5.attrs.update(attrs or {})
+
+
+def read_hdf5_arrays(archive, path, names):
+    """The datasets ``names`` of the HDF5 file ``path`` of the upload."""
+    import h5py
+
+    with archive.m_context.raw_file(path, 'rb') as f, h5py.File(f, 'r') as h5:
+        return {name: h5[name][()] for name in names}
+
+
+def read_hdf5_file(archive, path):
+    """The attributes and the top level datasets of the HDF5 file ``path``."""
+    import h5py
+
+    with archive.m_context.raw_file(path, 'rb') as f, h5py.File(f, 'r') as h5:
+        attrs = dict(h5.attrs)
+        return attrs, {
+            name: dataset[()]
+            for name, dataset in h5.items()
+            if isinstance(dataset, h5py.Dataset)
+        }
+
+
+def set_hdf5_references(section, names, path=None, group=''):
+    """
+    Points the HDF5 references ``<name>_hdf5`` that ``section`` has at the
+    datasets ``<group>/<name>`` of the file ``path``, or clears them without one.
+    """
+    for name in names:
+        reference = f'{name}{HDF5_REFERENCE_SUFFIX}'
+        if reference in section.m_def.all_quantities:
+            setattr(section, reference, f'{path}#{group}/{name}' if path else None)
+
+
+def _set_external_arrays(section, path, names, moved):
+    section.array_file = path if moved else None
+    section.external_arrays = moved or None
+    set_hdf5_references(section, moved, path, section.m_path())
+    set_hdf5_references(section, [name for name in names if name not in moved])
+
+
+def offload_arrays(archive, path, sections, names, min_points):
+    """
+    Moves the arrays ``names`` of ``sections`` that have more than ``min_points``
+    values to the HDF5 file ``path``, all in one write, nothing is moved if
+    ``min_points`` is 0. The datasets are at the archive path of their section,
+    the sections record them in ``array_file`` and ``external_arrays`` and in
+    the HDF5 references ``<name>_hdf5`` where they have them. Records of an
+    earlier move are cleared for arrays that stay in the archive.
+    """
+    arrays = {}
+    moved = []
+    for section in sections:
+        section_names = [
+            name
+            for name in names
+            if min_points
+            and getattr(section, name, None) is not None
+            and len(getattr(section, name)) > min_points
+        ]
+        for name in section_names:
+            arrays[f'{section.m_path()}/{name}'] = getattr(section, name)
+        moved.append((section, section_names))
+
+    if arrays:
+        write_hdf5_arrays(archive, path, arrays)
+    for section, section_names in moved:
+        for name in section_names:
+            setattr(section, name, None)
+        _set_external_arrays(section, path, names, section_names)
+
+
+def load_external_arrays(archive, section):
+    """Puts the arrays that `offload_arrays` moved back into ``section``."""
+    if not section.array_file or not section.external_arrays:
+        return
+    moved = list(section.external_arrays)
+    names = {f'{section.m_path()}/{name}': name for name in moved}
+    for dataset, value in read_hdf5_arrays(archive, section.array_file, names).items():
+        setattr(section, names[dataset], value)
+    _set_external_arrays(section, None, moved, [])
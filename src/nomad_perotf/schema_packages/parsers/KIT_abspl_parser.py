@@ -33,13 +33,11 @@ header_map_result = {
 
 def parse_abspl_data(data_file, archive, logger):
     """Parses the AbsPL data file and returns extracted settings and spectral arrays."""
-    from baseclasses.helper.utilities import get_encoding
+    from nomad_perotf.schema_packages.raw_files import read_raw_text
 
-    with archive.m_context.raw_file(data_file, mode='rb') as f:
-        encoding = get_encoding(f) or 'cp1252'
-    with archive.m_context.raw_file(data_file, mode='rb') as f:
-        raw_bytes = f.read()
-    text = raw_bytes.decode(encoding, errors='replace')
+    text = read_raw_text(
+        archive, data_file, default_encoding='cp1252', errors='replace'
+    )
     lines = text.splitlines()
     logger.debug('Read data file lines', file=data_file, total_lines=len(lines))
 
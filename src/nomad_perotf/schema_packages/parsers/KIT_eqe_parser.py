@@ -24,7 +24,10 @@
 
 # stolen from the internal FAIRmat EQE parser, but we had to adapt it to work with our
 # files
+import functools
 import os
+import re
+from io import StringIO
 
 import numpy as np
 import pandas as pd
@@ -43,6 +46,140 @@ hc_eVnm = (
     h_Js * c / q * 1e9
 )  # % [eV nm]  Planck's constant for energy to wavelength conversion
 
+AM15G_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'AM15G.dat.txt')
+
+
+@functools.cache
+def am15g_spectrum():
+    """
+    Photon energy (eV) and AM1.5G photon flux, read once per process.
+    The arrays are shared between all callers and therefore read-only.
+    """
+    df_am15 = pd.read_csv(AM15G_FILE, header=None)
+    energy = np.array(df_am15[df_am15.columns[1]], dtype=np.float64)
+    spectrum = np.array(df_am15[df_am15.columns[2]], dtype=np.float64)
+    energy.flags.writeable = False
+    spectrum.flags.writeable = False
+    return energy, spectrum
+
+
+@functools.lru_cache(maxsize=64)
+def am15g_on_grid(start, stop, num):
+    """
+    AM1.5G photon flux interpolated onto ``np.linspace(start, stop, num)``.
+    Files from the same setup share their photon energy range, so the grid
+    repeats across an upload.
+    """
+    energy, spectrum = am15g_spectrum()
+    spectrum_interp = np.interp(np.linspace(start, stop, num), energy, spectrum)
+    spectrum_interp.flags.writeable = False
+    return spectrum_interp
+
+
+# enough for the 63 header lines of a Bentham file and the first data rows
+SNIFF_CHARS = 8192
+SNIFF_DATA_ROWS = 20
+_LINE_BREAK = re.compile(r'\r\n|\r|\n')
+_DECIMAL_COMMA = re.compile(r'^\s*[-+]?\d*,\d+([eE][-+]?\d+)?\s*$')
+
+
+def sniff_eqe_format(text, header_lines=0):
+    """
+    Decides separator, header row and decimal mark of an EQE text file.
+
+    Only the first lines are inspected. Candidates are tried in the order the
+    file layouts are known to occur: tab separated with the column names in
+    the last header line, comma separated, then each with the header one line
+    further down. Like pandas, the header row counts non-blank lines only.
+
+    Returns:
+        sep, header and decimal, to be passed on to `pd.read_csv`
+    """
+    lines = [line for line in _LINE_BREAK.split(text[:SNIFF_CHARS]) if line.strip()]
+    if len(lines) <= header_lines + SNIFF_DATA_ROWS and len(text) > SNIFF_CHARS:
+        lines = [line for line in _LINE_BREAK.split(text) if line.strip()]
+
+    if header_lines == 0:
+        candidates = [(None, '\t'), (None, ',')]
+    else:
+        candidates = [
+            (header_lines - 1, '\t'),
+            (header_lines - 1, ','),
+            (header_lines, '\t'),
+            (header_lines, ','),
+        ]
+
+    for i, (header, sep) in enumerate(candidates):
+        row = header or 0
+        if row >= len(lines):
+            # leave the error message about the missing header row to pandas
+            break
+        if len(lines[row].split(sep)) >= 2:
+            break
+        if i == len(candidates) - 1 and header is not None:
+            raise IndexError('Could not find two columns in the EQE file')
+
+    decimal = '.'
+    if sep != ',':
+        data_start = 0 if header is None else header + 1
+        for line in lines[data_start : data_start + SNIFF_DATA_ROWS]:
+            if any(_DECIMAL_COMMA.match(field) for field in line.split(sep)[:2]):
+                decimal = ','
+                break
+    return sep, header, decimal
+
+
+# The kernels below work on spectra stacked in rows, a single spectrum is one row.
+# `EQEAnalyzer` and `analyze_many` share them.
+
+
+def _blackbody_photon_flux(x):
+    return (2 * np.pi * q**3 * x**2) / (h_Js**3 * c**2 * (np.exp(x / VT) - 1))
+
+
+def _jsc(x, y, spectrum):
+    """Short circuit current densities in A m**(-2) under the flux ``spectrum``."""
+    jsc_calc = integrate.cumulative_trapezoid(y * spectrum, x, axis=1)
+    return np.max(jsc_calc * q * 1e4, axis=1)
+
+
+def _bandgap(x, y_smooth):
+    """Photon energies of the inflection points of the smoothed eqe."""
+    deqe_interp = np.diff(y_smooth, axis=1) / np.diff(np.flip(-x, axis=1), axis=1)
+    return x[np.arange(len(x)), deqe_interp.argmax(axis=1)]
+
+
+def _j0rad(x, y):
+    """Radiative saturation current densities in A m**(-2) and the EL spectra."""
+    el = _blackbody_photon_flux(x) * y
+    return np.trapz(el, x, axis=1) * q, el
+
+
+def _voc_rad(jsc, j0rad):
+    return VT * np.log(jsc / j0rad)
+
+
+def _cached_stage(method):
+    """
+    Evaluates an analysis stage once per set of arguments and keeps the result,
+    or the exception it raised, on the instance.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._stages:
+            try:
+                self._stages[key] = (True, method(self, *args, **kwargs))
+            except Exception as e:
+                self._stages[key] = (False, e)
+        succeeded, value = self._stages[key]
+        if not succeeded:
+            raise value
+        return value
+
+    return wrapper
+
 
 class EQEAnalyzer:
     """
@@ -59,13 +196,26 @@ class EQEAnalyzer:
     of the eqe and the solar spectrum am1.5.
     - `calculate_voc_rad`: calculates the open circuit voltage at the radiative limit
     with the calculated `j_sc` and `j0rad`.
+
+    Every stage is evaluated lazily and only once per instance, the file is read
+    a single time no matter how often the stages depend on each other.
     """
 
     def __init__(self, file_path: str, header_lines=None):
         """ """
         self.file_path = file_path
         self.header_lines = header_lines
+        self._stages = {}
 
+    @_cached_stage
+    def read_text(self):
+        with open(self.file_path, encoding='utf-8') as f:
+            return f.read()
+
+    def _read_csv(self, **kwargs):
+        return pd.read_csv(StringIO(self.read_text()), **kwargs)
+
+    @_cached_stage
     def read_file(self):
         """
         Reads the file and returns the columns in a pandas DataFrame `df`.
@@ -74,56 +224,26 @@ class EQEAnalyzer:
         """
         if self.header_lines is None:
             self.header_lines = 0
-        if self.header_lines == 0:  # in case you have a header
-            try:
-                df = pd.read_csv(
-                    self.file_path,
-                    header=None,
-                    sep='\t',
-                )
-                if len(df.columns) < 2:
-                    raise IndexError
-            except IndexError:
-                df = pd.read_csv(self.file_path, header=None)
-        else:
-            try:
-                df = pd.read_csv(
-                    self.file_path, header=int(self.header_lines - 1), sep='\t'
-                )  # header_lines - 1 assumes last header line is column names
-                if len(df.columns) < 2:
-                    raise IndexError
-            except IndexError:
-                try:  # wrong separator?
-                    df = pd.read_csv(self.file_path, header=int(self.header_lines - 1))
-                    if len(df.columns) < 2:
-                        raise IndexError
-                except IndexError:
-                    try:  # separator was right, but
-                        # last header_line is not actually column names?
-                        df = pd.read_csv(
-                            self.file_path, header=int(self.header_lines), sep='\t'
-                        )
-                        if len(df.columns) < 2:
-                            raise IndexError
-                    except IndexError:
-                        # Last guess: separator was wrong AND last
-                        # header_line is not actually column names?
-                        df = pd.read_csv(self.file_path, header=int(self.header_lines))
-                        if len(df.columns) < 2:
-                            raise IndexError
+        sep, header, decimal = sniff_eqe_format(
+            self.read_text(), int(self.header_lines)
+        )
+        df = self._read_csv(sep=sep, header=header, decimal=decimal)
 
         # Keep only the first 2 columns (wavelength/energy and EQE)
         # IN CASE OF XUZHENGS DUMB MACHINE (ENLITEC)
         df = df.iloc[:, :2]
 
-        # Replace comma decimal separators with periods
-        df = df.astype(str).apply(lambda col: col.str.replace(',', '.'))
+        # Columns pandas could not parse as numbers, e.g. a decimal comma
+        # the sniffer did not see in the first rows
+        for column in df.select_dtypes(include='object').columns:
+            df[column] = df[column].str.replace(',', '.')
 
         # Convert to numeric and drop rows with NaN only in both columns
         df = df.apply(pd.to_numeric, errors='coerce')
         df = df.dropna()
         return df
 
+    @_cached_stage
     def arrange_eqe_columns(self):
         """
         Gets a df with columns of the file and returns a `photon_energy_raw` array
@@ -166,6 +286,7 @@ class EQEAnalyzer:
         idx = (np.abs(array - value)).argmin()
         return array[idx]
 
+    @_cached_stage
     def interpolate_eqe(self):
         x, y = self.arrange_eqe_columns()
         photon_energy_interpolated = np.linspace(min(x), max(x), 1000, endpoint=True)
@@ -173,6 +294,11 @@ class EQEAnalyzer:
 
         return photon_energy_interpolated, eqe_interpolated
 
+    @_cached_stage
+    def smooth_eqe(self, mode='mirror'):
+        """Savitzky-Golay filtered interpolated eqe."""
+        return savgol_filter(self.interpolate_eqe()[1], 51, 4, mode=mode)
+
     def linear(self, x, a, b):
         return a * x + b
 
@@ -184,6 +310,7 @@ class EQEAnalyzer:
         return idx_start, idx_end
 
     # Function for linear fit of EQE data.
+    @_cached_stage
     def fit_urbach_tail(self, fit_window=0.06, filter_window=20):
         """
         Fits the Urbach tail to the EQE data. To select the fitting range,
@@ -200,10 +327,8 @@ class EQEAnalyzer:
             fit_max: photon energy of the maximum of the fitted range
         """
         try:
-            x, y = self.interpolate_eqe()
-            y = savgol_filter(
-                y, 51, 4, mode='mirror'
-            )  # apply Savitzky-Golay filter to smooth the data
+            x = self.interpolate_eqe()[0]
+            y = self.smooth_eqe(mode='mirror')
             self.data = pd.DataFrame({'y': y})
             log_data = self.data.apply(np.log)
             # find inflection point
@@ -262,6 +387,7 @@ class EQEAnalyzer:
 
     # Extrapolate with an array of the fitted fitted EQE data to the
     # interpolated eqe at a value of min_eqe_fit
+    @_cached_stage
     def extrapolate_eqe(self):
         """
         Extrapolates the EQE data with the fitted Urbach tail.
@@ -294,6 +420,7 @@ class EQEAnalyzer:
             to estimate the Urbach energy.""")
         return photon_energy_extrapolated, eqe_extrapolated
 
+    @_cached_stage
     def calculate_jsc(self):
         """
         Calculates the short circuit current (jsc) from the extrapolated eqe.
@@ -302,17 +429,12 @@ class EQEAnalyzer:
             jsc: short circuit current density in A m**(-2)
         """
         x, y = self.interpolate_eqe()
-        dir_path = os.path.dirname(os.path.realpath(__file__))
-        filename2 = os.path.join(dir_path, 'AM15G.dat.txt')
-        df_am15 = pd.read_csv(filename2, header=None)
-        energy_AM15 = np.array(df_am15[df_am15.columns[1]])
-        spectrum_AM15 = np.array(df_am15[df_am15.columns[2]])
-        spectrum_AM15G_interp = np.interp(x, energy_AM15, spectrum_AM15)
-        jsc_calc = integrate.cumulative_trapezoid(y * spectrum_AM15G_interp, x)
-        jsc = max(jsc_calc * q * 1e4)
-        return jsc
+        # x is the linspace built by interpolate_eqe
+        spectrum_AM15G_interp = am15g_on_grid(float(x[0]), float(x[-1]), len(x))
+        return _jsc(x[np.newaxis], y[np.newaxis], spectrum_AM15G_interp)[0]
 
     # Calculates the bandgap from the inflection point of the eqe.
+    @_cached_stage
     def calculate_bandgap(self):
         """
         calculates the bandgap from the inflection point of the eqe.
@@ -320,13 +442,11 @@ class EQEAnalyzer:
         Returns:
             bandgap: bandgap in eV calculated from in the inflection point of the eqe
         """
-        x, y = self.interpolate_eqe()
-        y = savgol_filter(y, 51, 4, mode='nearest')
-        deqe_interp = np.diff(y) / np.diff(np.flip(-x))
-        bandgap = x[deqe_interp.argmax()]
-        # print('Bandgap: ' + str(bandgap) + ' eV')
-        return bandgap
+        x = self.interpolate_eqe()[0]
+        y = self.smooth_eqe(mode='nearest')
+        return _bandgap(x[np.newaxis], y[np.newaxis])[0]
 
+    @_cached_stage
     def calculate_j0rad(self):
         """
         Calculates the radiative saturation current (j0rad) and the calculated
@@ -346,17 +466,13 @@ class EQEAnalyzer:
                 or it could notbe estimated. The `j0rad` could not be calculated.""")
 
             x, y = self.extrapolate_eqe()
-            phi_BB = (2 * np.pi * q**3 * (x) ** 2) / (
-                h_Js**3 * c**2 * (np.exp(x / VT) - 1)
-            )
-            el = phi_BB * y
-            j0rad = np.trapz(el, x)
-            j0rad = j0rad * q
+            j0rad, el = _j0rad(x[np.newaxis], y[np.newaxis])
         except ValueError:
             raise ValueError("""Failed to estimate a reasonable Urbach Energy.""")
         # print('Radiative saturation current: ' + str(j0rad) + ' A / m^2')
-        return j0rad, el
+        return j0rad[0], el[0]
 
+    @_cached_stage
     def calculate_voc_rad(self):
         """
         Calculates the radiative open circuit voltage (voc_rad) with the calculted
@@ -368,7 +484,7 @@ class EQEAnalyzer:
         try:
             j0rad = self.calculate_j0rad()[0]
             jsc = self.calculate_jsc()
-            voc_rad = VT * np.log(jsc / j0rad)
+            voc_rad = _voc_rad(jsc, j0rad)
             # print('Voc rad: ' + str(voc_rad) + ' V')
         except ValueError:
             raise ValueError("""Urbach energy is > 0.026 eV (~kB*T for T = 300K).
@@ -446,3 +562,95 @@ class EQEAnalyzer:
             )
 
         return eqe_dict
+
+
+def _pad_rows(rows):
+    """
+    Stacks arrays of different length, repeating the last value of each row.
+    Repeated photon energies add nothing to a trapezoidal integral.
+    """
+    padded = np.empty((len(rows), max(len(row) for row in rows)))
+    for i, row in enumerate(rows):
+        padded[i, : len(row)] = row
+        padded[i, len(row) :] = row[-1]
+    return padded
+
+
+def analyze_many(paths, header_lines=None):
+    """
+    Evaluates a whole set of EQE files at once.
+
+    Reading, interpolation and the Urbach fit stay per file, while the Jsc and
+    j0rad integrals and the bandgap inflection points are computed on the
+    stacked spectra, with the kernels `EQEAnalyzer` uses. All interpolated
+    spectra have 1000 points, so they share one matrix.
+
+    Returns:
+        pandas.DataFrame with one row per path and the columns `jsc`,
+        `bandgap`, `urbach_e`, `error_urbach_std`, `j0rad`, `voc_rad` and
+        `error`. Values that could not be determined are NaN.
+    """
+    columns = {
+        key: np.full(len(paths), np.nan)
+        for key in [
+            'jsc',
+            'bandgap',
+            'urbach_e',
+            'error_urbach_std',
+            'j0rad',
+            'voc_rad',
+        ]
+    }
+    errors = [None] * len(paths)
+
+    analyzers, rows = [], []
+    for row, path in enumerate(paths):
+        analyzer = EQEAnalyzer(path, header_lines=header_lines)
+        try:
+            analyzer.interpolate_eqe()
+        except Exception as e:
+            errors[row] = str(e)
+            continue
+        analyzers.append(analyzer)
+        rows.append(row)
+
+    if analyzers:
+        x = np.stack([analyzer.interpolate_eqe()[0] for analyzer in analyzers])
+        y = np.stack([analyzer.interpolate_eqe()[1] for analyzer in analyzers])
+
+        spectrum_AM15G_interp = np.stack(
+            [am15g_on_grid(float(row[0]), float(row[-1]), len(row)) for row in x]
+        )
+        columns['jsc'][rows] = _jsc(x, y, spectrum_AM15G_interp)
+
+        y_smooth = savgol_filter(y, 51, 4, mode='nearest', axis=1)
+        columns['bandgap'][rows] = _bandgap(x, y_smooth)
+
+    extrapolated, extrapolated_rows = [], []
+    for row, analyzer in zip(rows, analyzers):
+        try:
+            urbach_e, _, _, _, urbach_e_std = analyzer.fit_urbach_tail()
+        except ValueError as e:
+            errors[row] = str(e)
+            continue
+        if 0.0 < urbach_e < 0.5:
+            columns['urbach_e'][row] = urbach_e
+            columns['error_urbach_std'][row] = urbach_e_std
+        if 0.0 < urbach_e < 0.026:
+            try:
+                extrapolated.append(analyzer.extrapolate_eqe())
+            except Exception as e:
+                errors[row] = str(e)
+                continue
+            extrapolated_rows.append(row)
+
+    if extrapolated:
+        x = _pad_rows([x_extrap for x_extrap, _ in extrapolated])
+        y = _pad_rows([y_extrap for _, y_extrap in extrapolated])
+        j0rad = _j0rad(x, y)[0]
+        columns['j0rad'][extrapolated_rows] = j0rad
+        columns['voc_rad'][extrapolated_rows] = _voc_rad(
+            columns['jsc'][extrapolated_rows], j0rad
+        )
+
+    return pd.DataFrame({'path': list(paths), **columns, 'error': errors})
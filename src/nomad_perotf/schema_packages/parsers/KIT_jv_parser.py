@@ -1,7 +1,6 @@
 from io import StringIO
 
 import numpy as np
-import pandas as pd
 from scipy import interpolate
 
 
@@ -147,75 +146,18 @@ def calculatePVparametersFromJV(jvData, cellArea=0.105, lineFittingDataPoints=20
 
         r_s = (rs_backward, rs_forward)
 
-        # at JSC there are more data points available
-        factor = 4
-        factor = 1
-
-        try:
-            m3, b3 = np.polyfit(
-                v_new[
-                    jsc_ind[0] - lineFittingDataPoints * factor : jsc_ind[0]
-                    + lineFittingDataPoints * factor
-                ],
-                j_interpolated[0][
-                    jsc_ind[0] - lineFittingDataPoints * factor : jsc_ind[0]
-                    + lineFittingDataPoints * factor
-                ],
-                1,
-            )
-            i = 1
-            while m3 > 0:
-                m3, b3 = np.polyfit(
-                    v_new[
-                        jsc_ind[0] - lineFittingDataPoints + i : jsc_ind[0]
-                        + lineFittingDataPoints
-                        + i
-                    ],
-                    j_interpolated[0][
-                        jsc_ind[0] - lineFittingDataPoints + i : jsc_ind[0]
-                        + lineFittingDataPoints
-                        + i
-                    ],
-                    1,
-                )
-                i += 1
-            rshunt_backward = np.round(((-1 / m3) / cellArea) / 1e-3, digitsRSHUNT)
-
-        except BaseException:
-            rshunt_backward = np.nan
-
-        try:
-            m4, b4 = np.polyfit(
-                v_new[
-                    jsc_ind[1] - lineFittingDataPoints * factor : jsc_ind[1]
-                    + lineFittingDataPoints * factor
-                ],
-                j_interpolated[1][
-                    jsc_ind[1] - lineFittingDataPoints * factor : jsc_ind[1]
-                    + lineFittingDataPoints * factor
-                ],
-                1,
+        # shunt resistance from the first window around Jsc with a negative slope
+        m_shunt, _ = _find_shunt_windows(
+            np.broadcast_to(v_new, (2, len(v_new))),
+            np.vstack(j_interpolated),
+            np.array(jsc_ind),
+            np.array(voc_ind),
+            lineFittingDataPoints,
+        )
+        with np.errstate(divide='ignore'):
+            rshunt_backward, rshunt_forward = np.round(
+                ((-1 / m_shunt) / cellArea) / 1e-3, digitsRSHUNT
             )
-            i = 1
-            while m4 > 0:
-                m4, b4 = np.polyfit(
-                    v_new[
-                        jsc_ind[1] - lineFittingDataPoints * factor + i : jsc_ind[1]
-                        + lineFittingDataPoints * factor
-                        + i
-                    ],
-                    j_interpolated[1][
-                        jsc_ind[1] - lineFittingDataPoints * factor + i : jsc_ind[1]
-                        + lineFittingDataPoints * factor
-                        + i
-                    ],
-                    1,
-                )
-                i += 1
-            rshunt_forward = np.round(((-1 / m4) / cellArea) / 1e-3, digitsRSHUNT)
-
-        except BaseException:
-            rshunt_forward = np.nan
 
         r_shunt = (rshunt_backward, rshunt_forward)
 
@@ -230,165 +172,311 @@ def calculatePVparametersFromJV(jvData, cellArea=0.105, lineFittingDataPoints=20
     return pce, voc, jsc, ff, r_shunt, r_s, mpp
 
 
-def get_jv_data(filedata):
-    def _first_sign_change_index(values):
-        indices = np.where(np.diff(np.signbit(values)))[0]
-        if len(indices) == 0:
-            return None
-        return int(indices[0])
+def _interpolate_rows(x, xp, fp):
+    """
+    Row-wise linear interpolation of `fp` sampled at `xp` onto `x`.
 
-    file_type = identify_file_type(filedata)
-    jv_dict = {}
+    Every row of `xp` has to be sorted in ascending order. If all curves share the
+    same axes the interval search is done once; otherwise all rows are mapped onto
+    one monotonic axis (each row normalised to [0, 1] and shifted by twice its row
+    index) so a single `np.searchsorted` serves all curves at once.
+    """
+    n_rows, n_xp = xp.shape
+    if (xp == xp[:1]).all() and (x == x[:1]).all():
+        xp, x = xp[:1], x[:1]
+        hi = np.clip(np.searchsorted(xp[0], x[0]), 1, n_xp - 1)[None, :]
+    else:
+        rows = np.arange(n_rows)[:, None]
+        xp_min = xp[:, :1]
+        span = xp[:, -1:] - xp_min
+        with np.errstate(divide='ignore', invalid='ignore'):
+            flat_xp = ((xp - xp_min) / span + 2 * rows).ravel()
+            flat_x = (x - xp_min) / span + 2 * rows
+        hi = np.clip(np.searchsorted(flat_xp, flat_x) - rows * n_xp, 1, n_xp - 1)
+    lo = hi - 1
+    x_lo = np.take_along_axis(xp, lo, axis=1)
+    x_hi = np.take_along_axis(xp, hi, axis=1)
+    lo = np.broadcast_to(lo, (n_rows, lo.shape[1]))
+    hi = np.broadcast_to(hi, (n_rows, hi.shape[1]))
+    y_lo = np.take_along_axis(fp, lo, axis=1)
+    y_hi = np.take_along_axis(fp, hi, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (y_hi - y_lo) / (x_hi - x_lo)
+    return slope * (x - x_lo) + y_lo
+
+
+def _first_sign_change(values):
+    """
+    Index of the first sign change along the last axis of `values` and a mask
+    telling whether there is a sign change at all.
+    """
+    changes = np.diff(np.signbit(values), axis=-1)
+    return np.argmax(changes, axis=-1), changes.any(axis=-1)
 
-    if file_type in ['labview', 'puri']:
-        df_header = pd.read_csv(
-            StringIO(filedata),
-            skiprows=0,
-            nrows=10,
-            sep='\t',
-            # index_col=0,
-            engine='python',
-        )
 
-        jv_dict['active_area'] = float(df_header.iloc[1, 1])
-        jv_dict['datetime'] = f'{df_header.iloc[3, 0]} {df_header.iloc[3, 1]}'
+def _window_slopes(x, y, start, stop):
+    """
+    Closed-form least-squares slope of y over x for one window per row.
 
-        df_curves = pd.read_csv(
-            StringIO(filedata),
-            # header=0,
-            skiprows=11,
-            sep='\t',
-            engine='python',
+    The window of row i is `x[i, start[i]:stop[i]]`; windows starting before the
+    first point or holding fewer than two points yield NaN.
+    """
+    n_points = x.shape[1]
+    width = max(int(np.max(stop - start, initial=0)), 0)
+    idx = start[:, None] + np.arange(width)
+    mask = (idx < stop[:, None]) & (idx < n_points) & (start[:, None] >= 0)
+    idx = np.clip(idx, 0, n_points - 1)
+    xw = np.take_along_axis(x, idx, axis=1)
+    yw = np.take_along_axis(y, idx, axis=1)
+    count = mask.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = np.where(mask, xw, 0).sum(axis=1) / count
+        y_mean = np.where(mask, yw, 0).sum(axis=1) / count
+        dx = np.where(mask, xw - x_mean[:, None], 0)
+        dy = np.where(mask, yw - y_mean[:, None], 0)
+        slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+    return np.where(count >= 2, slope, np.nan)
+
+
+def _rolling_slopes(x, y, width):
+    """
+    Least-squares slopes of y over x for every window of `width` consecutive points
+    along the last axis, computed from prefix sums in O(n) per row. Column k of the
+    result belongs to the window starting at index k.
+    """
+    # centring keeps the prefix sums small and the differences well conditioned
+    x = x - x.mean(axis=-1, keepdims=True)
+    y = y - y.mean(axis=-1, keepdims=True)
+
+    def window_sums(values):
+        prefix = np.cumsum(values, axis=-1)
+        prefix = np.concatenate([np.zeros_like(prefix[..., :1]), prefix], axis=-1)
+        return prefix[..., width:] - prefix[..., :-width]
+
+    sum_x = window_sums(x)
+    sum_y = window_sums(y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (width * window_sums(x * y) - sum_x * sum_y) / (
+            width * window_sums(x * x) - sum_x * sum_x
         )
 
-        df_curves = df_curves.dropna(how='all', axis=1)
-
-        voc_idx = _first_sign_change_index(df_curves.iloc[:, 1].to_numpy())
-        jsc_idx = _first_sign_change_index(df_curves.iloc[:, 0].to_numpy())
-        voc_help = df_curves.iloc[voc_idx, 0] if voc_idx is not None else np.nan
-        jsc_help = df_curves.iloc[jsc_idx, 1] if jsc_idx is not None else np.nan
-
-        if np.isfinite(voc_help) and voc_help < 0:
-            #     voltage = -voltage
-            df_curves['Voltage [V]'] = df_curves['Voltage [V]'] * -1
-
-        if np.isfinite(jsc_help) and jsc_help < 0:
-            #     current = -current
-            j_columns = [
-                'Current density [1] [mA/cm^2]',
-                'Current density [2] [mA/cm^2]',
-                'Average current density [mA/cm^2]',
-            ]
-            df_curves[j_columns] = df_curves[j_columns] * -1
-
-        if (
-            df_curves['Voltage [V]'][0]
-            > df_curves['Voltage [V]'][len(df_curves['Voltage [V]']) - 1]
-        ):
-            df_curves = df_curves.iloc[::-1].reset_index(drop=True)
-
-        jv_dict['jv_curve'] = []
-        for column in range(1, len(df_curves.columns) - 1):
-            jv_dict['jv_curve'].append(
-                {
-                    'name': df_curves.columns[column],
-                    'voltage': df_curves[df_curves.columns[0]].values,
-                    'current_density': df_curves[df_curves.columns[column]].values,
-                }
-            )
 
-        pce, voc, jsc, ff, RSHUNT, RS, mpp = calculatePVparametersFromJV(
-            np.array(df_curves),
-            cellArea=jv_dict['active_area'],
-            lineFittingDataPoints=20,
+def _find_shunt_windows(x, y, jsc_ind, voc_ind, lineFittingDataPoints):
+    """
+    Slope of the shunt fit and start index of its window for every row.
+
+    The fit window of 2 * lineFittingDataPoints points starts centred on Jsc and is
+    shifted towards Voc until the slope is no longer positive. Only complete windows
+    are considered and the search stops once the window centre passes Voc. Rows
+    without a suitable window get a NaN slope and a start index of -1.
+
+    The prefix-sum slopes only select the window; the returned slope is refitted on
+    that window, as nearly flat windows lose precision in the prefix sums.
+    """
+    width = 2 * lineFittingDataPoints
+    if x.shape[-1] < width:
+        return np.full(len(x), np.nan), np.full(len(x), -1)
+    slopes = _rolling_slopes(x, y, width)
+    starts = np.arange(slopes.shape[-1])
+    first_start = (jsc_ind - lineFittingDataPoints)[:, None]
+    last_start = np.maximum(voc_ind, jsc_ind)[:, None] - lineFittingDataPoints
+    candidates = (starts >= first_start) & (starts <= last_start) & (first_start >= 0)
+    stops = candidates & ~(slopes > 0)
+    found = stops.any(axis=-1)
+    window = np.where(found, np.argmax(stops, axis=-1), -1)
+    slope = np.where(found, _window_slopes(x, y, window, window + width), np.nan)
+    return slope, window
+
+
+def calculate_pv_parameters_batch(
+    voltage,
+    current_density,
+    cellArea=0.105,
+    lineFittingDataPoints=20,
+    interpolationPoints=1000,
+):
+    """
+    Vectorised counterpart of `calculatePVparametersFromJV` for many curves.
+
+    `current_density` is an (n_curves x n_points) array, `voltage` either one shared
+    voltage axis or an array of the same shape, `cellArea` a scalar or one area per
+    curve. Each curve is evaluated independently with the same rules as the per-file
+    function (resampling on an equidistant voltage grid, first sign change for Voc
+    and Jsc, linear fits around Voc for Rs and around Jsc for Rshunt).
+
+    Returns a dict of arrays of length n_curves with the keys 'pce', 'voc', 'jsc',
+    'ff', 'r_shunt', 'r_s', 'v_mpp' and 'j_mpp', plus 'r_shunt_window', the start
+    index of the shunt fit window on the resampled voltage grid (-1 if none).
+    """
+    digitsPCE = 4
+    digitsJSC = 4
+    digitsVOC = 6
+    digitsFF = 4
+    digitsRS = 0
+    digitsRSHUNT = 0
+
+    j = np.atleast_2d(np.asarray(current_density, dtype=np.float64))
+    v = np.broadcast_to(np.asarray(voltage, dtype=np.float64), j.shape)
+    n_curves = j.shape[0]
+    rows = np.arange(n_curves)
+    cell_area = np.broadcast_to(np.asarray(cellArea, dtype=np.float64), (n_curves,))
+
+    ind_mpp = np.argmax(v * j, axis=1)
+    v_mpp = v[rows, ind_mpp]
+    j_mpp = j[rows, ind_mpp]
+
+    v_new = np.linspace(v[:, 0], v[:, -1], interpolationPoints, axis=1)
+    v_sorted, j_sorted = v, j
+    if (np.diff(v, axis=1) < 0).any():
+        order = np.argsort(v, axis=1, kind='stable')
+        v_sorted = np.take_along_axis(v, order, axis=1)
+        j_sorted = np.take_along_axis(j, order, axis=1)
+    j_interpolated = _interpolate_rows(v_new, v_sorted, j_sorted)
+
+    # check if the curve crosses both axes
+    voc_ind, crosses_j = _first_sign_change(j_interpolated)
+    jsc_ind, crosses_v = _first_sign_change(v_new)
+    valid = crosses_j & crosses_v
+
+    voc = np.round(v_new[rows, voc_ind], digitsVOC)
+    jsc = np.round(j_interpolated[rows, jsc_ind], digitsJSC)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ff = np.where(
+            (voc > 0) & (jsc > 0),
+            np.round((v_mpp * j_mpp) / (voc * jsc) * 100, digitsFF),
+            0.0,
         )
+        pce = np.round(voc * jsc * ff / 100, digitsPCE)
 
-        jv_dict['P_MPP'] = list(
-            (np.round(mpp[0][0] * mpp[0][1], 2), np.round(mpp[1][0] * mpp[1][1], 2))
+        m_rs = _window_slopes(
+            v_new,
+            j_interpolated,
+            voc_ind - lineFittingDataPoints,
+            voc_ind + lineFittingDataPoints,
         )
-        jv_dict['J_MPP'] = list((mpp[0][1], mpp[1][1]))
-        jv_dict['U_MPP'] = list((mpp[0][0], mpp[1][0]))
-        jv_dict['R_ser'] = list(RS)
-        jv_dict['R_par'] = list(RSHUNT)
-
-        jv_dict['J_sc'] = list(jsc)
-        jv_dict['V_oc'] = list(voc)
-        jv_dict['Fill_factor'] = list(ff)
-        jv_dict['Efficiency'] = list(pce)
-
-    elif file_type == 'python':
-        df_header = pd.read_csv(
-            StringIO(filedata),
-            skiprows=0,
-            nrows=46,
-            sep='\t',
-            # index_col=0,
-            engine='python',
+        r_s = np.round(((-1 / m_rs) / cell_area) / 1e-3, digitsRS)
+
+        m_shunt, shunt_window = _find_shunt_windows(
+            v_new, j_interpolated, jsc_ind, voc_ind, lineFittingDataPoints
         )
+        r_shunt = np.round(((-1 / m_shunt) / cell_area) / 1e-3, digitsRSHUNT)
+
+    return {
+        'pce': np.where(valid, pce, np.nan),
+        'voc': np.where(valid, voc, np.nan),
+        'jsc': np.where(valid, jsc, np.nan),
+        'ff': np.where(valid, ff, np.nan),
+        'r_shunt': np.where(valid, r_shunt, np.nan),
+        'r_s': np.where(valid, r_s, np.nan),
+        'r_shunt_window': np.where(valid, shunt_window, -1),
+        'v_mpp': v_mpp,
+        'j_mpp': j_mpp,
+    }
+
+
+def _add_pv_parameters(jv_dict, voltage, current_densities):
+    """Evaluates all curves of one file at once and adds the results to `jv_dict`."""
+    parameters = calculate_pv_parameters_batch(
+        voltage,
+        current_densities,
+        cellArea=jv_dict['active_area'],
+        lineFittingDataPoints=20,
+    )
+    jv_dict['P_MPP'] = np.round(parameters['v_mpp'] * parameters['j_mpp'], 2).tolist()
+    jv_dict['J_MPP'] = parameters['j_mpp'].tolist()
+    jv_dict['U_MPP'] = parameters['v_mpp'].tolist()
+    jv_dict['R_ser'] = parameters['r_s'].tolist()
+    jv_dict['R_par'] = parameters['r_shunt'].tolist()
+    jv_dict['R_par_window'] = parameters['r_shunt_window'].tolist()
+
+    jv_dict['J_sc'] = parameters['jsc'].tolist()
+    jv_dict['V_oc'] = parameters['voc'].tolist()
+    jv_dict['Fill_factor'] = parameters['ff'].tolist()
+    jv_dict['Efficiency'] = parameters['pce'].tolist()
+
+
+JV_DATA_HEADER_LINE = {'labview': 11, 'puri': 11, 'python': 48}
+
+
+def read_jv_file(filedata):
+    """
+    Tokenize a LabVIEW, Puri or Python JV file in a single pass.
 
-        jv_dict['active_area'] = float(df_header.loc['PixArea:'].iloc[0])
-        jv_dict['datetime'] = f'{df_header.loc["DateTime:"].iloc[0]}'
+    Only the header lines are split in Python, the numeric block is handed to
+    the C parser of ``np.loadtxt`` as one float64 array. Returns the file type,
+    the header lines split into fields, the data column names and the data.
+    """
+    file_type = identify_file_type(filedata)
 
-        df_curves = pd.read_csv(
-            StringIO(filedata),
-            # header=0,
-            skiprows=48,
-            sep='\t',
-            engine='python',
-        )
+    rows = []
+    position = 0
+    for _ in range(JV_DATA_HEADER_LINE[file_type] + 1):
+        end = filedata.find('\n', position)
+        if end == -1:
+            end = len(filedata)
+        rows.append(filedata[position:end].rstrip('\r').split('\t'))
+        position = end + 1
+
+    column_row = rows.pop()
+    # trailing tabs give unnamed, empty columns
+    usecols = [index for index, name in enumerate(column_row) if name.strip()]
+    data = np.loadtxt(
+        StringIO(filedata[position:]),
+        delimiter='\t',
+        usecols=usecols,
+        ndmin=2,
+        dtype=np.float64,
+    )
+    return file_type, rows, [column_row[index] for index in usecols], data
 
-        df_curves = df_curves.dropna(how='all', axis=1)
-
-        voc_idx = _first_sign_change_index(df_curves.iloc[:, 1].to_numpy())
-        jsc_idx = _first_sign_change_index(df_curves.iloc[:, 0].to_numpy())
-        voc_help = df_curves.iloc[voc_idx, 0] if voc_idx is not None else np.nan
-        jsc_help = df_curves.iloc[jsc_idx, 1] if jsc_idx is not None else np.nan
-
-        if np.isfinite(voc_help) and voc_help < 0:
-            #     voltage = -voltage
-            df_curves['Voltage'] = df_curves['Voltage'] * -1
-
-        if np.isfinite(jsc_help) and jsc_help < 0:
-            #     current = -current
-            j_columns = [
-                'CurrentDensity',
-                'Current',
-            ]
-            df_curves[j_columns] = df_curves[j_columns] * -1
-
-        if (
-            df_curves['Voltage'][0]
-            > df_curves['Voltage'][len(df_curves['Voltage']) - 1]
-        ):
-            df_curves = df_curves.iloc[::-1].reset_index(drop=True)
-
-        df_curves['Current'] = df_curves['CurrentDensity'].copy()
-
-        jv_dict['jv_curve'] = []
-        for column in range(1, len(df_curves.columns) - 1):
-            jv_dict['jv_curve'].append(
-                {
-                    'name': df_curves.columns[column],
-                    'voltage': df_curves[df_curves.columns[0]].values,
-                    'current_density': df_curves[df_curves.columns[column]].values,
-                }
-            )
 
-        pce, voc, jsc, ff, RSHUNT, RS, mpp = calculatePVparametersFromJV(
-            np.array(df_curves),
-            cellArea=jv_dict['active_area'],
-            lineFittingDataPoints=20,
-        )
+def get_jv_data(filedata):
+    def _first_sign_change_index(values):
+        indices = np.where(np.diff(np.signbit(values)))[0]
+        if len(indices) == 0:
+            return None
+        return int(indices[0])
 
-        jv_dict['P_MPP'] = list([(np.round(mpp[0][0] * mpp[0][1], 2))])
-        jv_dict['J_MPP'] = list([mpp[0][1]])
-        jv_dict['U_MPP'] = list([mpp[0][0]])
-        jv_dict['R_ser'] = list([RS[0]])
-        jv_dict['R_par'] = list([RSHUNT[0]])
+    file_type, header_rows, columns, data = read_jv_file(filedata)
+    jv_dict = {}
+
+    if file_type == 'python':
+        header = {row[0]: row[1:] for row in header_rows}
+        jv_dict['active_area'] = float(header['PixArea:'][0])
+        jv_dict['datetime'] = f'{header["DateTime:"][0]}'
+    else:
+        jv_dict['active_area'] = float(header_rows[2][1])
+        jv_dict['datetime'] = f'{header_rows[4][0]} {header_rows[4][1]}'
+
+    voc_idx = _first_sign_change_index(data[:, 1])
+    jsc_idx = _first_sign_change_index(data[:, 0])
+    voc_help = data[voc_idx, 0] if voc_idx is not None else np.nan
+    jsc_help = data[jsc_idx, 1] if jsc_idx is not None else np.nan
+
+    if np.isfinite(voc_help) and voc_help < 0:
+        #     voltage = -voltage
+        data[:, 0] *= -1
+
+    if np.isfinite(jsc_help) and jsc_help < 0:
+        #     current = -current
+        data[:, 1:] *= -1
+
+    if data[0, 0] > data[-1, 0]:
+        data = data[::-1]
+
+    # the last column holds the average (LabVIEW, Puri) or the absolute current
+    # (Python) and is not a curve of its own
+    voltage = data[:, 0]
+    jv_dict['jv_curve'] = []
+    for column in range(1, len(columns) - 1):
+        jv_dict['jv_curve'].append(
+            {
+                'name': columns[column],
+                'voltage': voltage,
+                'current_density': data[:, column],
+            }
+        )
 
-        jv_dict['J_sc'] = list([jsc[0]])
-        jv_dict['V_oc'] = list([voc[0]])
-        jv_dict['Fill_factor'] = list([ff[0]])
-        jv_dict['Efficiency'] = list([pce[0]])
+    _add_pv_parameters(jv_dict, voltage, data[:, 1:-1].T)
 
     return jv_dict
@@ -1,4 +1,4 @@
-from datetime import datetime
+import json
 from io import StringIO
 
 import numpy as np
@@ -7,6 +7,29 @@ import pandas as pd
 # import glob
 from baseclasses.solar_energy.mpp_tracking import MPPTrackingProperties
 
+from nomad_perotf.schema_packages.hdf5_arrays import (
+    append_hdf5_arrays,
+    hdf5_file_name,
+    read_hdf5_file,
+    set_hdf5_references,
+    write_hdf5_arrays,
+)
+from nomad_perotf.schema_packages.parsers.layouts import (
+    LAYOUT_SIGNATURE_CHARS,
+    LayoutCache,
+    header_signature,
+    leading_signature,
+)
+from nomad_perotf.schema_packages.parsers.timestamps import (
+    archive_datetime,
+    mpp_timestamps,
+)
+from nomad_perotf.schema_packages.raw_files import (
+    complete_lines_end,
+    open_raw_text,
+    prefix_hash,
+)
+
 
 def identify_file_type(file_content):
     """
@@ -55,122 +78,283 @@ def parse_numeric_with_unit(value, default_unit=None):
     return number * unit_factor.get(unit, 1.0)
 
 
-def get_mpp_data(filedata):
-    file_type = identify_file_type(filedata)
+MPP_CHUNK_ROWS = 65_536
+# the file type is told by a marker in the first lines
+MPP_IDENTIFY_LINES = 100
+# lines of the header of python files, the column names follow
+PYTHON_HEADER_LINES = 29
 
-    if file_type == 'labview':
-        # Parse header lines manually before using pandas
-        header_dict = {}
-        headerlines = 0
-        lines = filedata.split('\n')
-
-        for i, line in enumerate(lines):
-            parts = line.split('\t')
-
-            # Check if this is the data header line (starts with "Time Difference")
-            if len(parts) > 0 and 'Time Difference' in parts[0]:
-                headerlines = i
-                break
-
-            # Try to detect datetime (should be in row 1 or 2)
-            # Look for a line that starts with a date pattern
-            if i == 1 and len(parts) >= 2:
-                # Try to parse as potential datetime
-                try:
-                    # Check if first part looks like a date
-                    if '-' in parts[0] and ':' in parts[1]:
-                        header_dict.update({'datetime': f'{parts[0]} {parts[1]}'})
-                        continue
-                except (IndexError, TypeError):
-                    pass
-
-            # Parse other metadata (key-value pairs where col1=key, col2=value)
-            if (
-                len(parts) >= 2
-                and parts[0]
-                and 'SPP measurement' not in parts[0]
-                and 'Time Difference' not in parts[0]
-            ):
-                key = (
-                    str(parts[0])
-                    .lower()
-                    .replace(' ', '_')
-                    .replace('[', '')
-                    .replace(']', '')
-                )
-                try:
-                    header_dict.update({key: float(parts[1])})
-                except (ValueError, TypeError):
-                    header_dict.update({key: str(parts[1])})
+mpp_layouts = LayoutCache('mpp')
 
-        # Read the actual data starting from the header line
-        df = pd.read_csv(
-            StringIO(filedata),
-            skiprows=list(range(headerlines))
-            + [headerlines + 1],  # Skip metadata and units row
-            sep='\t',
-            header=0,  # First row after skiprows is the header
-        )
 
-    elif file_type == 'python':
-        df = pd.read_csv(
-            StringIO(filedata),
-            skiprows=2,
-            header=None,
-            sep=':\t',
-            nrows=25,
-            # index_col=0,
-            engine='python',
-        )
-        header_dict = {}
-        for i, row in df.iterrows():
-            if i == 0:
-                header_dict.update({'datetime': f'{row[1]}'})
-                continue
-            key = row[0].lower().replace(' ', '_')
+def _parse_labview_header(lines):
+    """The metadata of a LabVIEW header, up to the ``Time Difference`` line."""
+    header_dict = {}
+    for i, line in enumerate(lines):
+        parts = line.split('\t')
+
+        # Try to detect datetime (should be in row 1 or 2)
+        # Look for a line that starts with a date pattern
+        if i == 1 and len(parts) >= 2:
+            # Try to parse as potential datetime
+            try:
+                # Check if first part looks like a date
+                if '-' in parts[0] and ':' in parts[1]:
+                    header_dict.update({'datetime': f'{parts[0]} {parts[1]}'})
+                    continue
+            except (IndexError, TypeError):
+                pass
+
+        # Parse other metadata (key-value pairs where col1=key, col2=value)
+        if (
+            len(parts) >= 2
+            and parts[0]
+            and 'SPP measurement' not in parts[0]
+            and 'Time Difference' not in parts[0]
+        ):
+            key = (
+                str(parts[0])
+                .lower()
+                .replace(' ', '_')
+                .replace('[', '')
+                .replace(']', '')
+            )
             try:
-                header_dict.update({key: float(row[1])})
-            except BaseException:
-                header_dict.update({key: row[1]})
+                header_dict.update({key: float(parts[1])})
+            except (ValueError, TypeError):
+                header_dict.update({key: str(parts[1])})
+    return header_dict
+
+
+def _parse_python_header(lines):
+    df = pd.read_csv(
+        StringIO('\n'.join(lines)),
+        skiprows=2,
+        header=None,
+        sep=':\t',
+        nrows=25,
+        # index_col=0,
+        engine='python',
+    )
+    header_dict = {}
+    for i, row in df.iterrows():
+        if i == 0:
+            header_dict.update({'datetime': f'{row[1]}'})
+            continue
+        key = row[0].lower().replace(' ', '_')
+        try:
+            header_dict.update({key: float(row[1])})
+        except BaseException:
+            header_dict.update({key: row[1]})
+    return header_dict
 
-        df = pd.read_csv(
-            StringIO(filedata),
-            skiprows=29,
-            sep='\t',
-        )
 
-    elif file_type == 'puri':
-        # Parse header lines with key: value format
-        header_dict = {}
+def _parse_puri_header(lines):
+    header_dict = {}
+    for raw_line in lines:
+        line = raw_line.strip()
+
+        # Skip empty lines or section headers
+        if not line or line == '#' or '[' in line:
+            continue
+
+        # Remove leading # and parse key: value pairs
+        if line.startswith('#'):
+            line = line[1:].strip()
+
+        if ': ' in line:
+            key, value = line.split(': ', 1)
+            key = (
+                key.strip().lower().replace(' ', '_').replace('(', '').replace(')', '')
+            )
+            value = value.strip()
+
+            # Try to convert to float, otherwise keep as string
+            try:
+                header_dict[key] = float(value)
+            except ValueError:
+                header_dict[key] = value
+    return header_dict
+
+
+def _parse_tflpuri_header(lines):
+    header_dict = {}
+    for line in lines:
+        stripped = line.strip()
+        if ': ' in stripped:
+            key, value = stripped.split(': ', 1)
+            key = (
+                key.strip().lower().replace(' ', '_').replace('(', '').replace(')', '')
+            )
+            value = value.strip()
+            try:
+                header_dict[key] = float(value)
+            except ValueError:
+                header_dict[key] = value
+    return header_dict
+
+
+def _read_line(f):
+    line = f.readline()
+    if not line:
+        raise ValueError('MPP file ends before its data')
+    return line.rstrip('\n')
 
-        lines = filedata.split('\n')
-        for raw_line in lines:
-            line = raw_line.strip()
 
-            # Skip empty lines or section headers
-            if not line or line == '#' or '[' in line:
+def _read_header_until(f, lines, is_column_line):
+    """Reads lines into ``lines`` up to the column names, which are returned."""
+    while True:
+        line = _read_line(f)
+        if is_column_line(lines, line):
+            return line
+        lines.append(line)
+
+
+def _read_columns(f, columns, sep):
+    """
+    Reads the rest of ``f`` chunk by chunk into one array per column, numeric
+    columns go into float64 buffers that grow as the chunks come in.
+    """
+    buffers = {column: np.empty(0) for column in columns}
+    texts = {}
+    n_rows = 0
+    for chunk in pd.read_csv(
+        f, sep=sep, header=None, names=columns, chunksize=MPP_CHUNK_ROWS
+    ):
+        if len(chunk) == 0:
+            continue
+        end = n_rows + len(chunk)
+        for column in columns:
+            values = chunk[column].to_numpy()
+            if column not in texts and values.dtype.kind in 'iuf':
+                buffer = buffers[column]
+                if end > len(buffer):
+                    buffer.resize(max(end, 2 * len(buffer)), refcheck=False)
+                buffer[n_rows:end] = values
                 continue
+            if column not in texts:
+                texts[column] = [buffers.pop(column)[:n_rows].astype(object)]
+            texts[column].append(values)
+        n_rows = end
+
+    data = {}
+    for column in columns:
+        if column in texts:
+            data[column] = np.concatenate(texts[column])
+        else:
+            data[column] = buffers[column]
+            data[column].resize(n_rows, refcheck=False)
+    return pd.DataFrame(data, columns=columns, copy=False)
 
-            # Remove leading # and parse key: value pairs
-            if line.startswith('#'):
-                line = line[1:].strip()
-
-            if ': ' in line:
-                key, value = line.split(': ', 1)
-                key = (
-                    key.strip()
-                    .lower()
-                    .replace(' ', '_')
-                    .replace('(', '')
-                    .replace(')', '')
-                )
-                value = value.strip()
 
-                # Try to convert to float, otherwise keep as string
-                try:
-                    header_dict[key] = float(value)
-                except ValueError:
-                    header_dict[key] = value
+def _identify_mpp_file(f):
+    """
+    Reads lines of ``f`` until one tells the file type, returns both and the
+    first ``LAYOUT_SIGNATURE_CHARS`` characters of ``f``.
+    """
+    leading = f.read(LAYOUT_SIGNATURE_CHARS)
+    f.seek(0)
+    lines = []
+    file_type = None
+    while file_type is None:
+        line = f.readline()
+        if not line or len(lines) == MPP_IDENTIFY_LINES:
+            raise TypeError('unrecognized file format')
+        lines.append(line.rstrip('\n'))
+        try:
+            file_type = identify_file_type(lines[-1])
+        except TypeError:
+            pass
+    return lines, file_type, leading
+
+
+# how the column names are recognized, the separator and the header parser
+MPP_HEADER_FORMATS = {
+    'labview': (
+        lambda lines, line: 'Time Difference' in line.split('\t')[0],
+        '\t',
+        _parse_labview_header,
+    ),
+    'python': (
+        lambda lines, line: len(lines) == PYTHON_HEADER_LINES,
+        '\t',
+        _parse_python_header,
+    ),
+    # The data header line starts with "Time(s)"
+    'tflpuri': (
+        lambda lines, line: line.strip().startswith('Time(s)'),
+        ',',
+        _parse_tflpuri_header,
+    ),
+}
+
+
+def _read_mpp_header(f, file_type, lines, leading):
+    """
+    Reads the rest of the header of a file that is not a PURI file, up to its
+    first data row, and returns its metadata and layout: the number of header
+    lines, the column names and the separator.
+
+    Layouts are cached per `leading_signature` of the file. On a hit the cached
+    number of header lines is read without looking for the column names, which
+    only have to match the cached ones, and the column names are not parsed.
+    """
+    is_column_line, sep, parse_header = MPP_HEADER_FORMATS[file_type]
+    signature = leading_signature(file_type, leading, sep)
+    layout = mpp_layouts.get(signature)
+    start = len(lines)
+    if layout is not None:
+        while len(lines) < layout['skiprows']:
+            lines.append(_read_line(f))
+        if _read_line(f) != layout['column_line']:
+            # the header differs after the start, read it again line by line
+            del lines[start:]
+            f.seek(0)
+            for _ in range(start):
+                f.readline()
+            layout = None
+    if layout is None:
+        column_line = _read_header_until(f, lines, is_column_line)
+        columns = pd.read_csv(StringIO(column_line), sep=sep, nrows=0).columns
+        layout = mpp_layouts.put(
+            signature,
+            {
+                'skiprows': len(lines),
+                'column_line': column_line,
+                'columns': columns.tolist(),
+                'sep': sep,
+            },
+        )
+    if file_type == 'labview':
+        # Skip the units row
+        _read_line(f)
+    return parse_header(lines), layout
+
+
+def _row_columns(file_type, layout):
+    if file_type == 'tflpuri':
+        return [column.strip() for column in layout['columns']]
+    return layout['columns']
+
+
+def _read_mpp_rows(f, file_type, layout):
+    return _read_columns(f, _row_columns(file_type, layout), sep=layout['sep'])
+
+
+def read_mpp_data(f):
+    """
+    Reads an MPP tracking file from the text handle ``f`` like `get_mpp_data`
+    does, without holding its text in memory.
+
+    The header is read line by line, the data is read in chunks of
+    ``MPP_CHUNK_ROWS`` rows. PURI files, which may have comments between the
+    data, are read whole.
+    """
+    lines, file_type, leading = _identify_mpp_file(f)
+
+    if file_type == 'puri':
+        filedata = '\n'.join(lines) + '\n' + f.read()
+        header_dict = _parse_puri_header(filedata.split('\n'))
 
         # Read CSV data lines, skipping comment metadata
         df = pd.read_csv(
@@ -181,69 +365,264 @@ def get_mpp_data(filedata):
             engine='python',
             on_bad_lines='skip',
         )
+        return header_dict, df, file_type
 
-    elif file_type == 'tflpuri':
-        header_dict = {}
-        lines = filedata.split('\n')
-        data_start = 0
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            # The data header line starts with "Time(s)"
-            if stripped.startswith('Time(s)'):
-                data_start = i
-                break
-            if ': ' in stripped:
-                key, value = stripped.split(': ', 1)
-                key = (
-                    key.strip()
-                    .lower()
-                    .replace(' ', '_')
-                    .replace('(', '')
-                    .replace(')', '')
-                )
-                value = value.strip()
-                try:
-                    header_dict[key] = float(value)
-                except ValueError:
-                    header_dict[key] = value
+    header_dict, layout = _read_mpp_header(f, file_type, lines, leading)
+    return header_dict, _read_mpp_rows(f, file_type, layout), file_type
 
-        df = pd.read_csv(
-            StringIO(filedata),
-            skiprows=data_start,
-            sep=',',
-            header=0,
+
+def get_mpp_data(filedata):
+    return read_mpp_data(StringIO(filedata, newline=None))
+
+
+# file types whose rows are only ever appended, they can be read from an offset
+APPENDABLE_MPP_TYPES = ('labview', 'python', 'tflpuri')
+
+
+def parsed_rows_file_name(data_file):
+    return hdf5_file_name(f'{data_file}.rows')
+
+
+def _load_parsed_rows(archive, path):
+    """The state and the rows kept by `read_mpp_file`, Nones if there are none."""
+    if not archive.m_context.raw_path_exists(path):
+        return None, None
+    try:
+        state, arrays = read_hdf5_file(archive, path)
+        columns = json.loads(state['columns'])
+        df = pd.DataFrame(
+            {column: arrays[f'column_{i}'] for i, column in enumerate(columns)},
+            columns=columns,
+            copy=False,
         )
-        df.columns = df.columns.str.strip()
+    except (OSError, KeyError, ValueError):
+        return None, None
+    return state, df
+
+
+def _parsed_row_arrays(df, rows):
+    return {
+        f'column_{i}': df[column].to_numpy()[:rows]
+        for i, column in enumerate(df.columns)
+    }
+
+
+def _save_parsed_rows(archive, path, df, state):
+    # read on every update, compression would cost more than parsing
+    write_hdf5_arrays(
+        archive,
+        path,
+        _parsed_row_arrays(df, state['rows']),
+        attrs={**state, 'columns': json.dumps(list(df.columns))},
+        compress=False,
+        resizable=True,
+    )
+
+
+def _append_parsed_rows(archive, path, appended, start, state):
+    """
+    Appends the rows ``appended`` after the ``start`` rows kept in ``path``,
+    False if the kept rows cannot be extended.
+    """
+    try:
+        append_hdf5_arrays(
+            archive,
+            path,
+            _parsed_row_arrays(appended, state['rows'] - start),
+            start,
+            attrs=state,
+        )
+    except (KeyError, OSError, TypeError, ValueError):
+        return False
+    return True
+
 
+def read_mpp_file(archive, data_file, resumable=False):
+    """
+    Reads the MPP file ``data_file`` of the upload like `read_mpp_data`.
+
+    With ``resumable``, the rows of files of the ``APPENDABLE_MPP_TYPES`` are
+    kept in an HDF5 file next to it, with the byte offset after the last
+    complete line, the number of rows up to there, a `prefix_hash` of the file
+    up to there and its encoding. Once the file has grown, only the header and
+    the rows after the offset are read, in the kept encoding, and the rows are
+    appended to the kept ones, in the file as well, as long as the hash still
+    matches. The hash only covers the start and the end of the part read
+    before, a change in the middle of it is not noticed. Files with text
+    columns are always read whole.
+    """
+    if not resumable:
+        with open_raw_text(archive, data_file) as f:
+            return read_mpp_data(f)
+
+    rows_file = parsed_rows_file_name(data_file)
+    state, parsed = _load_parsed_rows(archive, rows_file)
+    with archive.m_context.raw_file(data_file, 'rb') as f:
+        end = complete_lines_end(f)
+        # a last line without line break is parsed, but read again next time
+        f.seek(end)
+        partial = f.read().strip() != b''
+        resume = (
+            state is not None
+            and state['offset'] <= end
+            and state['rows'] == len(parsed)
+            and prefix_hash(f, int(state['offset'])) == state['prefix_hash']
+        )
+        end_hash = prefix_hash(f, end)
+
+    # a file that was ASCII so far would be read whole to detect its encoding
+    encoding = str(state['encoding']) if resume and 'encoding' in state else None
+    with open_raw_text(archive, data_file, encoding=encoding) as f:
+        encoding = f.encoding
+        lines, file_type, leading = _identify_mpp_file(f)
+        if file_type not in APPENDABLE_MPP_TYPES:
+            f.seek(0)
+            return read_mpp_data(f)
+        header_dict, layout = _read_mpp_header(f, file_type, lines, leading)
+        resume = resume and list(parsed.columns) == _row_columns(file_type, layout)
+        if not resume:
+            df = _read_mpp_rows(f, file_type, layout)
+    if resume:
+        try:
+            with open_raw_text(
+                archive, data_file, offset=int(state['offset']), encoding=encoding
+            ) as f:
+                appended = _read_mpp_rows(f, file_type, layout)
+            df = pd.concat([parsed, appended], ignore_index=True)
+        except UnicodeDecodeError:
+            # the appended rows are not in the encoding of the start
+            with open_raw_text(archive, data_file) as f:
+                encoding = f.encoding
+                header_dict, df, _ = read_mpp_data(f)
+            resume = False
+
+    numeric = all(dtype.kind == 'f' for dtype in df.dtypes)
+    if numeric and not (resume and state['offset'] == end):
+        kept = {
+            'offset': end,
+            'rows': len(df) - 1 if partial else len(df),
+            'prefix_hash': end_hash,
+            'encoding': encoding,
+        }
+        if not (
+            resume
+            and _append_parsed_rows(
+                archive, rows_file, appended, int(state['rows']), kept
+            )
+        ):
+            _save_parsed_rows(archive, rows_file, df, kept)
     return header_dict, df, file_type
 
 
+# the column roles of PURI files, with the name patterns tried in this order
+MPP_COLUMN_ROLES = {
+    'puri': {
+        'timestamp': ['timestamp', 'time'],
+        'power': ['power', 'mw', 'mW'],
+        'voltage': ['voltage', 'v(v)', 'v'],
+        'current': ['current', 'j(ma', 'ma/cm'],
+        'efficiency': ['efficiency', 'pce', 'pce('],
+        'datetime': ['time', 'datetime', 'date'],
+    },
+    'tflpuri': {
+        'time': ['time(s)', 'time'],
+        'voltage': ['voltage(v)', 'voltage'],
+        'current': ['current density', 'current'],
+        'power': ['power density', 'power'],
+    },
+}
+COLUMN_MAP_CACHE_SIZE = 64
+# rows looked at when a column is recognized by its values
+VALUE_SAMPLE_ROWS = 100
+
+column_maps = LayoutCache('mpp_columns', maxsize=COLUMN_MAP_CACHE_SIZE)
+
+
 def _get_column(df, key_patterns):
+    return _match_column(
+        [str(col).lower() for col in df.columns], df.columns, key_patterns
+    )
+
+
+def _match_column(lowered, columns, key_patterns):
     for pattern in key_patterns if isinstance(key_patterns, list) else [key_patterns]:
         pattern_lower = pattern.lower()
-        for col in df.columns:
-            if pattern_lower in str(col).lower():
+        for name, col in zip(lowered, columns):
+            if pattern_lower in name:
                 return col
     return None
 
 
 def _find_timestamp_column_by_value(df):
-    for col in df.columns:
-        series = pd.to_numeric(df[col], errors='coerce')
-        sample = series.dropna().head(5)
-        if sample.empty:
-            continue
-        if (sample > 1e11).all():
-            return col
-    return None
+    """The first column whose first five numbers are all millisecond timestamps."""
+    numeric = df.head(VALUE_SAMPLE_ROWS).apply(pd.to_numeric, errors='coerce')
+    first = numeric.where(numeric.notna().cumsum() <= 5)
+    is_timestamp = ((first > 1e11) | first.isna()).all() & first.notna().any()
+    return is_timestamp.idxmax() if is_timestamp.any() else None
 
 
 def _find_time_string_column(df):
-    for col in df.columns:
-        sample = df[col].astype(str).head(5)
-        if sample.str.match(r'\d{4}-\d{2}-\d{2}').any():
-            return col
-    return None
+    sample = df.head(5).astype(str)
+    is_date = sample.apply(lambda col: col.str.match(r'\d{4}-\d{2}-\d{2}').any())
+    return is_date.idxmax() if is_date.any() else None
+
+
+# the roles of a file type that are recognized by their values without a name
+MPP_VALUE_ROLES = {
+    'puri': {
+        'timestamp': _find_timestamp_column_by_value,
+        'datetime': _find_time_string_column,
+    },
+}
+
+
+def _classify_columns(file_type, df):
+    """
+    The column map of ``df`` and whether it only depends on the column names,
+    which it does not if a role of ``MPP_VALUE_ROLES`` has no telling name.
+    """
+    lowered = [str(col).lower() for col in df.columns]
+    column_map = {
+        role: _match_column(lowered, df.columns, patterns)
+        for role, patterns in MPP_COLUMN_ROLES[file_type].items()
+    }
+    by_name = True
+    for role, find_column in MPP_VALUE_ROLES.get(file_type, {}).items():
+        if column_map[role] is None:
+            column_map[role] = find_column(df)
+            by_name = False
+    return column_map, by_name
+
+
+def infer_column_map(file_type, df):
+    """
+    The column of every role in ``MPP_COLUMN_ROLES[file_type]``, None where
+    there is none. PURI timestamps and datetimes without a telling name are
+    recognized by their values. Maps are cached per file type and column names,
+    files of the same instrument are only classified once. Maps that depend on
+    the values are not cached, the next file with these names may differ.
+    """
+    signature = header_signature(file_type, [str(col) for col in df.columns])
+    column_map = column_maps.get(signature)
+    if column_map is None:
+        column_map, by_name = _classify_columns(file_type, df)
+        if by_name:
+            column_maps.put(signature, column_map)
+    return column_map
+
+
+def numeric_columns(df, column_map, roles):
+    """
+    The columns of ``roles`` as float64 arrays, converted in one block. Roles
+    without a column are left out.
+    """
+    roles = [role for role in roles if column_map.get(role) is not None]
+    columns = list(dict.fromkeys(column_map[role] for role in roles))
+    block = df[columns]
+    if any(dtype.kind not in 'iuf' for dtype in block.dtypes):
+        block = block.apply(pd.to_numeric, errors='coerce')
+    block = block.to_numpy(np.float64)
+    return {role: block[:, columns.index(column_map[role])] for role in roles}
 
 
 def _set_common_data_file(mpp_entitiy, mainfile):
@@ -251,7 +630,19 @@ def _set_common_data_file(mpp_entitiy, mainfile):
         mpp_entitiy.data_file = mainfile
 
 
-def _populate_labview_archive(header_dict, df, mpp_entitiy, mainfile=None):
+def _set_datetime(mpp_entitiy, value, file_type, logger):
+    if not value:
+        return
+    parsed = mpp_timestamps.parse(value, key=file_type)
+    if parsed is not None:
+        mpp_entitiy.datetime = archive_datetime(parsed)
+    elif logger is not None:
+        logger.warning('Could not parse the datetime of the MPP file', datetime=value)
+
+
+def _populate_labview_archive(
+    header_dict, df, mpp_entitiy, mainfile=None, *, logger=None
+):
     mpp_entitiy.time = np.array(df['Time Difference'])
     mpp_entitiy.power_density = np.array(df['Power'])
     mpp_entitiy.voltage = np.array(df['Voltage'])
@@ -259,9 +650,9 @@ def _populate_labview_archive(header_dict, df, mpp_entitiy, mainfile=None):
     mpp_entitiy.efficiency = np.array(df['PCE'])
     _set_common_data_file(mpp_entitiy, mainfile)
 
-    datetime_str = get_parameter(header_dict, 'datetime')
-    datetime_object = datetime.strptime(datetime_str, '%Y-%m-%d %I:%M %p')
-    mpp_entitiy.datetime = datetime_object.strftime('%Y-%m-%d %H:%M:%S.%f')
+    _set_datetime(
+        mpp_entitiy, get_parameter(header_dict, 'datetime'), 'labview', logger
+    )
 
     properties = MPPTrackingProperties()
     properties.start_voltage_manually = (
@@ -288,46 +679,47 @@ def _populate_labview_archive(header_dict, df, mpp_entitiy, mainfile=None):
     mpp_entitiy.properties = properties
 
 
-def _populate_puri_archive(header_dict, df, mpp_entitiy, mainfile=None):
-    timestamp_col = _get_column(df, ['timestamp', 'time'])
-    if timestamp_col is None:
-        timestamp_col = _find_timestamp_column_by_value(df)
-    if timestamp_col is None:
+def _populate_puri_archive(header_dict, df, mpp_entitiy, mainfile=None, *, logger=None):
+    column_map = infer_column_map('puri', df)
+    if column_map['timestamp'] is None:
         raise ValueError(
             f'Timestamp column not found. Available columns: {df.columns.tolist()}'
         )
+    values = numeric_columns(
+        df, column_map, ['timestamp', 'power', 'voltage', 'current', 'efficiency']
+    )
 
-    df['time_diff'] = pd.to_numeric(df[timestamp_col], errors='coerce') / 1000.0
-    df['time_diff'] = df['time_diff'] - df['time_diff'].iloc[0]
-    mpp_entitiy.time = np.array(df['time_diff'])
-
-    power_col = _get_column(df, ['power', 'mw', 'mW'])
-    if power_col is not None:
-        mpp_entitiy.power_density = np.array(df[power_col])
-
-    voltage_col = _get_column(df, ['voltage', 'v(v)', 'v'])
-    if voltage_col is not None:
-        mpp_entitiy.voltage = np.array(df[voltage_col])
-
-    current_col = _get_column(df, ['current', 'j(ma', 'ma/cm'])
-    if current_col is not None:
-        mpp_entitiy.current_density = np.array(df[current_col])
+    time_diff = values['timestamp'] / 1000.0
+    time_diff = time_diff - time_diff[0]
+    mpp_entitiy.time = time_diff
 
-    efficiency_col = _get_column(df, ['efficiency', 'pce', 'pce('])
-    if efficiency_col is not None:
-        mpp_entitiy.efficiency = np.array(df[efficiency_col])
+    if 'power' in values:
+        mpp_entitiy.power_density = values['power']
+    if 'voltage' in values:
+        mpp_entitiy.voltage = values['voltage']
+    if 'current' in values:
+        mpp_entitiy.current_density = values['current']
+    if 'efficiency' in values:
+        mpp_entitiy.efficiency = values['efficiency']
 
     _set_common_data_file(mpp_entitiy, mainfile)
 
-    try:
-        time_col = _get_column(df, ['time', 'datetime', 'date'])
-        if time_col is None:
-            time_col = _find_time_string_column(df)
-        if time_col is not None:
-            first_datetime = df[time_col].iloc[0]
-            mpp_entitiy.datetime = str(first_datetime)
-    except (IndexError, KeyError, TypeError):
-        pass
+    time_col = column_map['datetime']
+    if time_col is not None and len(df) > 0:
+        # only the start is kept, the sample is enough to find it
+        datetimes = mpp_timestamps.parse_column(
+            df[time_col].head(VALUE_SAMPLE_ROWS), key='puri'
+        ).dropna()
+        if len(datetimes) > 0:
+            mpp_entitiy.datetime = archive_datetime(datetimes.iloc[0])
+        else:
+            # kept as it is written, as long as no format is known for it
+            mpp_entitiy.datetime = str(df[time_col].iloc[0])
+            if logger is not None:
+                logger.warning(
+                    'Could not parse the datetimes of the MPP file',
+                    datetime=mpp_entitiy.datetime,
+                )
 
     properties = MPPTrackingProperties()
     properties.perturbation_frequency = parse_numeric_with_unit(
@@ -341,71 +733,62 @@ def _populate_puri_archive(header_dict, df, mpp_entitiy, mainfile=None):
         get_first_parameter(header_dict, ['perturbation_period', 'pertubation_period']),
         default_unit='s',
     )
-    if len(df['time_diff']) > 0:
-        properties.time = df['time_diff'].iloc[-1]
-    if efficiency_col is not None and len(df[efficiency_col]) > 0:
-        properties.last_pce = df[efficiency_col].iloc[-1]
-    if voltage_col is not None and len(df[voltage_col]) > 0:
-        properties.last_vmpp = df[voltage_col].iloc[-1]
+    if len(time_diff) > 0:
+        properties.time = time_diff[-1]
+    if 'efficiency' in values and len(values['efficiency']) > 0:
+        properties.last_pce = values['efficiency'][-1]
+    if 'voltage' in values and len(values['voltage']) > 0:
+        properties.last_vmpp = values['voltage'][-1]
     mpp_entitiy.properties = properties
 
 
-def _populate_tflpuri_archive(header_dict, df, mpp_entitiy, mainfile=None):
-    # Keep local pandas Series to avoid reading back pint Quantities from the
-    # entity (which would raise TypeError when passed to float()).
-    times_s = None
-    voltage_v = None
+def _last_finite(values):
+    finite = values[np.isfinite(values)]
+    return float(finite[-1]) if len(finite) > 0 else None
+
+
+def _populate_tflpuri_archive(
+    header_dict, df, mpp_entitiy, mainfile=None, *, logger=None
+):
+    column_map = infer_column_map('tflpuri', df)
+    values = numeric_columns(df, column_map, ['time', 'voltage', 'current', 'power'])
     efficiency_pct = None
 
     # Filter out rows where power density is non-finite (Inf/-Inf from device
     # artefacts).  savgol_filter in the base-class normalizer requires a fully
     # finite power_density array; if ALL rows are non-finite, skip setting
     # power_density so the performance calculation is skipped entirely.
-    power_col_check = _get_column(df, ['power density', 'power'])
-    if power_col_check is not None:
-        finite_mask = np.isfinite(pd.to_numeric(df[power_col_check], errors='coerce'))
-        if finite_mask.any():
-            df = df[finite_mask].reset_index(drop=True)
-        else:
+    if 'power' in values:
+        finite_mask = np.isfinite(values['power'])
+        if not finite_mask.any():
             # No finite power values at all – do not set power_density so that
             # MPPTracking.normalize() skips calculate_performance_parameters().
-            power_col_check = None
-
-    time_col = _get_column(df, ['time(s)', 'time'])
-    if time_col is not None:
-        times_s = pd.to_numeric(df[time_col], errors='coerce')
-        times_s = times_s - times_s.iloc[0]
-        mpp_entitiy.time = np.array(times_s)
-
-    voltage_col = _get_column(df, ['voltage(v)', 'voltage'])
-    if voltage_col is not None:
-        voltage_v = pd.to_numeric(df[voltage_col], errors='coerce')
-        mpp_entitiy.voltage = voltage_v.to_numpy()
-
-    current_col = _get_column(df, ['current density', 'current'])
-    if current_col is not None:
-        mpp_entitiy.current_density = pd.to_numeric(
-            df[current_col], errors='coerce'
-        ).to_numpy()
-
-    power_col = power_col_check
-    if power_col is not None:
-        power_mw = pd.to_numeric(df[power_col], errors='coerce')
-        mpp_entitiy.power_density = np.array(power_mw)
+            del values['power']
+        elif not finite_mask.all():
+            values = {role: value[finite_mask] for role, value in values.items()}
+
+    if 'time' in values:
+        values['time'] = values['time'] - values['time'][0]
+        mpp_entitiy.time = values['time']
+
+    if 'voltage' in values:
+        mpp_entitiy.voltage = values['voltage']
+
+    if 'current' in values:
+        mpp_entitiy.current_density = values['current']
+
+    if 'power' in values:
+        mpp_entitiy.power_density = values['power']
         illumination = get_parameter(header_dict, 'illumination_intensity_mw/cm2')
         if illumination and float(illumination) > 0:
-            efficiency_pct = power_mw / float(illumination) * 100
-            mpp_entitiy.efficiency = np.array(efficiency_pct)
+            efficiency_pct = values['power'] / float(illumination) * 100
+            mpp_entitiy.efficiency = efficiency_pct
 
     _set_common_data_file(mpp_entitiy, mainfile)
 
-    try:
-        datetime_str = get_parameter(header_dict, 'test_start_time')
-        if datetime_str:
-            datetime_object = datetime.strptime(str(datetime_str), '%Y%m%d_%H:%M:%S')
-            mpp_entitiy.datetime = datetime_object.strftime('%Y-%m-%d %H:%M:%S.%f')
-    except (ValueError, TypeError):
-        pass
+    _set_datetime(
+        mpp_entitiy, get_parameter(header_dict, 'test_start_time'), 'tflpuri', logger
+    )
 
     properties = MPPTrackingProperties()
     properties.perturbation_frequency = get_parameter(
@@ -415,46 +798,301 @@ def _populate_tflpuri_archive(header_dict, df, mpp_entitiy, mainfile=None):
     if step_mv is not None:
         properties.perturbation_voltage = float(step_mv) / 1000.0
 
-    if times_s is not None and len(times_s) > 0:
-        valid_times = times_s[np.isfinite(times_s)]
-        if len(valid_times) > 0:
-            properties.time = float(valid_times.iloc[-1])
-    if efficiency_pct is not None and len(efficiency_pct) > 0:
-        valid_pce = efficiency_pct[np.isfinite(efficiency_pct)]
-        if len(valid_pce) > 0:
-            properties.last_pce = float(valid_pce.iloc[-1])
-    if voltage_v is not None and len(voltage_v) > 0:
-        valid_v = voltage_v[np.isfinite(voltage_v)]
-        if len(valid_v) > 0:
-            properties.last_vmpp = float(valid_v.iloc[-1])
+    if 'time' in values:
+        properties.time = _last_finite(values['time'])
+    if efficiency_pct is not None:
+        properties.last_pce = _last_finite(efficiency_pct)
+    if 'voltage' in values:
+        properties.last_vmpp = _last_finite(values['voltage'])
     mpp_entitiy.properties = properties
 
 
-def _populate_python_archive(header_dict, df, mpp_entitiy, mainfile=None):
+def _populate_python_archive(
+    header_dict, df, mpp_entitiy, mainfile=None, *, logger=None
+):
     mpp_entitiy.time = np.array(df['Time'])
     mpp_entitiy.power_density = np.array(df['Power'])
     mpp_entitiy.voltage = np.array(df['Voltage'])
     mpp_entitiy.current_density = np.array(df['CurrentDensity'])
     _set_common_data_file(mpp_entitiy, mainfile)
 
-    datetime_str = get_parameter(header_dict, 'datetime')
-    datetime_object = datetime.strptime(datetime_str, '%a %b %d %H:%M:%S %Y')
-    mpp_entitiy.datetime = datetime_object.strftime('%Y-%m-%d %H:%M:%S.%f')
+    _set_datetime(mpp_entitiy, get_parameter(header_dict, 'datetime'), 'python', logger)
     mpp_entitiy.properties = MPPTrackingProperties()
 
 
-def get_mpp_archive(header_dict, file_type, df, mpp_entitiy, mainfile=None):
+def get_mpp_archive(
+    header_dict, file_type, df, mpp_entitiy, mainfile=None, *, logger=None
+):
     if file_type == 'labview':
-        _populate_labview_archive(header_dict, df, mpp_entitiy, mainfile=mainfile)
+        _populate_labview_archive(
+            header_dict, df, mpp_entitiy, mainfile=mainfile, logger=logger
+        )
     elif file_type == 'puri':
-        _populate_puri_archive(header_dict, df, mpp_entitiy, mainfile=mainfile)
+        _populate_puri_archive(
+            header_dict, df, mpp_entitiy, mainfile=mainfile, logger=logger
+        )
     elif file_type == 'tflpuri':
-        _populate_tflpuri_archive(header_dict, df, mpp_entitiy, mainfile=mainfile)
+        _populate_tflpuri_archive(
+            header_dict, df, mpp_entitiy, mainfile=mainfile, logger=logger
+        )
     elif file_type == 'python':
-        _populate_python_archive(header_dict, df, mpp_entitiy, mainfile=mainfile)
+        _populate_python_archive(
+            header_dict, df, mpp_entitiy, mainfile=mainfile, logger=logger
+        )
+
+
+MPP_TRACK_QUANTITIES = (
+    'time',
+    'power_density',
+    'voltage',
+    'current_density',
+    'efficiency',
+)
+
+
+def envelope_indices(series, max_points):
+    """
+    Indices of at most ``max_points`` samples that keep the first and the last
+    sample and, in equally long buckets, the minimum and the maximum of every
+    array of ``series``.
+    """
+    n_points = len(series[0])
+    if n_points <= max_points:
+        return np.arange(n_points)
+    n_buckets = max(1, (max_points - 2) // (2 * len(series)))
+    size = -(-n_points // n_buckets)
+    n_buckets = -(-n_points // size)
+    starts = np.arange(n_buckets) * size
+
+    keep = [np.array([0, n_points - 1])]
+    for array in series:
+        values = np.asarray(array, dtype=np.float64)
+        nan = np.isnan(values)
+        low = np.full(n_buckets * size, np.inf)
+        low[:n_points] = np.where(nan, np.inf, values)
+        high = np.full(n_buckets * size, -np.inf)
+        high[:n_points] = np.where(nan, -np.inf, values)
+        keep.append(starts + low.reshape(n_buckets, size).argmin(axis=1))
+        keep.append(starts + high.reshape(n_buckets, size).argmax(axis=1))
+    return np.unique(np.concatenate(keep))
+
+
+def decimate_mpp_archive(archive, mpp_entitiy, max_points):
+    """
+    Keeps a min/max envelope of at most ``max_points`` points of the track for
+    plotting, every point goes to ``<data_file>.h5`` and is referenced in the
+    HDF5 references ``<name>_hdf5`` of the track. Returns if the track was
+    decimated.
+    """
+    arrays = {
+        name: getattr(mpp_entitiy, name)
+        for name in MPP_TRACK_QUANTITIES
+        if getattr(mpp_entitiy, name, None) is not None
+    }
+    if 'time' not in arrays or len(arrays['time']) <= max_points:
+        return False
+
+    full_data_file = hdf5_file_name(mpp_entitiy.data_file)
+    write_hdf5_arrays(archive, full_data_file, arrays)
+    indices = envelope_indices(
+        [getattr(value, 'magnitude', value) for value in arrays.values()], max_points
+    )
+    for name, value in arrays.items():
+        setattr(mpp_entitiy, name, value[indices])
+    mpp_entitiy.full_data_file = full_data_file
+    mpp_entitiy.full_data_points = len(arrays['time'])
+    set_hdf5_references(mpp_entitiy, arrays, full_data_file)
+    return True
 
 
 # with open(
 #     '/home/a2853/Downloads/UserGivenName_pX1_MPPT_lt_lp0_20250109T171021.mpp.txt'
 # ) as f:
 #     get_mpp_data(f.read())
+
+
+# fractions of the running maximum whose first crossing is reported, as T95/T80
+STABILITY_LEVELS = {'t95': 0.95, 't80': 0.8}
+# seconds at the end of a track that the final mean and deviation are taken over
+STABILITY_WINDOW_S = 3600.0
+# seconds at the start of a track that T95/T80 ignore, the burn-in
+STABILITY_BURN_IN_S = 300.0
+# seconds of the trailing mean that T95/T80 are measured on, so that spikes and
+# dips of single points do not set them
+STABILITY_SMOOTHING_S = 300.0
+
+
+def _moments(x, y):
+    """Count, means and centered second moments of ``x`` and ``y``."""
+    dx = x - x.mean()
+    dy = y - y.mean()
+    return np.array(
+        [len(x), x.mean(), y.mean(), dx @ dx, dx @ dy, dy @ dy], dtype=np.float64
+    )
+
+
+def _merge_moments(a, b):
+    # pairwise update, stable for long tracks unlike sums of squares
+    if a[0] == 0:
+        return b
+    n = a[0] + b[0]
+    dx = b[1] - a[1]
+    dy = b[2] - a[2]
+    weight = a[0] * b[0] / n
+    return np.array(
+        [
+            n,
+            a[1] + dx * b[0] / n,
+            a[2] + dy * b[0] / n,
+            a[3] + b[3] + dx * dx * weight,
+            a[4] + b[4] + dx * dy * weight,
+            a[5] + b[5] + dy * dy * weight,
+        ]
+    )
+
+
+def _fit(moments):
+    """Slope, intercept and r² of the least squares line of merged moments."""
+    n, mean_x, mean_y, xx, xy, yy = moments
+    if n < 2 or xx <= 0:
+        return None, None, None
+    slope = xy / xx
+    r_squared = xy * xy / (xx * yy) if yy > 0 else 1.0
+    return slope, mean_y - slope * mean_x, r_squared
+
+
+def _last_seconds(time, values, seconds):
+    keep = time >= time[-1] - seconds
+    return time[keep], values[keep]
+
+
+class StabilityMetrics:
+    """
+    Stability figures of an MPP track, updated chunk by chunk so that a track
+    is never needed as a whole: the maximum and when it was reached, a linear
+    fit of the values and one of their logarithm over time, and mean and
+    variance over the last ``window`` seconds. T95/T80 are when the trailing
+    mean over ``smoothing`` seconds of the points after the first ``burn_in``
+    seconds first falls below the ``STABILITY_LEVELS`` of its own running
+    maximum, counted once it spans ``smoothing`` seconds. Times are counted
+    from the first point, non-finite points are skipped.
+    """
+
+    def __init__(
+        self,
+        window=STABILITY_WINDOW_S,
+        smoothing=STABILITY_SMOOTHING_S,
+        burn_in=STABILITY_BURN_IN_S,
+    ):
+        self.window = window
+        self.smoothing = smoothing
+        self.burn_in = burn_in
+        self.start = None
+        self.maximum = -np.inf
+        self.time_of_maximum = None
+        self.smoothed_maximum = -np.inf
+        self.crossings = dict.fromkeys(STABILITY_LEVELS)
+        self._linear = np.zeros(6)
+        self._exponential = np.zeros(6)
+        self._tail_time = np.empty(0)
+        self._tail_values = np.empty(0)
+        self._smoothing_time = np.empty(0)
+        self._smoothing_values = np.empty(0)
+
+    def _smoothed(self, time, values):
+        """The trailing means at ``time``, from the points kept of earlier chunks."""
+        if len(time) == 0:
+            return values
+        all_time = np.concatenate([self._smoothing_time, time])
+        all_values = np.concatenate([self._smoothing_values, values])
+        sums = np.concatenate([[0.0], np.cumsum(all_values)])
+        last = np.arange(len(all_time) - len(time), len(all_time))
+        first = np.searchsorted(all_time, time - self.smoothing)
+        self._smoothing_time, self._smoothing_values = _last_seconds(
+            all_time, all_values, self.smoothing
+        )
+        return (sums[last + 1] - sums[first]) / (last + 1 - first)
+
+    def _update_crossings(self, time, smoothed):
+        if len(time) == 0:
+            return
+        running = np.maximum(np.maximum.accumulate(smoothed), self.smoothed_maximum)
+        for name, level in STABILITY_LEVELS.items():
+            if self.crossings[name] is None:
+                below = np.flatnonzero((running > 0) & (smoothed < level * running))
+                if len(below) > 0:
+                    self.crossings[name] = float(time[below[0]])
+        self.smoothed_maximum = float(running[-1])
+
+    def update(self, time, values):
+        time = np.asarray(time, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(time) & np.isfinite(values)
+        time, values = time[finite], values[finite]
+        if len(time) == 0:
+            return
+        if self.start is None:
+            self.start = time[0]
+        time = time - self.start
+
+        burnt_in = time >= self.burn_in
+        later_time = time[burnt_in]
+        smoothed = self._smoothed(later_time, values[burnt_in])
+        settled = later_time >= self.burn_in + self.smoothing
+        self._update_crossings(later_time[settled], smoothed[settled])
+        peak = values.argmax()
+        if values[peak] > self.maximum:
+            self.maximum = float(values[peak])
+            self.time_of_maximum = float(time[peak])
+
+        self._linear = _merge_moments(self._linear, _moments(time, values))
+        positive = values > 0
+        if positive.any():
+            self._exponential = _merge_moments(
+                self._exponential,
+                _moments(time[positive], np.log(values[positive])),
+            )
+
+        self._tail_time, self._tail_values = _last_seconds(
+            np.concatenate([self._tail_time, time]),
+            np.concatenate([self._tail_values, values]),
+            self.window,
+        )
+
+    def metrics(self):
+        """
+        The figures as ``{name: value}``, relative ones as fractions of the
+        maximum and rates per second. Empty if no point was finite.
+        """
+        if self.start is None:
+            return {}
+        slope, _, linear_r2 = _fit(self._linear)
+        log_slope, _, exponential_r2 = _fit(self._exponential)
+        relative = self.maximum > 0
+        return {
+            'maximum': self.maximum,
+            'time_of_maximum': self.time_of_maximum,
+            **self.crossings,
+            'drift_rate': slope / self.maximum
+            if relative and slope is not None
+            else None,
+            'drift_r_squared': linear_r2,
+            'decay_rate': -log_slope if log_slope is not None else None,
+            'decay_r_squared': exponential_r2,
+            'final_mean': float(self._tail_values.mean() / self.maximum)
+            if relative
+            else None,
+            'final_std': float(self._tail_values.std() / self.maximum)
+            if relative
+            else None,
+        }
+
+
+def stability_metrics(time, values, chunk_rows=MPP_CHUNK_ROWS):
+    """The `StabilityMetrics` of a track, fed ``chunk_rows`` points at a time."""
+    metrics = StabilityMetrics()
+    for start in range(0, len(values), chunk_rows):
+        metrics.update(
+            time[start : start + chunk_rows], values[start : start + chunk_rows]
+        )
+    return metrics.metrics()
@@ -0,0 +1,107 @@
+import hashlib
+import re
+from collections import OrderedDict
+
+LAYOUT_CACHE_SIZE = 64
+# header lines whose key names make up the signature of a layout
+LAYOUT_KEY_LINES = 64
+# the start of a file that `leading_signature` looks at
+LAYOUT_SIGNATURE_CHARS = 2048
+
+_digits = re.compile(r'\d+')
+_layout_caches = {}
+
+
+class LayoutCache:
+    """
+    An LRU cache of the resolved layouts of instrument files, keyed by a header
+    signature. ``hits`` and ``misses`` count the lookups since the last
+    `clear`, `layout_cache_stats` collects them for all caches.
+    """
+
+    def __init__(self, name, maxsize=LAYOUT_CACHE_SIZE):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._layouts = OrderedDict()
+        _layout_caches[name] = self
+
+    def get(self, signature):
+        layout = self._layouts.get(signature)
+        if layout is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._layouts.move_to_end(signature)
+        return layout
+
+    def put(self, signature, layout):
+        self._layouts[signature] = layout
+        self._layouts.move_to_end(signature)
+        if len(self._layouts) > self.maxsize:
+            self._layouts.popitem(last=False)
+        return layout
+
+    def clear(self):
+        self._layouts.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._layouts)}
+
+
+def header_key(line, separators=('\t', ': ')):
+    """
+    The key name of a header line, the text before the first separator.
+    Digits are left out, so dates and numbers in place of a key do not matter.
+    """
+    for separator in separators:
+        line = line.split(separator, 1)[0]
+    return _digits.sub('', line).strip()
+
+
+def header_signature(file_type, names):
+    """A hash of the file type and the first ``LAYOUT_KEY_LINES`` names."""
+    return hashlib.blake2b(
+        '\x1f'.join([file_type, *names[:LAYOUT_KEY_LINES]]).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+def _is_data_row(line, sep):
+    fields = [field for field in line.split(sep) if field.strip()]
+    if not fields:
+        return False
+    try:
+        for field in fields:
+            float(field)
+    except ValueError:
+        return False
+    return True
+
+
+def leading_signature(file_type, text, sep):
+    """
+    The `header_signature` of a file from ``text``, its first
+    ``LAYOUT_SIGNATURE_CHARS`` characters, before its header is read. Lines
+    from the first row of numbers on are left out, as is the last line, which
+    may be cut off.
+    """
+    names = []
+    for line in text.splitlines()[:-1]:
+        if _is_data_row(line, sep):
+            break
+        names.append(header_key(line))
+    return header_signature(file_type, names)
+
+
+def layout_cache_stats():
+    """Hits, misses and size of every layout cache, by name."""
+    return {name: cache.stats() for name, cache in _layout_caches.items()}
+
+
+def clear_layout_caches():
+    for cache in _layout_caches.values():
+        cache.clear()
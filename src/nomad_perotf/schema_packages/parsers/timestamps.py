@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pandas as pd
+
+# how datetimes are written to the archive
+ARCHIVE_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+# values of a column that a format is tried on before the whole column
+COLUMN_SAMPLE_ROWS = 100
+
+# the '%p' of the first format is ignored with '%H', kept for existing entries
+JV_DATETIME_FORMATS = ('%Y-%m-%d %H:%M:%S %p', '%Y-%m-%d %H:%M:%S')
+JV_FILE_NAME_DATETIME_FORMATS = ('%Y%m%dT%H%M%S',)
+# the format of every measurement program, tried first for its files
+MPP_DATETIME_FORMATS = {
+    'labview': '%Y-%m-%d %I:%M %p',
+    'python': '%a %b %d %H:%M:%S %Y',
+    'tflpuri': '%Y%m%d_%H:%M:%S',
+    'puri': '%Y-%m-%d %H:%M:%S',
+}
+
+
+class TimestampResolver:
+    """
+    Parses timestamps with the first of ``formats`` that fits. The format that
+    fitted last is remembered per key, a measurement program or instrument, and
+    tried first for the next timestamp of that key. ``preferred`` gives the
+    formats tried first before anything was learned.
+    """
+
+    def __init__(self, formats, preferred=None):
+        self.formats = tuple(dict.fromkeys([*(preferred or {}).values(), *formats]))
+        self._learned = dict(preferred or {})
+
+    def candidates(self, key=None):
+        learned = self._learned.get(key)
+        if learned is None:
+            return self.formats
+        return (learned, *(f for f in self.formats if f != learned))
+
+    def find_format(self, value, key=None):
+        """The first format that ``value`` fits, None if none does."""
+        return self._parse(value, key)[0]
+
+    def parse(self, value, key=None):
+        """The datetime of ``value``, None if no format fits."""
+        return self._parse(value, key)[1]
+
+    def _parse(self, value, key):
+        if value is None:
+            return None, None
+        value = str(value).strip()
+        for datetime_format in self.candidates(key):
+            try:
+                parsed = datetime.strptime(value, datetime_format)
+            except ValueError:
+                continue
+            self._learned[key] = datetime_format
+            return datetime_format, parsed
+        return None, None
+
+    def parse_column(self, values, key=None):
+        """
+        ``values`` as datetime64, converted at once with the format that fits
+        most of the first ``COLUMN_SAMPLE_ROWS`` values that are not empty.
+        Values that do not fit are NaT, all of them if no format fits.
+        """
+        values = pd.Series(values)
+        values = values.astype(str).str.strip().where(values.notna())
+        sample = values.dropna().head(COLUMN_SAMPLE_ROWS)
+        best_format, best_count = None, 0
+        for datetime_format in self.candidates(key) if len(sample) else ():
+            parsed = pd.to_datetime(sample, format=datetime_format, errors='coerce')
+            count = parsed.notna().sum()
+            if count > best_count:
+                best_format, best_count = datetime_format, count
+            if count == len(sample):
+                break
+        if best_format is None:
+            return pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        self._learned[key] = best_format
+        return pd.to_datetime(values, format=best_format, errors='coerce')
+
+
+def archive_datetime(value):
+    """A datetime as it is written to the archive, None stays None."""
+    if value is None or pd.isna(value):
+        return None
+    return value.strftime(ARCHIVE_DATETIME_FORMAT)
+
+
+jv_timestamps = TimestampResolver(JV_DATETIME_FORMATS)
+jv_file_name_timestamps = TimestampResolver(JV_FILE_NAME_DATETIME_FORMATS)
+mpp_timestamps = TimestampResolver(
+    ['%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S'], preferred=MPP_DATETIME_FORMATS
+)
@@ -1,5 +1,4 @@
 # from nomad.units import ureg
-import datetime
 
 import numpy as np
 from baseclasses import BaseMeasurement, BaseProcess, Batch, LayerDeposition
@@ -11,7 +10,6 @@ from baseclasses.chemical import Chemical
 from baseclasses.experimental_plan import ExperimentalPlan
 from baseclasses.helper.utilities import (
     convert_datetime,
-    get_encoding,
     set_sample_reference,
 )
 from baseclasses.material_processes_misc import (
@@ -54,7 +52,8 @@ from baseclasses.wet_chemical_deposition import (
     SpinCoatingRecipe,
     WetChemicalDeposition,
 )
-from nomad.datamodel.data import EntryData
+from nomad.datamodel.data import ArchiveSection, EntryData
+from nomad.datamodel.hdf5 import HDF5Reference
 from nomad.datamodel.metainfo.common import ProvenanceTracker
 from nomad.datamodel.metainfo.plot import PlotSection
 from nomad.datamodel.results import (
@@ -77,8 +76,58 @@ from nomad_luqy_plugin.schema_packages.schema_package import (
     AbsPLSettings,
 )
 
+from nomad_perotf.schema_packages.hdf5_arrays import hdf5_file_name, offload_arrays
+from nomad_perotf.schema_packages.parsers.timestamps import (
+    jv_file_name_timestamps,
+    jv_timestamps,
+)
+from nomad_perotf.schema_packages.raw_files import (
+    find_reverse_jv_scan,
+    open_raw_text,
+    read_raw_text,
+)
+
 m_package = SchemaPackage(name='peroTF', aliases=['perotf_s'])
 
+
+def package_option(name, default=None):
+    """An option of the entry point of this package, ``default`` outside NOMAD."""
+    from nomad.config import config
+
+    # no plugins are configured outside a NOMAD installation
+    if config.plugins is None:
+        return default
+    try:
+        entry_point = config.get_plugin_entry_point(
+            'nomad_perotf.schema_packages:perotf_package'
+        )
+    except KeyError:
+        return default
+    return getattr(entry_point, name, default)
+
+
+def convert_jv_datetime(value, resolver=jv_timestamps, key=None):
+    """
+    ``value`` converted by `convert_datetime` with the format ``resolver`` finds
+    for it, None if no format fits.
+    """
+    datetime_format = resolver.find_format(value, key=key)
+    if datetime_format is None:
+        return None
+    return convert_datetime(
+        str(value).strip(), datetime_format=datetime_format, utc=False
+    )
+
+
+def set_jv_datetime(measurement, jv_dict, logger, key=None):
+    """Sets the datetime of a JV file, warns once if it cannot be parsed."""
+    converted = convert_jv_datetime(jv_dict.get('datetime'), key=key)
+    if converted is not None:
+        measurement.datetime = converted
+    else:
+        logger.warning('Couldnt parse datetime', datetime=jv_dict.get('datetime'))
+
+
 # %% ####################### Entities
 
 
@@ -1018,44 +1067,131 @@ class peroTF_CR_SolSimBox_JVmeasurement(JVMeasurement, EntryData):
         self.method = 'JV Measurement'
 
         if self.data_file:
-            from baseclasses.helper.utilities import get_encoding
+            filedata = read_raw_text(archive, self.data_file)
+            from baseclasses.helper.archive_builder.jv_archive import get_jv_archive
 
-            with archive.m_context.raw_file(self.data_file, 'br') as f:
-                encoding = get_encoding(f)
+            from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
+                get_jv_data,
+            )
 
-            with archive.m_context.raw_file(
-                self.data_file, 'rt', encoding=encoding
-            ) as f:
-                from baseclasses.helper.archive_builder.jv_archive import get_jv_archive
+            jv_dict = get_jv_data(filedata)
+            set_jv_datetime(self, jv_dict, logger)
 
-                from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
-                    get_jv_data,
-                )
+            get_jv_archive(jv_dict, self.data_file, self)
 
-                jv_dict = get_jv_data(f.read())
-                try:
-                    self.datetime = convert_datetime(
-                        jv_dict['datetime'],
-                        datetime_format='%Y-%m-%d %H:%M:%S %p',
-                        utc=False,
-                    )
+        super().normalize(archive, logger)
 
-                except Exception:
-                    try:
-                        self.datetime = convert_datetime(
-                            jv_dict['datetime'],
-                            datetime_format='%Y-%m-%d %H:%M:%S',
-                            utc=False,
-                        )
-                    except Exception:
-                        logger.warning('Couldnt parse datetime')
 
-                get_jv_archive(jv_dict, self.data_file, self)
+class ExternalArrays(ArchiveSection):
+    array_file = Quantity(
+        type=str,
+        a_browser=dict(adaptor='RawFileAdaptor'),
+        description='HDF5 file with the arrays of this section listed in '
+        'external_arrays, at the archive path of the section.',
+    )
 
-        super().normalize(archive, logger)
+    external_arrays = Quantity(
+        type=str,
+        shape=['*'],
+        description='Arrays of this section that are kept in array_file.',
+    )
+
+
+class MPPTrackArrays(ExternalArrays):
+    """The HDF5 references of the track arrays of an MPP tracking."""
+
+    time_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='Every point of time, if it was moved to array_file or '
+        'full_data_file.',
+    )
+
+    power_density_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='Every point of power_density, if it was moved to array_file or '
+        'full_data_file.',
+    )
+
+    voltage_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='Every point of voltage, if it was moved to array_file or '
+        'full_data_file.',
+    )
+
+    current_density_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='Every point of current_density, if it was moved to array_file or '
+        'full_data_file.',
+    )
+
+    efficiency_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='Every point of efficiency, if it was moved to array_file or '
+        'full_data_file.',
+    )
 
 
-class peroTF_MPPTracking(MPPTracking, EntryData):
+def mpp_preview_points(measurement_programm):
+    """The number of points tracks of this program are decimated to, if any."""
+    return (package_option('mpp_preview_points') or {}).get(measurement_programm)
+
+
+class peroTF_MPPStability(ArchiveSection):
+    m_def = Section(
+        description='Stability figures of the full track, of the efficiency if '
+        'there is one and of the power density otherwise. Relative figures are '
+        'fractions of the maximum.'
+    )
+
+    maximum = Quantity(
+        type=np.float64,
+        description='Highest efficiency in %, or power density in mW/cm^2.',
+    )
+
+    time_of_maximum = Quantity(type=np.float64, unit='s')
+
+    t95 = Quantity(
+        type=np.float64,
+        unit='s',
+        description='Time when the 5 min trailing mean of the track after a 5 min '
+        'burn-in first falls below 95% of its running maximum.',
+    )
+
+    t80 = Quantity(
+        type=np.float64,
+        unit='s',
+        description='Time when the 5 min trailing mean of the track after a 5 min '
+        'burn-in first falls below 80% of its running maximum.',
+    )
+
+    drift_rate = Quantity(
+        type=np.float64,
+        unit='1/s',
+        description='Slope of a linear fit, relative to the maximum.',
+    )
+
+    drift_r_squared = Quantity(type=np.float64)
+
+    decay_rate = Quantity(
+        type=np.float64,
+        unit='1/s',
+        description='Rate of an exponential fit, positive for a decaying track.',
+    )
+
+    decay_r_squared = Quantity(type=np.float64)
+
+    final_mean = Quantity(
+        type=np.float64,
+        description='Mean of the last hour, relative to the maximum.',
+    )
+
+    final_std = Quantity(
+        type=np.float64,
+        description='Standard deviation of the last hour, relative to the maximum.',
+    )
+
+
+class peroTF_MPPTracking(MPPTracking, EntryData, MPPTrackArrays):
     m_def = Section(
         a_eln=dict(
             hide=[
@@ -1090,32 +1226,82 @@ class peroTF_MPPTracking(MPPTracking, EntryData):
         ),
     )
 
+    full_data_file = Quantity(
+        type=str,
+        a_browser=dict(adaptor='RawFileAdaptor'),
+        description='HDF5 file with every point of a decimated track.',
+    )
+
+    full_data_points = Quantity(
+        type=int,
+        description='Number of points of the track before it was decimated.',
+    )
+
+    stability = SubSection(section_def=peroTF_MPPStability)
+
+    def set_stability(self):
+        from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
+            stability_metrics,
+        )
+
+        values = self.efficiency if self.efficiency is not None else self.power_density
+        if self.time is None or values is None:
+            return
+        metrics = stability_metrics(
+            np.asarray(getattr(self.time, 'magnitude', self.time)),
+            np.asarray(getattr(values, 'magnitude', values)),
+        )
+        if not metrics:
+            return
+        self.stability = peroTF_MPPStability(
+            **{name: value for name, value in metrics.items() if value is not None}
+        )
+
     def normalize(self, archive, logger):
         if not self.samples and self.data_file:
             search_id = self.data_file.split('.')[0]
             set_sample_reference(archive, self, search_id)
 
         if self.data_file:
-            from baseclasses.helper.utilities import get_encoding
+            from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
+                get_mpp_archive,
+                read_mpp_file,
+            )
 
-            with archive.m_context.raw_file(self.data_file, 'br') as f:
-                encoding = get_encoding(f)
+            mpp_dict, data, file_type = read_mpp_file(
+                archive,
+                self.data_file,
+                resumable=package_option('resume_mpp_files', False),
+            )
+            self.measurement_programm = file_type
+            get_mpp_archive(mpp_dict, file_type, data, self, logger=logger)
+            self.set_stability()
+        super().normalize(archive, logger)
 
-            with archive.m_context.raw_file(
-                self.data_file, 'rt', encoding=encoding
-            ) as f:
-                from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
-                    get_mpp_archive,
-                    get_mpp_data,
-                )
+        if not self.data_file:
+            return
+        from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
+            MPP_TRACK_QUANTITIES,
+            decimate_mpp_archive,
+        )
 
-                mpp_dict, data, file_type = get_mpp_data(f.read())
-                self.measurement_programm = file_type
-                get_mpp_archive(mpp_dict, file_type, data, self)
-        super().normalize(archive, logger)
+        max_points = mpp_preview_points(self.measurement_programm)
+        if max_points and decimate_mpp_archive(archive, self, max_points):
+            self.array_file = None
+            self.external_arrays = None
+            return
+        self.full_data_file = None
+        self.full_data_points = None
+        offload_arrays(
+            archive,
+            hdf5_file_name(self.data_file),
+            [self],
+            MPP_TRACK_QUANTITIES,
+            package_option('hdf5_array_points', 0),
+        )
 
 
-class peroTF_CR_SolSimBox_MPPTracking(MPPTracking, EntryData):
+class peroTF_CR_SolSimBox_MPPTracking(MPPTracking, EntryData, MPPTrackArrays):
     m_def = Section(
         a_eln=dict(
             hide=[
@@ -1144,22 +1330,28 @@ class peroTF_CR_SolSimBox_MPPTracking(MPPTracking, EntryData):
 
     def normalize(self, archive, logger):
         if self.data_file:
-            from baseclasses.helper.utilities import get_encoding
+            from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
+                get_mpp_archive,
+                read_mpp_data,
+            )
 
-            with archive.m_context.raw_file(self.data_file, 'br') as f:
-                encoding = get_encoding(f)
+            with open_raw_text(archive, self.data_file) as f:
+                mpp_dict, data, file_type = read_mpp_data(f)
+            get_mpp_archive(mpp_dict, file_type, data, self, logger=logger)
+        super().normalize(archive, logger)
 
-            with archive.m_context.raw_file(
-                self.data_file, 'rt', encoding=encoding
-            ) as f:
-                from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
-                    get_mpp_archive,
-                    get_mpp_data,
-                )
+        if self.data_file:
+            from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
+                MPP_TRACK_QUANTITIES,
+            )
 
-                mpp_dict, data, file_type = get_mpp_data(f.read())
-                get_mpp_archive(mpp_dict, file_type, data, self)
-        super().normalize(archive, logger)
+            offload_arrays(
+                archive,
+                hdf5_file_name(self.data_file),
+                [self],
+                MPP_TRACK_QUANTITIES,
+                package_option('hdf5_array_points', 0),
+            )
 
 
 class peroTF_TFL_GammaBox_JVmeasurement(JVMeasurement, EntryData):
@@ -1217,38 +1409,16 @@ class peroTF_TFL_GammaBox_JVmeasurement(JVMeasurement, EntryData):
         self.method = 'JV Measurement'
 
         if self.data_file:
-            from baseclasses.helper.utilities import get_encoding
-
-            with archive.m_context.raw_file(self.data_file, 'br') as f:
-                encoding = get_encoding(f)
-
-            with archive.m_context.raw_file(
-                self.data_file, 'tr', encoding=encoding
-            ) as f:
-                from baseclasses.helper.archive_builder.jv_archive import get_jv_archive
-
-                from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
-                    get_jv_data,
-                )
+            filedata = read_raw_text(archive, self.data_file)
+            from baseclasses.helper.archive_builder.jv_archive import get_jv_archive
 
-                jv_dict = get_jv_data(f.read())
-                try:
-                    self.datetime = convert_datetime(
-                        jv_dict['datetime'],
-                        datetime_format='%Y-%m-%d %H:%M:%S %p',
-                        utc=False,
-                    )
+            from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
+                get_jv_data,
+            )
 
-                except Exception:
-                    try:
-                        self.datetime = convert_datetime(
-                            jv_dict['datetime'],
-                            datetime_format='%Y-%m-%d %H:%M:%S',
-                            utc=False,
-                        )
-                    except Exception:
-                        logger.warning('Couldnt parse datetime')
-                get_jv_archive(jv_dict, self.data_file, self)
+            jv_dict = get_jv_data(filedata)
+            set_jv_datetime(self, jv_dict, logger)
+            get_jv_archive(jv_dict, self.data_file, self)
 
         super().normalize(archive, logger)
 
@@ -1335,38 +1505,31 @@ class peroTF_UVvisMeasurement(UVvisMeasurement, EntryData):
         self.method = 'UVvis Measurement'
 
         if self.data_file:
-            from baseclasses.helper.utilities import get_encoding
-
-            with archive.m_context.raw_file(self.data_file[0], 'br') as f:
-                encoding = get_encoding(f)
-
-            with archive.m_context.raw_file(
-                self.data_file[0], 'tr', encoding=encoding
-            ) as f:
-                from nomad_perotf.schema_packages.parsers.KIT_uvvis_parser import (
-                    get_uvvis_data,
-                )
-
-                uvvis_dict = get_uvvis_data(f.read())
-
-                self.bandgaps_uvvis = [
-                    peak[0] for peak in uvvis_dict.get('Eg,popt,f_r', [])
-                ]
+            filedata = read_raw_text(archive, self.data_file[0])
+            from nomad_perotf.schema_packages.parsers.KIT_uvvis_parser import (
+                get_uvvis_data,
+            )
 
-                uvvis_data = []
-                for m in [
-                    'reflection',
-                    'transmission',
-                    'absorption',
-                ]:
-                    uvvis_data.append(
-                        UVvisData(
-                            name=m,
-                            wavelength=uvvis_dict.get('wavelength'),
-                            intensity=uvvis_dict.get(m),
-                        )
+            uvvis_dict = get_uvvis_data(filedata)
+
+            self.bandgaps_uvvis = [
+                peak[0] for peak in uvvis_dict.get('Eg,popt,f_r', [])
+            ]
+
+            uvvis_data = []
+            for m in [
+                'reflection',
+                'transmission',
+                'absorption',
+            ]:
+                uvvis_data.append(
+                    UVvisData(
+                        name=m,
+                        wavelength=uvvis_dict.get('wavelength'),
+                        intensity=uvvis_dict.get(m),
                     )
-                self.measurements = uvvis_data
+                )
+            self.measurements = uvvis_data
 
         super().normalize(archive, logger)
         if self.bandgaps_uvvis is not None and len(self.bandgaps_uvvis) > 0:
@@ -1386,8 +1549,24 @@ class peroTF_UVvisMeasurement(UVvisMeasurement, EntryData):
             archive.results.properties.electronic = electronic
 
 
+ABSPL_ARRAYS = (
+    'wavelength',
+    'luminescence_flux_density',
+    'raw_spectrum_counts',
+    'dark_spectrum_counts',
+)
+EQE_ARRAYS = (
+    'raw_eqe_array',
+    'raw_photon_energy_array',
+    'raw_wavelength_array',
+    'eqe_array',
+    'wavelength_array',
+    'photon_energy_array',
+)
+
+
 # big thx to hzb (micha and edgar)
-class peroTF_AbsPLResult(AbsPLResult):
+class peroTF_AbsPLResult(AbsPLResult, ExternalArrays):
     m_def = Section(label='AbsPLResult with iVoc')
 
     i_voc = Quantity(
@@ -1409,6 +1588,26 @@ class peroTF_AbsPLResult(AbsPLResult):
         a_eln=dict(component='NumberEditQuantity', label='Laser intensity (suns)'),
     )
 
+    wavelength_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='wavelength in array_file, if it was moved there.',
+    )
+
+    luminescence_flux_density_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='luminescence_flux_density in array_file, if it was moved there.',
+    )
+
+    raw_spectrum_counts_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='raw_spectrum_counts in array_file, if it was moved there.',
+    )
+
+    dark_spectrum_counts_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='dark_spectrum_counts in array_file, if it was moved there.',
+    )
+
 
 class peroTF_AbsPLMeasurement(AbsPLMeasurement, EntryData):
     m_def = Section(label='Absolute PL Measurement')
@@ -1458,19 +1657,17 @@ class peroTF_AbsPLMeasurement(AbsPLMeasurement, EntryData):
                         dark_counts, dtype=float
                     )
                 else:
-                    with archive.m_context.raw_file(self.data_file, 'br') as f:
-                        encoding = get_encoding(f)
-
                     from nomad_perotf.schema_packages.parsers.KIT_abspl_parser import (
                         parse_multiple_abspl,
                     )
 
-                    with archive.m_context.raw_file(
-                        self.data_file, 'tr', encoding=encoding
-                    ) as f:
-                        settings_vals, result_vals, data = parse_multiple_abspl(
-                            f.read()
-                        )
+                    filedata = read_raw_text(
+                        archive,
+                        self.data_file,
+                        default_encoding='cp1252',
+                        errors='replace',
+                    )
+                    settings_vals, result_vals, data = parse_multiple_abspl(filedata)
                     for key, val in settings_vals.items():
                         try:
                             setattr(self.settings, key, float(val))
@@ -1499,6 +1696,15 @@ class peroTF_AbsPLMeasurement(AbsPLMeasurement, EntryData):
 
         super().normalize(archive, logger)
 
+        if self.data_file and self.results:
+            offload_arrays(
+                archive,
+                hdf5_file_name(self.data_file),
+                self.results,
+                ABSPL_ARRAYS,
+                package_option('hdf5_array_points', 0),
+            )
+
 
 class peroTF_JVmeasurement(JVMeasurement, EntryData):
     m_def = Section(
@@ -1566,39 +1772,22 @@ class peroTF_JVmeasurement(JVMeasurement, EntryData):
     )
 
     def map_jv_measurement(self, file, archive, logger):
-        with archive.m_context.raw_file(file, 'br') as f:
-            encoding = get_encoding(f)
-
-        with archive.m_context.raw_file(file, 'tr', encoding=encoding) as f:
-            from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
-                get_jv_data,
-            )
-
-            jv_dict = get_jv_data(f.read())
-            try:
-                self.datetime = convert_datetime(
-                    file.split('.')[-3][-15:],
-                    datetime_format='%Y%m%dT%H%M%S',
-                    utc=False,
-                )
-            except Exception:
-                try:
-                    self.datetime = convert_datetime(
-                        jv_dict['datetime'],
-                        datetime_format='%Y-%m-%d %H:%M:%S %p',
-                        utc=False,
-                    )
+        filedata = read_raw_text(archive, file)
+        from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
+            get_jv_data,
+        )
 
-                except Exception:
-                    try:
-                        self.datetime = convert_datetime(
-                            jv_dict['datetime'],
-                            datetime_format='%Y-%m-%d %H:%M:%S',
-                            utc=False,
-                        )
-                    except Exception:
-                        logger.warning('Couldnt parse datetime')
-            return jv_dict
+        jv_dict = get_jv_data(filedata)
+        name_parts = file.split('.')
+        file_name_datetime = convert_jv_datetime(
+            name_parts[-3][-15:] if len(name_parts) > 2 else None,
+            jv_file_name_timestamps,
+        )
+        if file_name_datetime is not None:
+            self.datetime = file_name_datetime
+        else:
+            set_jv_datetime(self, jv_dict, logger, key=self.measurement_programm)
+        return jv_dict
 
     def normalize(self, archive, logger):
         super(JVMeasurement, self).normalize(archive, logger)
@@ -1614,40 +1803,15 @@ class peroTF_JVmeasurement(JVMeasurement, EntryData):
                 identify_file_type,
             )
 
-            with archive.m_context.raw_file(self.data_file, 'br') as f:
-                encoding = get_encoding(f)
-            with archive.m_context.raw_file(
-                self.data_file, 'tr', encoding=encoding
-            ) as f:
-                self.measurement_programm = identify_file_type(f.read())
+            filedata = read_raw_text(archive, self.data_file)
+            self.measurement_programm = identify_file_type(filedata)
 
         if (
             not self.data_file_reverse
             and self.data_file
             and self.measurement_programm == 'python'
         ):
-            test_string = self.data_file.replace('fwd', 'rev')[:-21]
-            fwd_time = datetime.datetime.strptime(
-                self.data_file.split('.')[-3][-15:], '%Y%m%dT%H%M%S'
-            )
-            for file in archive.m_context.upload_files.raw_directory_list():
-                if not file.path.startswith(test_string) and file.path.endswith(
-                    'jv.txt'
-                ):
-                    continue
-                try:
-                    rew_time = datetime.datetime.strptime(
-                        file.path.split('.')[-3][-15:], '%Y%m%dT%H%M%S'
-                    )
-                except Exception:
-                    continue
-
-                if (
-                    datetime.timedelta(seconds=1)
-                    < abs(rew_time - fwd_time)
-                    < datetime.timedelta(minutes=1)
-                ):
-                    self.data_file_reverse = file.path
+            self.data_file_reverse = find_reverse_jv_scan(archive, self.data_file)
 
         if self.data_file:
             jv_dict = self.map_jv_measurement(self.data_file, archive, logger)
@@ -1690,6 +1854,19 @@ class peroTF_TFL_GammaBox_EQEmeasurement(EQEMeasurement, EntryData):
         ),
     )
 
+    def normalize(self, archive, logger):
+        super().normalize(archive, logger)
+
+        eqe_data = [eqe for eqe in self.eqe_data or [] if eqe.eqe_data_file]
+        if eqe_data:
+            offload_arrays(
+                archive,
+                hdf5_file_name(eqe_data[0].eqe_data_file),
+                eqe_data,
+                EQE_ARRAYS,
+                package_option('hdf5_array_points', 0),
+            )
+
 
 class peroTF_PLImaging(PLImaging, EntryData):
     m_def = Section(
@@ -1870,7 +2047,7 @@ def add_solar_cell(archive):
         archive.results.properties.optoelectronic.solar_cell = SolarCell()
 
 
-class SolarCellEQE(PlotSection):
+class SolarCellEQE(PlotSection, ExternalArrays):
     m_def = Section(
         a_eln=dict(lane_width='600px'),
         a_plotly_graph_object=[
@@ -2035,6 +2212,36 @@ class SolarCellEQE(PlotSection):
         *E<sub>u</sub>*  of the eqe spectrum""",
     )
 
+    raw_eqe_array_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='raw_eqe_array in array_file, if it was moved there.',
+    )
+
+    raw_photon_energy_array_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='raw_photon_energy_array in array_file, if it was moved there.',
+    )
+
+    raw_wavelength_array_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='raw_wavelength_array in array_file, if it was moved there.',
+    )
+
+    eqe_array_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='eqe_array in array_file, if it was moved there.',
+    )
+
+    wavelength_array_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='wavelength_array in array_file, if it was moved there.',
+    )
+
+    photon_energy_array_hdf5 = Quantity(
+        type=HDF5Reference,
+        description='photon_energy_array in array_file, if it was moved there.',
+    )
+
     def normalize(self, archive, logger):
         super().normalize(archive, logger)
 
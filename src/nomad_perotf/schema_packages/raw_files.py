@@ -0,0 +1,211 @@
+import bisect
+import datetime
+import hashlib
+import io
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# chardet only needs the start of a file to settle on an encoding
+ENCODING_PREFIX_BYTES = 64 * 1024
+CACHE_SIZE = 32
+# bytes at either end of the read part of a file that `prefix_hash` covers
+PREFIX_HASH_BYTES = 64 * 1024
+
+JV_SCAN_TIMESTAMP_FORMAT = '%Y%m%dT%H%M%S'
+# seconds before a lookup miss may rebuild the index of an upload
+JV_SCAN_INDEX_MAX_AGE = 5
+JV_SCAN_INDEX_UPLOADS = 8
+
+_text_cache = OrderedDict()
+_jv_scan_indices = OrderedDict()
+
+io_counters = {'opens': 0, 'reads': 0, 'bytes_read': 0, 'cache_hits': 0}
+
+
+def reset_raw_file_cache():
+    _text_cache.clear()
+    _jv_scan_indices.clear()
+    for key in io_counters:
+        io_counters[key] = 0
+
+
+def _modification_time(f):
+    try:
+        return os.fstat(f.fileno()).st_mtime_ns
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def detect_encoding(f, default_encoding='utf-8'):
+    """
+    The encoding of the binary file ``f``, which is left at its start.
+
+    It is detected on the first ``ENCODING_PREFIX_BYTES`` bytes. As a start
+    that is pure ASCII says nothing about the rest, the file is then searched
+    for the first block with other bytes, which is detected together with the
+    block after it. Files that are ASCII throughout get ``default_encoding``.
+    """
+    from baseclasses.helper.utilities import get_encoding
+
+    f.seek(0)
+    block = f.read(ENCODING_PREFIX_BYTES)
+    while block.isascii():
+        block = f.read(ENCODING_PREFIX_BYTES)
+        if not block:
+            f.seek(0)
+            return default_encoding
+        if not block.isascii():
+            block += f.read(ENCODING_PREFIX_BYTES)
+            break
+    f.seek(0)
+    return get_encoding(io.BytesIO(block)) or default_encoding
+
+
+def read_raw_text(archive, path, default_encoding='utf-8', errors='strict'):
+    """
+    Reads and decodes a raw file of the upload with a single read.
+
+    The encoding is detected with `detect_encoding` and line endings are
+    translated like a text mode ``open``. The decoded text is cached per
+    (upload, path, modification time), so normalizers that need the same file
+    several times only read it once.
+    """
+    upload_id = getattr(archive.m_context, 'upload_id', None)
+    with archive.m_context.raw_file(path, 'rb') as f:
+        io_counters['opens'] += 1
+        mtime = _modification_time(f)
+        key = (upload_id, path, mtime, default_encoding, errors)
+        if mtime is not None and key in _text_cache:
+            io_counters['cache_hits'] += 1
+            _text_cache.move_to_end(key)
+            return _text_cache[key]
+
+        raw_bytes = f.read()
+    io_counters['reads'] += 1
+    io_counters['bytes_read'] += len(raw_bytes)
+
+    encoding = detect_encoding(io.BytesIO(raw_bytes), default_encoding)
+    text = raw_bytes.decode(encoding, errors=errors)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+    if mtime is not None:
+        _text_cache[key] = text
+        if len(_text_cache) > CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    return text
+
+
+@contextmanager
+def open_raw_text(
+    archive, path, default_encoding='utf-8', errors='strict', *, offset=0, encoding=None
+):
+    """
+    Opens a raw file of the upload as text, for parsers that read it bit by bit.
+    The text starts at the byte ``offset``, which has to be the start of a line.
+
+    Encoding detection and line endings are the same as in `read_raw_text`, the
+    text is not cached. An ``encoding`` found for the file before skips the
+    detection, which may read all of a file that is ASCII.
+    """
+    with archive.m_context.raw_file(path, 'rb') as f:
+        io_counters['opens'] += 1
+        if encoding is None:
+            encoding = detect_encoding(f, default_encoding)
+        f.seek(offset)
+        text = io.TextIOWrapper(f, encoding=encoding, errors=errors, newline=None)
+        try:
+            yield text
+        finally:
+            io_counters['reads'] += 1
+            io_counters['bytes_read'] += f.tell() - offset
+            text.detach()
+
+
+def complete_lines_end(f):
+    """The offset after the last line break of the binary file ``f``, 0 if none."""
+    position = f.seek(0, os.SEEK_END)
+    while position > 0:
+        start = max(0, position - ENCODING_PREFIX_BYTES)
+        f.seek(start)
+        block = f.read(position - start)
+        index = block.rfind(b'\n')
+        if index >= 0:
+            return start + index + 1
+        position = start
+    return 0
+
+
+def prefix_hash(f, offset):
+    """
+    A hash of the first ``offset`` bytes of the binary file ``f``. Only the
+    first and the last ``PREFIX_HASH_BYTES`` of them are read, so it takes the
+    same time for any file: a rewritten header or a rewritten end of the part
+    that was read changes it, a change in between does not. Covering all of it
+    would mean reading all of it on every check.
+    """
+    digest = hashlib.blake2b(str(offset).encode(), digest_size=16)
+    f.seek(0)
+    digest.update(f.read(min(offset, PREFIX_HASH_BYTES)))
+    f.seek(max(0, offset - PREFIX_HASH_BYTES))
+    digest.update(f.read(min(offset, PREFIX_HASH_BYTES)))
+    return digest.hexdigest()
+
+
+def _jv_scan_time(path):
+    return datetime.datetime.strptime(
+        path.split('.')[-3][-15:], JV_SCAN_TIMESTAMP_FORMAT
+    )
+
+
+def _build_jv_scan_index(upload_files):
+    """Sorted scan times and paths of all python JV files, per name prefix."""
+    index = {}
+    for file in upload_files.raw_directory_list():
+        if not file.path.endswith('jv.txt'):
+            continue
+        try:
+            scan_time = _jv_scan_time(file.path)
+        except (ValueError, IndexError):
+            continue
+        index.setdefault(file.path[:-21], []).append((scan_time, file.path))
+
+    for prefix, scans in index.items():
+        scans.sort()
+        index[prefix] = ([scan[0] for scan in scans], [scan[1] for scan in scans])
+    return index
+
+
+def _closest_scan(index, prefix, scan_time):
+    times, paths = index.get(prefix, ([], []))
+    start = bisect.bisect_right(times, scan_time - datetime.timedelta(minutes=1))
+    stop = bisect.bisect_left(times, scan_time + datetime.timedelta(minutes=1))
+    candidates = [
+        (abs(times[i] - scan_time), paths[i])
+        for i in range(start, stop)
+        if abs(times[i] - scan_time) > datetime.timedelta(seconds=1)
+    ]
+    return min(candidates)[1] if candidates else None
+
+
+def find_reverse_jv_scan(archive, data_file):
+    """
+    Returns the reverse scan measured within a minute of a python forward scan.
+
+    The scans of an upload are indexed once by name prefix and timestamp and the
+    index is shared by all JV entries processed in the same run. An index older
+    than ``JV_SCAN_INDEX_MAX_AGE`` is rebuilt before the lookup, so scans that
+    were added, renamed or deleted since are picked up in long running workers.
+    """
+    prefix = data_file.replace('fwd', 'rev')[:-21]
+    scan_time = _jv_scan_time(data_file)
+    upload_id = getattr(archive.m_context, 'upload_id', None)
+
+    built, index = _jv_scan_indices.get(upload_id, (None, None))
+    if built is None or time.monotonic() - built > JV_SCAN_INDEX_MAX_AGE:
+        index = _build_jv_scan_index(archive.m_context.upload_files)
+        _jv_scan_indices[upload_id] = (time.monotonic(), index)
+        if len(_jv_scan_indices) > JV_SCAN_INDEX_UPLOADS:
+            _jv_scan_indices.popitem(last=False)
+    return _closest_scan(index, prefix, scan_time)
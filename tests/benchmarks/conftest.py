@@ -0,0 +1,344 @@
+import os
+import zipfile
+
+import numpy as np
+import pytest
+
+DATA_DIR = os.path.join('tests', 'data')
+
+JV_FILES = {
+    'labview': ('KIT_DaBa_20230202_Batch-1_0_7.px7_mid.jv.csv', 11),
+    'python': ('UserGivenName_pX1_fwd_lt_lp0_20250109T164058.jv.txt', 48),
+}
+
+
+def read_data_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), encoding='utf-8') as f:
+        return f.read()
+
+
+def scaled_jv_file(file_type, n_points):
+    """A JV fixture resampled to ``n_points`` voltage steps, header unchanged."""
+    file_name, header_line = JV_FILES[file_type]
+    lines = read_data_file(file_name).splitlines()
+    data = np.loadtxt(lines[header_line + 1 :], delimiter='\t', ndmin=2)
+    order = np.argsort(data[:, 0])
+    voltage = np.linspace(data[order, 0].min(), data[order, 0].max(), n_points)
+    columns = [voltage] + [
+        np.interp(voltage, data[order, 0], data[order, column])
+        for column in range(1, data.shape[1])
+    ]
+    body = '\n'.join(
+        '\t'.join(f'{value:.6E}' for value in row) for row in np.column_stack(columns)
+    )
+    return '\n'.join(lines[: header_line + 1]) + '\n' + body + '\n'
+
+
+@pytest.fixture
+def jv_file():
+    """Returns the raw text of a JV fixture, optionally resampled."""
+
+    def _jv_file(file_type, n_points=None):
+        if n_points is None:
+            return read_data_file(JV_FILES[file_type][0])
+        return scaled_jv_file(file_type, n_points)
+
+    return _jv_file
+
+
+def large_eqe_text(file_format, n_points):
+    """
+    A Bentham (header of the test fixture) or an Enlitec like (5 header lines,
+    decimal commas) EQE file with ``n_points`` wavelengths.
+    """
+    wavelength = np.linspace(300, 1100, n_points)
+    eqe = 80 * np.exp(-(((wavelength - 650) / 320) ** 8))
+    if file_format == 'bentham':
+        with open(os.path.join(DATA_DIR, 'AA00_C3_20.47mAcm-2.eqe.dat')) as f:
+            lines = f.read().splitlines()
+        header = lines[: lines.index('POINTS IN SPECTRUM END') + 1]
+        rows = [f'{w:.3f}\t{e:.7f}' for w, e in zip(wavelength, eqe)]
+    else:
+        header = ['EQE measurement', 'Sample: A', 'Date: 01.01.2025', 'Bias: 0 V']
+        header.append('Wavelength (nm)\tEQE (%)\tReference (A/W)')
+        rows = [
+            f'{w:.3f}\t{e:.7f}\t0.5'.replace('.', ',') for w, e in zip(wavelength, eqe)
+        ]
+    return '\n'.join(header + rows) + '\n'
+
+
+@pytest.fixture
+def large_eqe_file(tmp_path):
+    """Writes a large EQE file, see `large_eqe_text`."""
+
+    def _large_eqe_file(file_format, n_points):
+        path = tmp_path / f'large_{file_format}_{n_points}.eqe.txt'
+        path.write_text(large_eqe_text(file_format, n_points))
+        return str(path)
+
+    return _large_eqe_file
+
+
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="http://schemas.'
+        'openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/></Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/'
+        'main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/'
+        'relationships"><sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/>'
+        '</sheets></workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="http://schemas.'
+        'openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/></Relationships>'
+    ),
+}
+
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord('A') + rest) + letters
+    return letters
+
+
+def write_large_xlsx(path, n_rows, n_cols=20, seed=0):
+    """
+    Writes an xlsx file with a two row header in shared strings and ``n_rows``
+    rows of random numbers and sample names, without going through openpyxl.
+    """
+    rng = np.random.default_rng(seed)
+    letters = [_column_letter(i) for i in range(n_cols)]
+    header = ['Measurement'] + [f'col {i}' for i in range(n_cols)]
+    names = [f'sample {i}' for i in range(n_rows)]
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as xlsx:
+        for name, content in XLSX_PARTS.items():
+            xlsx.writestr(name, content)
+
+        with xlsx.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8"?><worksheet xmlns='
+                b'"http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b'<sheetData><row r="1"><c r="A1" t="s"><v>0</v></c></row>'
+                b'<row r="2">'
+                + ''.join(
+                    f'<c r="{letter}2" t="s"><v>{i + 1}</v></c>'
+                    for i, letter in enumerate(letters)
+                ).encode()
+                + b'</row>'
+            )
+            for start in range(0, n_rows, 1000):
+                values = rng.random((min(1000, n_rows - start), n_cols))
+                chunk = []
+                for offset, row in enumerate(values):
+                    r = start + offset + 3
+                    cells = [
+                        f'<c r="A{r}" t="s"><v>{len(header) + start + offset}</v></c>'
+                    ]
+                    cells.extend(
+                        f'<c r="{letter}{r}"><v>{value!r}</v></c>'
+                        for letter, value in zip(letters[1:], row[1:])
+                    )
+                    chunk.append(f'<row r="{r}">{"".join(cells)}</row>')
+                sheet.write(''.join(chunk).encode())
+            sheet.write(b'</sheetData></worksheet>')
+
+        strings = ''.join(f'<si><t>{s}</t></si>' for s in header + names)
+        xlsx.writestr(
+            'xl/sharedStrings.xml',
+            '<?xml version="1.0" encoding="UTF-8"?><sst xmlns='
+            '"http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            f'{strings}</sst>',
+        )
+    return path
+
+
+@pytest.fixture(scope='session')
+def large_xlsx_file(tmp_path_factory):
+    """Writes a large xlsx file once per session, see `write_large_xlsx`."""
+
+    def _large_xlsx_file(n_rows):
+        path = tmp_path_factory.getbasetemp() / f'large_{n_rows}.xlsx'
+        if not path.exists():
+            write_large_xlsx(path, n_rows)
+        return str(path)
+
+    return _large_xlsx_file
+
+
+MPP_FILES = {
+    'labview': 'KIT_DaBa_20230219_Experimnt-AB_2_2_MPP.1.mpp.csv',
+    'python': 'UserGivenName_pX1_MPPT_lt_lp0_20250109T171021.mpp.txt',
+}
+
+
+def scaled_mpp_text(file_type, n_points, seed=0):
+    """
+    An MPP track of ``n_points`` seconds sampled at 1 Hz below the header of the
+    fixture, e.g. 86_400 points for a 24 h track.
+    """
+    rng = np.random.default_rng(seed)
+    lines = read_data_file(MPP_FILES[file_type]).splitlines()
+    time = np.arange(n_points, dtype=float) + 0.5
+    # slow burn-in with some tracking noise
+    power = 17.5 * (1 - 0.1 * time / time[-1]) + rng.normal(0, 0.05, n_points)
+    voltage = np.round(0.84 + rng.normal(0, 0.01, n_points), 2)
+    current_density = power / voltage
+    if file_type == 'labview':
+        header = lines[: lines.index(next(x for x in lines if x.startswith('s\t'))) + 1]
+        columns = [time, -voltage, -current_density, power, power / 0.995]
+    else:
+        header = lines[: next(i for i, x in enumerate(lines) if x.startswith('Time\t'))]
+        header.append(lines[len(header)])
+        columns = [
+            time,
+            power,
+            1000 * voltage,
+            current_density,
+            current_density / 1000,
+            np.full(n_points, 5),
+            np.full(n_points, 100.0),
+        ]
+    body = '\n'.join(
+        '\t'.join(f'{value:.6E}' for value in row) for row in np.column_stack(columns)
+    )
+    return '\n'.join(header) + '\n' + body + '\n'
+
+
+def synthetic_uvvis_text(n_points):
+    """
+    Reflection and transmission of a ~1.6 eV absorber, ';' separated and scanned
+    from long to short wavelengths like the spectrometer does.
+    """
+    wavelength = np.linspace(1200, 300, n_points)
+    edge = 1 / (1 + np.exp(-(wavelength - 775) / 12))
+    reflection = 10 + 2 * np.sin(wavelength / 40)
+    transmission = 85 * edge
+    rows = [
+        f'{w:.2f};{r:.4f};{t:.4f}'
+        for w, r, t in zip(wavelength, reflection, transmission)
+    ]
+    return '\n'.join(['Wavelength (nm);R (%);T (%)'] + rows) + '\n'
+
+
+ABSPL_SETTINGS = {
+    'Bias Voltage (V)': 0.0,
+    'SMU current density (mA/cm2)': 0.0,
+    'Integration Time (ms)': 100.0,
+    'Delay time (s)': 1.0,
+    'EQE @ laser wavelength': 0.9,
+    'Laser spot size (cm²)': 0.1,
+    'Subcell area (cm²)': 0.16,
+}
+ABSPL_DASHES = '-' * 28
+
+
+def _abspl_spectrum(n_points):
+    wavelength = np.linspace(500, 1100, n_points)
+    counts = 1e4 * np.exp(-(((wavelength - 790) / 30) ** 2))
+    return wavelength, counts
+
+
+def synthetic_abspl_text(n_points):
+    """A single AbsPL measurement with ``n_points`` spectrum rows."""
+    wavelength, counts = _abspl_spectrum(n_points)
+    header = [f'{key}\t{value}' for key, value in ABSPL_SETTINGS.items()]
+    header += ['Laser intensity (suns)\t1.0', 'LuQY (%)\t1.2', 'QFLS (eV)\t1.21']
+    header += [ABSPL_DASHES, 'Wavelength\tLum flux\tRaw counts\tDark counts']
+    rows = [
+        f'{w:.3f}\t{c * 1e-12:.6E}\t{c:.1f}\t{100.0:.1f}'
+        for w, c in zip(wavelength, counts)
+    ]
+    return '\n'.join(header + rows) + '\n'
+
+
+def synthetic_multiple_abspl_text(n_points, n_measurements):
+    """``n_measurements`` AbsPL spectra at rising laser intensity in one file."""
+    wavelength, counts = _abspl_spectrum(n_points)
+    suns = np.geomspace(0.01, 10, n_measurements)
+
+    def row(key, values):
+        return '\t'.join([key] + [str(v) for v in values])
+
+    header = [row(k, [v] * n_measurements) for k, v in ABSPL_SETTINGS.items()]
+    header += [
+        row('Laser intensity (suns)', suns),
+        row('LuQY (%)', np.round(1.2 * suns**0.1, 4)),
+        row('QFLS (eV)', np.round(1.2 + 0.026 * np.log(suns), 4)),
+    ]
+    columns = ['Wavelength'] + [f'Spectrum {i}' for i in range(n_measurements)]
+    header += [
+        ABSPL_DASHES,
+        '\t'.join(columns),
+        '\t'.join(['nm'] + ['counts'] * n_measurements),
+    ]
+    spectra = np.outer(counts, suns)
+    rows = [
+        '\t'.join([f'{w:.3f}'] + [f'{c:.1f}' for c in spectrum])
+        for w, spectrum in zip(wavelength, spectra)
+    ]
+    return '\n'.join(header + rows) + '\n'
+
+
+@pytest.fixture(scope='session')
+def mpp_text():
+    """Builds MPP tracks, see `scaled_mpp_text`."""
+    return scaled_mpp_text
+
+
+@pytest.fixture(scope='session')
+def uvvis_text():
+    """Builds UV-vis spectra, see `synthetic_uvvis_text`."""
+    return synthetic_uvvis_text
+
+
+@pytest.fixture(scope='session')
+def abspl_text():
+    """Builds AbsPL files, see `synthetic_abspl_text`."""
+    return synthetic_abspl_text
+
+
+@pytest.fixture(scope='session')
+def multiple_abspl_text():
+    """Builds AbsPL intensity series, see `synthetic_multiple_abspl_text`."""
+    return synthetic_multiple_abspl_text
+
+
+@pytest.fixture(scope='session')
+def large_mpp_file(tmp_path_factory):
+    """Writes an MPP track once per session, see `scaled_mpp_text`."""
+    directory = tmp_path_factory.mktemp('mpp')
+
+    def _large_mpp_file(file_type, n_points):
+        path = directory / f'large_{file_type}_{n_points}.mpp.txt'
+        if not path.exists():
+            path.write_text(scaled_mpp_text(file_type, n_points))
+        return str(path)
+
+    return _large_mpp_file
@@ -0,0 +1,74 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from nomad.metainfo import MSection, Quantity, SubSection
+
+from nomad_perotf.schema_packages.hdf5_arrays import (
+    load_external_arrays,
+    offload_arrays,
+)
+
+# a multiple AbsPL file and a one day MPP track at 1 Hz
+CASES = {'abspl': (10, 2_048), 'mpp': (1, 86_400)}
+
+
+class Series(MSection):
+    x = Quantity(type=np.float64, shape=['*'], unit='nm')
+    y = Quantity(type=np.float64, shape=['*'])
+    z = Quantity(type=np.float64, shape=['*'])
+    array_file = Quantity(type=str)
+    external_arrays = Quantity(type=str, shape=['*'])
+
+
+class Entry(MSection):
+    results = SubSection(section_def=Series, repeats=True)
+
+
+def synthetic_entry(n_series, n_points, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(400, 900, n_points)
+    return Entry(
+        results=[
+            Series(x=x, y=rng.normal(size=n_points), z=rng.normal(size=n_points))
+            for _ in range(n_series)
+        ]
+    )
+
+
+@pytest.mark.parametrize('storage', ['inline', 'hdf5'])
+@pytest.mark.parametrize('case', CASES)
+def test_load_archive(benchmark, upload_archive, case, storage):
+    entry = synthetic_entry(*CASES[case])
+    if storage == 'hdf5':
+        offload_arrays(upload_archive, 'data.h5', entry.results, ['x', 'y', 'z'], 1)
+    content = json.dumps(entry.m_to_dict())
+    benchmark.group = f'load_archive-{case}'
+    benchmark.extra_info['archive_bytes'] = len(content)
+    if storage == 'hdf5':
+        benchmark.extra_info['hdf5_bytes'] = os.path.getsize(
+            os.path.join(upload_archive.m_context.directory, 'data.h5')
+        )
+
+    loaded = benchmark(lambda: Entry.m_from_dict(json.loads(content)))
+
+    assert len(loaded.results) == CASES[case][0]
+
+
+@pytest.mark.parametrize('case', CASES)
+def test_load_external_arrays(benchmark, upload_archive, case):
+    entry = synthetic_entry(*CASES[case])
+    offload_arrays(upload_archive, 'data.h5', entry.results, ['x', 'y', 'z'], 1)
+    content = json.dumps(entry.m_to_dict())
+    benchmark.group = f'load_archive-{case}'
+
+    def load_with_arrays():
+        loaded = Entry.m_from_dict(json.loads(content))
+        for result in loaded.results:
+            load_external_arrays(upload_archive, result)
+        return loaded
+
+    loaded = benchmark(load_with_arrays)
+
+    assert len(loaded.results[0].y) == CASES[case][1]
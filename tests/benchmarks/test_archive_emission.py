@@ -0,0 +1,32 @@
+import pytest
+
+from nomad_perotf.parsers.archive_writer import write_archives
+
+N_ENTRIES = 2000
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_write_archives(benchmark, upload_archive_factory, child_entries, workers):
+    entries = child_entries(N_ENTRIES)
+    benchmark.group = 'batch-write_archives'
+
+    written = benchmark.pedantic(
+        lambda archive: write_archives(entries, archive, workers=workers),
+        setup=lambda: ((upload_archive_factory(),), {}),
+        rounds=5,
+    )
+
+    assert len(written) == N_ENTRIES
+
+
+def test_write_unchanged_archives(benchmark, upload_archive, child_entries):
+    entries = child_entries(N_ENTRIES)
+    fingerprints = {}
+    write_archives(entries, upload_archive, fingerprints=fingerprints)
+    benchmark.group = 'batch-write_archives'
+
+    written = benchmark(
+        write_archives, entries, upload_archive, fingerprints=fingerprints
+    )
+
+    assert written == []
@@ -0,0 +1,36 @@
+import pytest
+
+from nomad_perotf.schema_packages.parsers.KIT_eqe_parser import (
+    EQEAnalyzer,
+    analyze_many,
+)
+
+N_FILES = 50
+
+
+@pytest.fixture(scope='module')
+def campaign(tmp_path_factory, scaled_eqe_file):
+    """Copies of the Bentham fixture with scaled EQE values."""
+    directory = tmp_path_factory.mktemp('eqe_campaign')
+    paths = []
+    for n in range(N_FILES):
+        paths.append(scaled_eqe_file(directory, 0.5 + n / N_FILES))
+    return paths
+
+
+def test_eqe_dict_per_file(benchmark, campaign):
+    benchmark.group = 'eqe-campaign'
+    results = benchmark.pedantic(
+        lambda: [EQEAnalyzer(p, header_lines=63).eqe_dict() for p in campaign],
+        rounds=3,
+    )
+    assert len(results) == N_FILES
+
+
+def test_analyze_many(benchmark, campaign):
+    benchmark.group = 'eqe-campaign'
+    result = benchmark.pedantic(
+        lambda: analyze_many(campaign, header_lines=63),
+        rounds=3,
+    )
+    assert result['jsc'].notna().all()
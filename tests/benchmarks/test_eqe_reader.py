@@ -0,0 +1,19 @@
+import pytest
+
+from nomad_perotf.schema_packages.parsers.KIT_eqe_parser import EQEAnalyzer
+
+N_POINTS = 50_000
+HEADER_LINES = {'bentham': 63, 'enlitec': 5}
+
+
+@pytest.mark.parametrize('file_format', ['bentham', 'enlitec'])
+def test_read_file(benchmark, large_eqe_file, file_format):
+    path = large_eqe_file(file_format, N_POINTS)
+    header_lines = HEADER_LINES[file_format]
+    benchmark.group = 'eqe-read_file'
+
+    df = benchmark(lambda: EQEAnalyzer(path, header_lines=header_lines).read_file())
+
+    # with 63 header lines the first Bentham data row is taken as column names
+    assert len(df) >= N_POINTS - 1
+    assert df.dtypes.tolist() == ['float64', 'float64']
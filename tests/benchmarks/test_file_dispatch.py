@@ -0,0 +1,51 @@
+import re
+
+import numpy as np
+
+from nomad_perotf.parsers import perotf_parser
+from nomad_perotf.parsers.measurement_files import (
+    measurement_factory,
+    split_measurement_file_name,
+)
+
+N_FILES = 100_000
+FILE_TYPES = [
+    'jv.csv',
+    'jv.txt',
+    'eqe.dat',
+    'eqe.txt',
+    'mpp.csv',
+    'mpp.txt',
+    'uvvis.csv',
+    'abspl.txt',
+    'sem.tif',
+    'pero.txt',
+    'xlsx',
+]
+
+
+def synthetic_file_names(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        f'uploads/KIT_DaBa_2025{i % 12 + 1:02d}_Batch-{i}_0_{i % 9}.'
+        f'px{i % 8}_{["top", "mid", "bot"][i % 3]}.{FILE_TYPES[t]}'
+        for i, t in enumerate(rng.integers(len(FILE_TYPES), size=n))
+    ]
+
+
+def test_match_and_dispatch(benchmark):
+    file_names = synthetic_file_names(N_FILES)
+    mainfile_name_re = re.compile(perotf_parser.mainfile_name_re)
+
+    def match_and_dispatch():
+        factories = []
+        for file_name in file_names:
+            if mainfile_name_re.match(file_name) is None:
+                continue
+            _, _, technique, extension, _ = split_measurement_file_name(file_name)
+            factories.append(measurement_factory(technique, extension))
+        return factories
+
+    factories = benchmark(match_and_dispatch)
+
+    assert 0 < len(factories) < N_FILES
@@ -0,0 +1,54 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from nomad_perotf.schema_packages.raw_files import (
+    find_reverse_jv_scan,
+    reset_raw_file_cache,
+)
+
+N_FILES = 5000
+
+
+class SyntheticUpload:
+    """An upload with ``n_files`` python JV scans of fwd/rev pairs."""
+
+    upload_id = 'synthetic_upload'
+
+    def __init__(self, n_files):
+        start = datetime.datetime(2025, 1, 9, 8, 0, 0)
+        self.forward_files = []
+        self.files = []
+        for pair in range(n_files // 2):
+            scan_time = start + datetime.timedelta(seconds=20 * pair)
+            name = f'Sample{pair % 50}_pX{pair % 6 + 1}_{{}}_lt_lp0_{{:%Y%m%dT%H%M%S}}'
+            forward = name.format('fwd', scan_time) + '.jv.txt'
+            reverse = name.format('rev', scan_time + datetime.timedelta(seconds=8))
+            self.forward_files.append(forward)
+            self.files += [forward, reverse + '.jv.txt']
+
+    @property
+    def upload_files(self):
+        return self
+
+    def raw_directory_list(self):
+        return [SimpleNamespace(path=path) for path in self.files]
+
+
+@pytest.fixture
+def upload():
+    return SyntheticUpload(N_FILES)
+
+
+def test_pair_all_scans(benchmark, upload):
+    archive = SimpleNamespace(m_context=upload)
+
+    def pair_all():
+        reset_raw_file_cache()
+        return [find_reverse_jv_scan(archive, f) for f in upload.forward_files]
+
+    reverse_files = benchmark(pair_all)
+
+    assert all(reverse_files)
+    assert reverse_files[0] == upload.files[1]
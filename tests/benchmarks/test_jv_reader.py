@@ -0,0 +1,33 @@
+import pytest
+
+from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
+    get_jv_data,
+    read_jv_file,
+)
+
+SIZES = [None, 10_000]
+
+FILE_TYPES = ['labview', 'python']
+
+
+@pytest.mark.parametrize('n_points', SIZES)
+@pytest.mark.parametrize('file_type', FILE_TYPES)
+def test_read_jv_file(benchmark, jv_file, file_type, n_points):
+    filedata = jv_file(file_type, n_points)
+    benchmark.group = f'read_jv_file-{n_points or "fixture"}'
+
+    parsed_type, _, columns, data = benchmark(read_jv_file, filedata)
+
+    assert parsed_type == file_type
+    assert data.shape[1] == len(columns)
+
+
+@pytest.mark.parametrize('n_points', SIZES)
+@pytest.mark.parametrize('file_type', FILE_TYPES)
+def test_get_jv_data(benchmark, jv_file, file_type, n_points):
+    filedata = jv_file(file_type, n_points)
+    benchmark.group = f'get_jv_data-{n_points or "fixture"}'
+
+    jv_dict = benchmark(get_jv_data, filedata)
+
+    assert len(jv_dict['jv_curve']) == len(jv_dict['V_oc'])
@@ -0,0 +1,124 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from nomad import utils
+
+from nomad_perotf.schema_packages.parsers.KIT_abspl_parser import (
+    parse_abspl_data,
+    parse_multiple_abspl,
+)
+from nomad_perotf.schema_packages.parsers.KIT_eqe_parser import EQEAnalyzer
+from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
+    calculatePVparametersFromJV,
+    read_jv_file,
+)
+from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
+    get_mpp_archive,
+    get_mpp_data,
+)
+from nomad_perotf.schema_packages.parsers.KIT_uvvis_parser import get_uvvis_data
+from nomad_perotf.schema_packages.raw_files import reset_raw_file_cache
+
+JV_POINTS = [None, 2_000]
+# one hour and 24 hours at 1 Hz
+MPP_POINTS = [3_600, 86_400]
+EQE_POINTS = 2_000
+EQE_HEADER_LINES = {'bentham': 63, 'enlitec': 5}
+UVVIS_POINTS = 1_801
+ABSPL_POINTS = 2_048
+ABSPL_MEASUREMENTS = 10
+
+logger = utils.get_logger(__name__)
+
+
+@pytest.mark.parametrize('n_points', JV_POINTS)
+def test_calculate_pv_parameters(benchmark, jv_file, n_points):
+    _, _, _, data = read_jv_file(jv_file('labview', n_points))
+    # ascending voltage and positive photocurrent, as get_jv_data hands it over
+    jv_data = data[::-1, :3] * [1, -1, -1]
+    benchmark.group = 'calculatePVparametersFromJV'
+
+    pce, voc, jsc, ff, r_shunt, r_s, mpp = benchmark(
+        calculatePVparametersFromJV, jv_data, 0.0784
+    )
+
+    assert 0 < voc[0] < 2
+
+
+@pytest.mark.parametrize('n_points', MPP_POINTS)
+@pytest.mark.parametrize('file_type', ['labview', 'python'])
+def test_get_mpp_data(benchmark, mpp_text, file_type, n_points):
+    filedata = mpp_text(file_type, n_points)
+    benchmark.group = f'get_mpp_data-{n_points}'
+
+    header_dict, df, parsed_type = benchmark(get_mpp_data, filedata)
+
+    assert parsed_type == file_type
+    assert len(df) == n_points
+
+
+@pytest.mark.parametrize('file_type', ['labview', 'python'])
+def test_get_mpp_archive(benchmark, mpp_text, file_type):
+    header_dict, df, _ = get_mpp_data(mpp_text(file_type, MPP_POINTS[-1]))
+    benchmark.group = 'get_mpp_archive'
+
+    def populate():
+        entity = SimpleNamespace()
+        get_mpp_archive(header_dict, file_type, df.copy(), entity, 'track.mpp.txt')
+        return entity
+
+    entity = benchmark(populate)
+
+    assert len(entity.time) == MPP_POINTS[-1]
+
+
+@pytest.mark.parametrize('file_format', ['bentham', 'enlitec'])
+def test_eqe_dict(benchmark, large_eqe_file, file_format):
+    path = large_eqe_file(file_format, EQE_POINTS)
+    header_lines = EQE_HEADER_LINES[file_format]
+    benchmark.group = 'EQEAnalyzer.eqe_dict'
+
+    # a new analyzer per round, its stages are cached per instance
+    eqe_dict = benchmark(
+        lambda: EQEAnalyzer(path, header_lines=header_lines).eqe_dict()
+    )
+
+    assert eqe_dict['bandgap'] > 0
+
+
+def test_get_uvvis_data(benchmark, uvvis_text):
+    filedata = uvvis_text(UVVIS_POINTS)
+    benchmark.group = 'get_uvvis_data'
+
+    uvvis_dict = benchmark(get_uvvis_data, filedata)
+
+    assert len(uvvis_dict['wavelength']) == UVVIS_POINTS
+
+
+def test_parse_abspl_data(benchmark, upload_archive, abspl_text):
+    data_file = 'benchmark.abspl.txt'
+    with open(os.path.join(upload_archive.m_context.directory, data_file), 'w') as f:
+        f.write(abspl_text(ABSPL_POINTS))
+    benchmark.group = 'abspl'
+
+    # without the raw file cache every round reads and decodes the file
+    result = benchmark.pedantic(
+        parse_abspl_data,
+        args=(data_file, upload_archive, logger),
+        setup=reset_raw_file_cache,
+        rounds=50,
+    )
+    reset_raw_file_cache()
+
+    settings, results, wavelengths, lum_flux, raw_counts, dark_counts = result
+    assert len(wavelengths) == len(dark_counts) == ABSPL_POINTS
+
+
+def test_parse_multiple_abspl(benchmark, multiple_abspl_text):
+    filedata = multiple_abspl_text(ABSPL_POINTS, ABSPL_MEASUREMENTS)
+    benchmark.group = 'abspl'
+
+    settings, results, data = benchmark(parse_multiple_abspl, filedata)
+
+    assert data.shape == (ABSPL_POINTS, ABSPL_MEASUREMENTS + 1)
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
+    get_mpp_data,
+    read_mpp_data,
+    read_mpp_file,
+)
+
+# one day and one week at 1 Hz
+MPP_POINTS = [86_400, 604_800]
+
+
+def read_whole(path):
+    with open(path) as f:
+        return get_mpp_data(f.read())
+
+
+def read_streaming(path):
+    with open(path) as f:
+        return read_mpp_data(f)
+
+
+@pytest.mark.parametrize('n_points', MPP_POINTS)
+@pytest.mark.parametrize('read', [read_whole, read_streaming])
+def test_read_mpp_file(benchmark, large_mpp_file, read, n_points):
+    path = large_mpp_file('labview', n_points)
+    benchmark.group = f'read_mpp_file-{n_points}'
+
+    header_dict, df, file_type = benchmark.pedantic(read, args=(path,), rounds=5)
+
+    assert file_type == 'labview'
+    assert len(df) == n_points
+
+
+@pytest.mark.parametrize('resumable', [False, True])
+def test_read_appended_hour(benchmark, large_mpp_file, upload_archive, resumable):
+    with open(large_mpp_file('labview', MPP_POINTS[-1]), 'rb') as f:
+        content = f.read()
+    # the file as it was an hour before
+    cut = len(content)
+    for _ in range(3_600):
+        cut = content.rindex(b'\n', 0, cut - 1) + 1
+    path = os.path.join(upload_archive.m_context.directory, 'live.mpp.txt')
+    benchmark.group = 'read_appended_hour'
+
+    def setup():
+        with open(path, 'wb') as f:
+            f.write(content[:cut])
+        read_mpp_file(upload_archive, 'live.mpp.txt', resumable=resumable)
+        with open(path, 'ab') as f:
+            f.write(content[cut:])
+
+    _, df, _ = benchmark.pedantic(
+        read_mpp_file,
+        args=(upload_archive, 'live.mpp.txt'),
+        kwargs={'resumable': resumable},
+        setup=setup,
+        rounds=3,
+    )
+
+    assert len(df) == MPP_POINTS[-1]
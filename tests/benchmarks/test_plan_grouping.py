@@ -0,0 +1,12 @@
+from nomad_perotf.parsers.experiment_plan import group_process_rows
+
+
+def test_group_process_rows(benchmark, experiment_plan):
+    df = experiment_plan(200, 30)
+    process_columns = df.columns.get_level_values(0).unique()[1:]
+
+    groups = benchmark(
+        lambda: [list(group_process_rows(df, col)) for col in process_columns]
+    )
+
+    assert len(groups) == 30
@@ -0,0 +1,14 @@
+from nomad_perotf.parsers.experiment_plan import is_experiment_plan, read_plan_header
+
+# about 50 MB of compressed sheet data
+N_ROWS = 175_000
+
+
+def test_read_plan_header(benchmark, large_xlsx_file):
+    path = large_xlsx_file(N_ROWS)
+
+    groups, names = benchmark(read_plan_header, path)
+
+    assert groups == ['Measurement']
+    assert names[:2] == ['col 0', 'col 1']
+    assert not is_experiment_plan(path)
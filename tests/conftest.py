@@ -0,0 +1,142 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from nomad.metainfo import MSection, Quantity
+
+BENTHAM_EQE_FILE = os.path.join('tests', 'data', 'AA00_C3_20.47mAcm-2.eqe.dat')
+
+
+def scale_eqe_text(text, factor):
+    """Multiplies the EQE column of a Bentham file, headers stay untouched."""
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        fields = line.rstrip('\r').split('\t')
+        if len(fields) != 2:
+            continue
+        try:
+            float(fields[0])
+            eqe = float(fields[1])
+        except ValueError:
+            continue
+        lines[i] = line.replace(fields[1], str(eqe * factor), 1)
+    return '\n'.join(lines)
+
+
+def _scaled_eqe_file(directory, factor):
+    # the fixture mixes CRLF and CR line ends, keep them as they are
+    with open(BENTHAM_EQE_FILE, newline='') as f:
+        text = scale_eqe_text(f.read(), factor)
+    path = os.path.join(directory, f'scaled_{factor}.eqe.dat')
+    with open(path, 'w', newline='') as f:
+        f.write(text)
+    return path
+
+
+@pytest.fixture(scope='session')
+def scaled_eqe_file():
+    """Writes copies of the Bentham EQE fixture with scaled EQE values."""
+    return _scaled_eqe_file
+
+
+def synthetic_experiment_plan(n_samples, n_steps, n_variants=4, seed=0):
+    """
+    An experiment plan like the batch xlsx files read with ``header=[0, 1]``.
+    Every process step has ``n_variants`` parameter sets spread over the samples.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {
+        ('Experiment Info', 'Nomad ID'): [
+            f'hzb_TestP_AA_1_c-{n}' for n in range(n_samples)
+        ],
+        ('Experiment Info', 'Sample dimension'): ['5x5'] * n_samples,
+        ('Experiment Info', 'Sample area [cm^2]'): rng.choice([0.1, 0.16], n_samples),
+        ('Experiment Info', 'Substrate material'): ['Glass'] * n_samples,
+        ('Experiment Info', 'Substrate conductive layer'): rng.choice(
+            ['ITO', 'FTO'], n_samples
+        ),
+    }
+    for step in range(n_steps):
+        group = f'{step + 1}: Spin Coating'
+        variant = rng.integers(n_variants, size=n_samples)
+        columns[(group, 'Material name')] = [f'Material {v}' for v in variant]
+        columns[(group, 'Solvent 1 name')] = np.where(variant % 2, 'DMF', 'DMSO')
+        columns[(group, 'Solute 1 Concentration [mM]')] = 1.2 + 0.1 * variant
+        columns[(group, 'Rotation speed 1 [rpm]')] = 1000.0 * (variant + 1)
+        columns[(group, 'Notes')] = np.where(variant == 0, np.nan, 'annealed')
+    return pd.DataFrame(columns)
+
+
+@pytest.fixture(scope='session')
+def experiment_plan():
+    """Builds a synthetic experiment plan, see `synthetic_experiment_plan`."""
+    return synthetic_experiment_plan
+
+
+class UploadContext:
+    """A server like context on a directory that records processed files."""
+
+    upload_id = 'test_upload'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.processed = []
+        self.modified = []
+
+    def raw_path_exists(self, path):
+        return os.path.exists(os.path.join(self.directory, path))
+
+    def raw_file(self, path, *args, **kwargs):
+        return open(os.path.join(self.directory, path), *args, **kwargs)
+
+    def process_updated_raw_file(self, path, allow_modify=False):
+        self.processed.append(path)
+        if allow_modify:
+            self.modified.append(path)
+
+
+class ChildEntry(MSection):
+    lab_id = Quantity(type=str)
+    description = Quantity(type=str)
+    values = Quantity(type=np.float64, shape=['*'])
+
+
+@pytest.fixture(scope='session')
+def upload_archive_factory(tmp_path_factory):
+    """Creates archives whose context writes into a new temporary directory."""
+
+    def _upload_archive():
+        directory = tmp_path_factory.mktemp('upload')
+        return SimpleNamespace(
+            m_context=UploadContext(str(directory)),
+            metadata=SimpleNamespace(mainfile='experiment.xlsx'),
+        )
+
+    return _upload_archive
+
+
+@pytest.fixture
+def upload_archive(upload_archive_factory):
+    return upload_archive_factory()
+
+
+@pytest.fixture(scope='session')
+def child_entries():
+    """Builds ``(file_name, section)`` pairs like the batch parser emits."""
+
+    def _child_entries(n, n_values=50):
+        return [
+            (
+                f'{i}_entry.archive.json',
+                ChildEntry(
+                    lab_id=f'hzb_TestP_AA_1_c-{i}',
+                    description='spin coating ' * 20,
+                    values=np.linspace(0, 1, n_values) * i,
+                ),
+            )
+            for i in range(n)
+        ]
+
+    return _child_entries
@@ -0,0 +1,100 @@
+import json
+import os
+
+from nomad_perotf.parsers.archive_writer import (
+    load_fingerprints,
+    save_fingerprints,
+    write_archives,
+    write_child_archives,
+)
+
+
+def test_write_archives(upload_archive, child_entries):
+    entries = child_entries(20)
+    context = upload_archive.m_context
+    with open(os.path.join(context.directory, entries[3][0]), 'w') as f:
+        f.write('{}')
+    timings = {}
+
+    written = write_archives(entries, upload_archive, workers=4, timings=timings)
+
+    expected = [file_name for i, (file_name, _) in enumerate(entries) if i != 3]
+    assert written == expected
+    assert context.processed == expected
+    assert set(timings) == {'serialize', 'write', 'process'}
+    for file_name, entity in entries:
+        with open(os.path.join(context.directory, file_name)) as f:
+            content = json.load(f)
+        if file_name == entries[3][0]:
+            assert content == {}
+        else:
+            assert content == {'data': entity.m_to_dict(with_root_def=True)}
+
+
+def test_write_archives_with_fingerprints(upload_archive, child_entries):
+    entries = child_entries(10)
+    context = upload_archive.m_context
+    fingerprints = {}
+
+    assert len(write_archives(entries, upload_archive, fingerprints=fingerprints)) == 10
+    save_fingerprints(upload_archive, fingerprints)
+    context.processed.clear()
+
+    fingerprints = load_fingerprints(upload_archive)
+    assert write_archives(entries, upload_archive, fingerprints=fingerprints) == []
+
+    entries[4][1].description = 'edited'
+    fingerprints = load_fingerprints(upload_archive)
+    written = write_archives(entries, upload_archive, fingerprints=fingerprints)
+
+    assert written == [entries[4][0]]
+    assert context.processed == context.modified == [entries[4][0]]
+    with open(os.path.join(context.directory, entries[4][0])) as f:
+        assert json.load(f)['data']['description'] == 'edited'
+
+
+def test_load_fingerprints_without_file(upload_archive):
+    assert load_fingerprints(upload_archive) == {}
+
+
+def test_write_archives_without_stored_fingerprints(upload_archive, child_entries):
+    entries = child_entries(3)
+    context = upload_archive.m_context
+    with open(os.path.join(context.directory, entries[1][0]), 'w') as f:
+        f.write('{"data": {"description": "edited in the ELN"}}')
+    fingerprints = load_fingerprints(upload_archive)
+
+    written = write_archives(entries, upload_archive, fingerprints=fingerprints)
+
+    assert written == [entries[0][0], entries[2][0]]
+    assert context.modified == []
+    assert set(fingerprints) == {file_name for file_name, _ in entries}
+    with open(os.path.join(context.directory, entries[1][0])) as f:
+        assert json.load(f)['data']['description'] == 'edited in the ELN'
+
+    save_fingerprints(upload_archive, fingerprints)
+    entries[1][1].description = 'changed in the xlsx'
+    fingerprints = load_fingerprints(upload_archive)
+    written = write_archives(entries, upload_archive, fingerprints=fingerprints)
+
+    assert written == [entries[1][0]]
+
+
+def test_write_child_archives_of_older_upload(upload_archive, child_entries):
+    # children of an upload parsed before fingerprints were stored
+    entries = child_entries(3)
+    context = upload_archive.m_context
+    assert write_archives(entries, upload_archive) == [f for f, _ in entries]
+    context.processed.clear()
+
+    # parse, parse, edit a row of the plan, parse
+    assert write_child_archives(entries, upload_archive) == []
+    assert set(load_fingerprints(upload_archive)) == {f for f, _ in entries}
+    assert write_child_archives(entries, upload_archive) == []
+    entries[2][1].description = 'changed in the xlsx'
+    written = write_child_archives(entries, upload_archive)
+
+    assert written == [entries[2][0]]
+    assert context.modified == [entries[2][0]]
+    with open(os.path.join(context.directory, entries[2][0])) as f:
+        assert json.load(f)['data']['description'] == 'changed in the xlsx'
@@ -0,0 +1,126 @@
+import builtins
+import os
+
+import numpy as np
+import pytest
+
+from nomad_perotf.schema_packages.parsers.KIT_eqe_parser import (
+    EQEAnalyzer,
+    am15g_on_grid,
+    am15g_spectrum,
+    analyze_many,
+    sniff_eqe_format,
+)
+
+EQE_FILE = os.path.join('tests', 'data', 'AA00_C3_20.47mAcm-2.eqe.dat')
+
+
+@pytest.fixture
+def eqe_file_opens(monkeypatch):
+    opens = []
+    builtin_open = builtins.open
+
+    def counting_open(file, *args, **kwargs):
+        if file == EQE_FILE:
+            opens.append(file)
+        return builtin_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, 'open', counting_open)
+    return opens
+
+
+@pytest.mark.parametrize(
+    'header_lines, has_j0rad',
+    [(63, True), (64, False)],
+)
+def test_eqe_file_is_read_once(eqe_file_opens, header_lines, has_j0rad):
+    eqe_dict = EQEAnalyzer(EQE_FILE, header_lines=header_lines).eqe_dict()
+
+    assert eqe_file_opens == [EQE_FILE]
+    # 20.47 mA/cm^2 as integrated by the measurement software
+    assert eqe_dict['jsc'] == pytest.approx(204.7, rel=5e-3)
+    assert 'urbach_e' in eqe_dict
+    assert ('j0rad' in eqe_dict) == has_j0rad
+
+
+def test_failed_stage_is_not_evaluated_again(monkeypatch):
+    analyzer = EQEAnalyzer(EQE_FILE, header_lines=63)
+    calls = []
+
+    def failing_smooth(mode):
+        calls.append(mode)
+        raise ValueError('no data')
+
+    monkeypatch.setattr(analyzer, 'smooth_eqe', failing_smooth)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            analyzer.fit_urbach_tail()
+    assert calls == ['mirror']
+
+
+def test_am15g_is_loaded_once():
+    am15g_spectrum.cache_clear()
+    am15g_on_grid.cache_clear()
+
+    jsc = [EQEAnalyzer(EQE_FILE, header_lines=63).calculate_jsc() for _ in range(3)]
+
+    assert jsc[0] == jsc[1] == jsc[2]
+    assert am15g_spectrum.cache_info().misses == 1
+    assert am15g_on_grid.cache_info().misses == 1
+    energy, spectrum = am15g_spectrum()
+    assert not energy.flags.writeable and not spectrum.flags.writeable
+
+
+def test_analyze_many_matches_single_files(tmp_path, scaled_eqe_file):
+    paths = [EQE_FILE, scaled_eqe_file(tmp_path, 0.8), scaled_eqe_file(tmp_path, 0.5)]
+    broken = tmp_path / 'broken.eqe.dat'
+    broken.write_text('no data')
+
+    result = analyze_many(paths + [str(broken)], header_lines=63)
+
+    for row, path in enumerate(paths):
+        eqe_dict = EQEAnalyzer(path, header_lines=63).eqe_dict()
+        for key in ['jsc', 'bandgap', 'urbach_e', 'error_urbach_std', 'j0rad']:
+            assert result.loc[row, key] == pytest.approx(eqe_dict[key], rel=1e-12)
+        assert result.loc[row, 'voc_rad'] == pytest.approx(eqe_dict['voc_rad'])
+        assert result.loc[row, 'error'] is None
+    assert np.isnan(result.loc[3, 'jsc'])
+    assert result.loc[3, 'error']
+
+
+def test_analyze_many_records_failed_extrapolation(
+    monkeypatch, tmp_path, scaled_eqe_file
+):
+    failing = scaled_eqe_file(tmp_path, 0.8)
+    extrapolate_eqe = EQEAnalyzer.extrapolate_eqe
+
+    def failing_extrapolate_eqe(self):
+        if self.file_path == failing:
+            raise UnboundLocalError('photon_energy_extrapolated')
+        return extrapolate_eqe(self)
+
+    monkeypatch.setattr(EQEAnalyzer, 'extrapolate_eqe', failing_extrapolate_eqe)
+
+    result = analyze_many([EQE_FILE, failing], header_lines=63)
+
+    assert result.loc[0, 'error'] is None
+    assert not np.isnan(result.loc[0, 'j0rad'])
+    assert result.loc[1, 'error'] == 'photon_energy_extrapolated'
+    assert np.isnan(result.loc[1, 'j0rad'])
+    assert not np.isnan(result.loc[1, 'jsc'])
+
+
+@pytest.mark.parametrize(
+    'text, header_lines, expected',
+    [
+        ('nm\tEQE\n300\t1.5\n', 1, ('\t', 0, '.')),
+        ('nm,EQE\n300,1.5\n', 1, (',', 0, '.')),
+        ('a\nb\n\nnm\tEQE (%)\tref\n300\t1,5\t2\n', 3, ('\t', 2, ',')),
+        ('title\n300\t1.5\n305\t1.6\n', 1, ('\t', 1, '.')),
+        ('300\t1,5\n305\t1,6\n', 0, ('\t', None, ',')),
+        ('300,1.5\n305,1.6\n', 0, (',', None, '.')),
+    ],
+)
+def test_sniff_eqe_format(text, header_lines, expected):
+    assert sniff_eqe_format(text, header_lines) == expected
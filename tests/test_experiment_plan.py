@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from nomad_perotf.parsers.experiment_plan import (
+    group_process_rows,
+    is_experiment_plan,
+    plan_columns,
+    read_plan_header,
+    row_hashes,
+)
+
+EXPERIMENT_FILE = os.path.join('tests', 'data', '20250114_experiment_file.xlsx')
+
+
+def test_group_process_rows(experiment_plan):
+    df = experiment_plan(40, 3)
+    col = '2: Spin Coating'
+
+    groups = list(group_process_rows(df, col))
+
+    distinct = df[col].drop_duplicates()
+    assert [j for j, _, _ in groups] == distinct.index.tolist()
+    for j, row, lab_ids in groups:
+        assert row.equals(distinct.loc[j])
+        expected = [
+            nomad_id
+            for nomad_id, (_, other) in zip(
+                df['Experiment Info']['Nomad ID'], df[col].iterrows()
+            )
+            if other.astype('object').equals(row.astype('object'))
+        ]
+        assert lab_ids == expected
+    assert sum(len(lab_ids) for _, _, lab_ids in groups) == len(df)
+
+
+def test_row_hashes_treat_nan_as_equal():
+    df = pd.DataFrame({'a': [1.0, np.nan, 1.0, np.nan], 'b': ['x', None, 'x', 'y']})
+
+    hashes = row_hashes(df)
+
+    assert hashes[0] == hashes[2]
+    assert len(set(hashes)) == 3
+
+
+def test_plan_columns_match_read_excel():
+    header = read_plan_header(EXPERIMENT_FILE)
+
+    df = pd.read_excel(EXPERIMENT_FILE, header=[0, 1])
+    columns = [
+        column
+        for column in plan_columns(header)
+        if column[1] is not None and not str(column[1]).startswith('Unnamed')
+    ]
+    assert columns == [
+        column for column in df.columns if not column[1].startswith('Unnamed')
+    ]
+
+
+def test_is_experiment_plan(tmp_path):
+    other = tmp_path / 'other.xlsx'
+    pd.DataFrame({'Nomad ID': ['a'], 'Experiment Info': ['b']}).to_excel(other)
+    broken = tmp_path / 'broken.xlsx'
+    broken.write_text('Experiment Info')
+
+    assert is_experiment_plan(EXPERIMENT_FILE)
+    assert not is_experiment_plan(str(other))
+    assert not is_experiment_plan(str(broken))
@@ -0,0 +1,91 @@
+import os
+
+import h5py
+import numpy as np
+from nomad.datamodel.hdf5 import HDF5Reference
+from nomad.metainfo import MSection, Quantity, SubSection
+
+from nomad_perotf.schema_packages.hdf5_arrays import (
+    HDF5_CHUNK_POINTS,
+    load_external_arrays,
+    offload_arrays,
+    read_hdf5_arrays,
+    write_hdf5_arrays,
+)
+
+
+class Spectrum(MSection):
+    wavelength = Quantity(type=np.float64, shape=['*'], unit='nm')
+    counts = Quantity(type=np.float64, shape=['*'])
+    wavelength_hdf5 = Quantity(type=HDF5Reference)
+    array_file = Quantity(type=str)
+    external_arrays = Quantity(type=str, shape=['*'])
+
+
+class Measurement(MSection):
+    results = SubSection(section_def=Spectrum, repeats=True)
+
+
+def test_write_hdf5_arrays(upload_archive):
+    values = np.linspace(0, 1, 100_000)
+
+    write_hdf5_arrays(upload_archive, 'a.h5', {'track/time': values, 'b': values[:10]})
+
+    path = os.path.join(upload_archive.m_context.directory, 'a.h5')
+    with h5py.File(path) as h5:
+        assert h5['track/time'].chunks == (HDF5_CHUNK_POINTS,)
+        assert h5['track/time'].compression == 'gzip'
+        assert h5['b'].chunks == (10,)
+    arrays = read_hdf5_arrays(upload_archive, 'a.h5', ['track/time'])
+    assert np.array_equal(arrays['track/time'], values)
+
+
+def test_offload_arrays(upload_archive):
+    wavelength = np.linspace(400, 900, 2048)
+    measurement = Measurement(
+        results=[
+            Spectrum(wavelength=wavelength, counts=wavelength * i) for i in range(3)
+        ]
+    )
+    measurement.results[2].counts = np.ones(10)
+
+    offload_arrays(
+        upload_archive, 'pl.txt.h5', measurement.results, ['wavelength', 'counts'], 100
+    )
+
+    first, _, last = measurement.results
+    assert first.wavelength is None and first.counts is None
+    assert first.array_file == 'pl.txt.h5'
+    assert first.external_arrays == ['wavelength', 'counts']
+    assert last.external_arrays == ['wavelength']
+    assert len(last.counts) == 10
+    assert first.wavelength_hdf5 == 'pl.txt.h5#/results/0/wavelength'
+
+    load_external_arrays(upload_archive, measurement.results[1])
+
+    assert np.array_equal(measurement.results[1].counts, wavelength)
+    assert measurement.results[1].wavelength.units == 'nanometer'
+    assert measurement.results[1].array_file is None
+    assert measurement.results[1].wavelength_hdf5 is None
+
+
+def test_offload_nothing(upload_archive):
+    spectrum = Spectrum(wavelength=np.arange(10.0))
+
+    offload_arrays(upload_archive, 'pl.txt.h5', [spectrum], ['wavelength'], 100)
+
+    assert spectrum.array_file is None
+    assert not os.listdir(upload_archive.m_context.directory)
+
+
+def test_offload_clears_earlier_move(upload_archive):
+    spectrum = Spectrum(wavelength=np.arange(1000.0))
+    offload_arrays(upload_archive, 'pl.txt.h5', [spectrum], ['wavelength'], 100)
+    spectrum.wavelength = np.arange(1000.0)
+
+    offload_arrays(upload_archive, 'pl.txt.h5', [spectrum], ['wavelength'], 0)
+
+    assert len(spectrum.wavelength) == 1000
+    assert spectrum.array_file is None
+    assert spectrum.external_arrays is None
+    assert spectrum.wavelength_hdf5 is None
@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from nomad_perotf.ingest import (
+    IngestContext,
+    format_report,
+    ingest_file,
+    list_files,
+    summarize,
+    technique_of,
+)
+
+DATA_DIR = os.path.join('tests', 'data')
+
+
+def record(technique, total, error=None, rss=100.0):
+    return {
+        'technique': technique,
+        'total': total,
+        'match': 0.1 * total,
+        'parse': 0.5 * total,
+        'normalize': 0.4 * total,
+        'bytes': 10,
+        'bytes_read': 20,
+        'layout_hits': 1,
+        'layout_misses': 0,
+        'peak_rss_mb': rss,
+        'error': error,
+    }
+
+
+def test_summarize():
+    records = [record('jv', t / 100, rss=100.0 + t) for t in range(1, 101)]
+    records.append(record('batch', 2.0, error='Traceback'))
+
+    summary = summarize(records)
+
+    assert [row['technique'] for row in summary] == ['batch', 'jv']
+    batch, jv = summary
+    assert (batch['files'], batch['errors'], batch['p95_s']) == (1, 1, 2.0)
+    assert jv['files'] == 100
+    assert jv['total_s'] == pytest.approx(50.5)
+    assert jv['median_s'] == pytest.approx(0.505)
+    assert jv['p95_s'] == pytest.approx(0.9505)
+    assert jv['parse_s'] == pytest.approx(0.5 * 50.5)
+    assert (jv['bytes'], jv['bytes_read'], jv['peak_rss_mb']) == (1000, 2000, 200.0)
+    assert (jv['layout_hits'], jv['layout_misses']) == (100, 0)
+    assert len(format_report(summary).splitlines()) == 3
+
+
+def test_technique_of():
+    assert technique_of('a/KIT_1.px7_mid.jv.csv', 'PeroTFParser') == 'jv'
+    assert technique_of('a/plan.xlsx', 'PeroTFExperimentParser') == 'batch'
+    assert technique_of('a/notes.md', None) == 'unmatched'
+
+
+def test_list_files(tmp_path):
+    for name in ['b.jv.txt', 'a.eqe.dat', '.hidden', '~$plan.xlsx', 'sub/c.mpp.csv']:
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text('')
+
+    files = [os.path.relpath(f, tmp_path) for f in list_files(tmp_path)]
+
+    assert files == ['a.eqe.dat', 'b.jv.txt', os.path.join('sub', 'c.mpp.csv')]
+
+
+def test_ingest_context(tmp_path):
+    upload, output = tmp_path / 'upload', tmp_path / 'output'
+    upload.mkdir()
+    (upload / 'data.txt').write_text('raw')
+    context = IngestContext(str(upload), str(output))
+
+    with context.raw_file('data.txt.archive.json', 'w') as f:
+        f.write('{}')
+    with context.raw_file('data.txt', 'r+') as f:
+        f.write('new')
+    context.process_updated_raw_file('data.txt.archive.json')
+
+    assert context.raw_path_exists('data.txt.archive.json')
+    assert context.updated == ['data.txt.archive.json']
+    assert sorted(os.listdir(upload)) == ['data.txt']
+    assert (upload / 'data.txt').read_text() == 'raw'
+    with context.raw_file('data.txt') as f:
+        assert f.read() == 'new'
+
+
+@pytest.mark.parametrize(
+    'file_name',
+    [
+        'KIT_DaBa_20230202_Batch-1_0_7.px7_mid.jv.csv',
+        'KIT_DaBa_20230219_Experimnt-AB_2_2_MPP.1.mpp.csv',
+    ],
+)
+def test_ingest_file_normalizes_measurement(file_name):
+    # the measurement normalizers need the archive builders of baseclasses
+    pytest.importorskip('baseclasses.helper.archive_builder.jv_archive')
+
+    result = ingest_file(os.path.join(DATA_DIR, file_name))
+
+    assert result['error'] is None
+    assert result['parser'] == 'PeroTFParser'
+    assert result['normalize'] > 0
+    assert result['bytes_read'] > 0
+    assert not os.path.exists(os.path.join(DATA_DIR, f'{file_name}.archive.json'))
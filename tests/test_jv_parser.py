@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pytest
+
+from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
+    _find_shunt_windows,
+    _rolling_slopes,
+    calculate_pv_parameters_batch,
+    calculatePVparametersFromJV,
+    read_jv_file,
+)
+
+
+def synthetic_jv_curves(n_curves, n_points=151, seed=0):
+    """Single-diode like JV curves on a shared voltage axis with some noise."""
+    rng = np.random.default_rng(seed)
+    voltage = np.linspace(-0.2, 1.3, n_points)
+    jsc = rng.uniform(15, 25, (n_curves, 1))
+    j0 = rng.uniform(1e-9, 1e-7, (n_curves, 1))
+    r_shunt = rng.uniform(0.5, 5, (n_curves, 1))
+    current_density = jsc - j0 * np.expm1(voltage / 0.05) - voltage / r_shunt
+    current_density += rng.normal(0, 0.02, current_density.shape)
+    return voltage, current_density
+
+
+def fixture_jv_curves(file_name):
+    data = np.loadtxt(
+        os.path.join('tests', 'data', file_name), skiprows=12, delimiter='\t'
+    )
+    data = data[::-1]
+    return data[:, 0], -data[:, 1:3].T
+
+
+def shifted_jv_curves(n_curves):
+    """Curve pairs sharing one voltage axis, but each pair measured on its own."""
+    voltage, current_density = synthetic_jv_curves(n_curves, seed=1)
+    shifts = np.repeat(np.linspace(0, 0.05, n_curves // 2), 2)[:, None]
+    return voltage + shifts, current_density
+
+
+@pytest.mark.parametrize(
+    'voltage, current_density',
+    [
+        fixture_jv_curves('KIT_DaBa_20230202_Batch-1_0_7.px7_mid.jv.csv'),
+        synthetic_jv_curves(20),
+        shifted_jv_curves(20),
+    ],
+)
+def test_batch_matches_per_curve_calculation(voltage, current_density):
+    batch = calculate_pv_parameters_batch(voltage, current_density, cellArea=0.0784)
+
+    voltage = np.broadcast_to(voltage, current_density.shape)
+    for i in range(0, len(current_density), 2):
+        jv_data = np.column_stack(
+            [voltage[i], current_density[i], current_density[i + 1]]
+        )
+        pce, voc, jsc, ff, r_shunt, r_s, mpp = calculatePVparametersFromJV(
+            jv_data, cellArea=0.0784
+        )
+        for key, reference in [
+            ('pce', pce),
+            ('voc', voc),
+            ('jsc', jsc),
+            ('ff', ff),
+            ('r_shunt', r_shunt),
+            ('r_s', r_s),
+            ('v_mpp', (mpp[0][0], mpp[1][0])),
+            ('j_mpp', (mpp[0][1], mpp[1][1])),
+        ]:
+            np.testing.assert_allclose(
+                batch[key][i : i + 2], reference, rtol=1e-9, err_msg=key
+            )
+
+
+def test_batch_flags_curves_without_axis_crossing():
+    voltage, current_density = synthetic_jv_curves(3)
+    current_density[1] = np.abs(current_density[1]) + 1
+
+    batch = calculate_pv_parameters_batch(voltage, current_density)
+
+    assert np.isnan(batch['voc'][1])
+    assert np.isnan(batch['pce'][1])
+    assert np.isfinite(batch['voc'][[0, 2]]).all()
+
+
+def test_rolling_slopes_match_polyfit():
+    voltage, current_density = synthetic_jv_curves(2)
+    slopes = _rolling_slopes(voltage, current_density, 40)
+
+    for start in [0, 17, len(voltage) - 40]:
+        window = slice(start, start + 40)
+        for row in range(2):
+            reference = np.polyfit(voltage[window], current_density[row, window], 1)[0]
+            assert slopes[row, start] == pytest.approx(reference, rel=1e-9)
+
+
+def test_shunt_search_is_bounded_by_voc():
+    voltage = np.linspace(-0.2, 1.2, 1000)
+    x = np.tile(voltage, (2, 1))
+    y = np.vstack([2 - voltage, voltage**3])
+    jsc_ind = np.array([142, 142])
+    voc_ind = np.array([900, 900])
+
+    slope, window = _find_shunt_windows(x, y, jsc_ind, voc_ind, 20)
+
+    assert window.tolist() == [122, -1]
+    assert slope[0] == pytest.approx(-1)
+    assert np.isnan(slope[1])
+
+
+@pytest.mark.parametrize(
+    'file_name, file_type, columns',
+    [
+        (
+            'KIT_DaBa_20230202_Batch-1_0_7.px7_mid.jv.csv',
+            'labview',
+            [
+                'Voltage [V]',
+                'Current density [1] [mA/cm^2]',
+                'Current density [2] [mA/cm^2]',
+                'Average current density [mA/cm^2]',
+            ],
+        ),
+        (
+            'UserGivenName_pX1_fwd_lt_lp0_20250109T164058.jv.txt',
+            'python',
+            ['Voltage', 'CurrentDensity', 'Current'],
+        ),
+    ],
+)
+def test_read_jv_file(file_name, file_type, columns):
+    with open(os.path.join('tests', 'data', file_name)) as f:
+        filedata = f.read()
+
+    parsed_type, header_rows, parsed_columns, data = read_jv_file(filedata)
+
+    assert parsed_type == file_type
+    assert parsed_columns == columns
+    assert data.dtype == np.float64
+    assert data.shape == (
+        len(filedata.splitlines()) - len(header_rows) - 1,
+        len(columns),
+    )
@@ -0,0 +1,50 @@
+from nomad_perotf.schema_packages.parsers.layouts import (
+    LayoutCache,
+    header_key,
+    header_signature,
+    layout_cache_stats,
+    leading_signature,
+)
+
+
+def test_layout_cache():
+    cache = LayoutCache('test', maxsize=2)
+
+    assert cache.get('a') is None
+    cache.put('a', {'skiprows': 1})
+    cache.put('b', {'skiprows': 2})
+    assert cache.get('a') == {'skiprows': 1}
+    cache.put('c', {'skiprows': 3})
+
+    assert cache.get('b') is None
+    assert layout_cache_stats()['test'] == {'hits': 1, 'misses': 2, 'size': 2}
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'size': 0}
+
+
+def test_header_signature():
+    labview = ['SPP measurement @ LTI', '2023-02-28\t3:58 PM', 'Sampling\t5']
+    other_day = ['SPP measurement @ LTI', '2024-11-02\t9:12 AM', 'Sampling\t10']
+    python = ['DateTime:\tThu Jan 9 17:10:21 2025', 'PixArea:\t1.0']
+
+    def signature(lines):
+        return header_signature('labview', [header_key(line) for line in lines])
+
+    assert header_key('Test start time: 20250109_17:10:21') == 'Test start time'
+    assert [header_key(line) for line in python] == ['DateTime:', 'PixArea:']
+    assert signature(labview) == signature(other_day)
+    assert signature(labview) != signature(labview[:2])
+    assert header_signature('python', ['a']) != header_signature('labview', ['a'])
+
+
+def test_leading_signature():
+    labview = 'SPP measurement\n2023-02-28\t3:58 PM\nSampling\t5\nTime\tPCE\n'
+    other_day = 'SPP measurement\n2024-11-02\t9:12 AM\nSampling\t10\nTime\tPCE\n'
+    rows = '1.7\t-0.8\n2.9\t-1.2E-1\n3.'
+
+    assert leading_signature('labview', labview + rows, '\t') == leading_signature(
+        'labview', other_day + '2.0\t3.0\n', '\t'
+    )
+    assert leading_signature('labview', labview, '\t') != leading_signature(
+        'labview', labview + 'Status\tdone\n', '\t'
+    )
@@ -0,0 +1,52 @@
+import pytest
+
+from nomad_perotf.parsers.measurement_files import (
+    MEASUREMENT_FACTORIES,
+    _measurement_entry,
+    measurement_factory,
+    split_measurement_file_name,
+)
+
+
+@pytest.mark.parametrize(
+    'mainfile, expected',
+    [
+        (
+            'tests/data/KIT_DaBa_20230202_Batch-1_0_7.px7_mid.jv.csv',
+            ('KIT_DaBa_20230202_Batch-1_0_7', 'px7_mid', 'jv', 'csv', 'mid'),
+        ),
+        ('AA00_C3_20.47mAcm-2.eqe.dat', ('AA00_C3_20', '47mAcm-2', 'eqe', 'dat', None)),
+        (
+            'sample.top_mid_bot.jvg.txt',
+            ('sample', 'top_mid_bot', 'jvg', 'txt', 'bottom'),
+        ),
+        ('sample.top.mpp.csv', ('sample', 'top', 'mpp', 'csv', None)),
+        ('sample.jv.txt', ('sample', 'jv', 'jv', 'txt', None)),
+    ],
+)
+def test_split_measurement_file_name(mainfile, expected):
+    assert split_measurement_file_name(mainfile) == expected
+
+
+@pytest.mark.parametrize(
+    'technique, extension, key',
+    [
+        ('jv', 'csv', ('jv', None)),
+        ('jv', 'txt', ('jv', None)),
+        ('eqe', 'dat', ('eqe', 'dat')),
+        ('eqe', 'txt', ('eqe', 'txt')),
+        ('mpp', 'txt', ('mpp', 'txt')),
+        ('sem', 'TIF', ('sem', 'tif')),
+        ('SEM', 'tiff', ('sem', 'tiff')),
+        ('abspl', 'txt', ('abspl', 'txt')),
+    ],
+)
+def test_measurement_factory(technique, extension, key):
+    assert measurement_factory(technique, extension) is MEASUREMENT_FACTORIES[key]
+
+
+@pytest.mark.parametrize(
+    'technique, extension', [('eqe', 'csv'), ('uvvis', 'txt'), ('pero', 'txt')]
+)
+def test_measurement_factory_default(technique, extension):
+    assert measurement_factory(technique, extension) is _measurement_entry
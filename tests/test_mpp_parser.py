@@ -0,0 +1,337 @@
+import os
+from types import SimpleNamespace
+
+import h5py
+import numpy as np
+import pandas as pd
+import pytest
+from nomad.datamodel.hdf5 import HDF5Reference
+from nomad.metainfo import MSection, Quantity
+
+from nomad_perotf.schema_packages import raw_files
+from nomad_perotf.schema_packages.parsers import KIT_mpp_parser
+from nomad_perotf.schema_packages.parsers.KIT_mpp_parser import (
+    decimate_mpp_archive,
+    envelope_indices,
+    get_mpp_archive,
+    get_mpp_data,
+    infer_column_map,
+    numeric_columns,
+    parsed_rows_file_name,
+    read_mpp_data,
+    read_mpp_file,
+    stability_metrics,
+)
+
+DATA_DIR = os.path.join('tests', 'data')
+
+MPP_FILES = [
+    ('KIT_DaBa_20230219_Experimnt-AB_2_2_MPP.1.mpp.csv', 'labview'),
+    ('UserGivenName_pX1_MPPT_lt_lp0_20250109T171021.mpp.txt', 'python'),
+]
+
+
+@pytest.mark.parametrize('file_name, file_type', MPP_FILES)
+def test_read_in_chunks(monkeypatch, file_name, file_type):
+    path = os.path.join(DATA_DIR, file_name)
+    with open(path) as f:
+        header_dict, df, parsed_type = get_mpp_data(f.read())
+
+    monkeypatch.setattr(KIT_mpp_parser, 'MPP_CHUNK_ROWS', 7)
+    with open(path) as f:
+        chunked_header_dict, chunked_df, _ = read_mpp_data(f)
+
+    assert parsed_type == file_type
+    assert 'datetime' in header_dict
+    assert chunked_header_dict == header_dict
+    pd.testing.assert_frame_equal(chunked_df, df)
+    assert all(dtype == 'float64' for dtype in df.dtypes)
+
+
+def test_layout_with_other_header_after_the_start(monkeypatch):
+    with open(os.path.join(DATA_DIR, MPP_FILES[0][0])) as f:
+        content = f.read()
+    longer = content.replace('Status\t', 'Comment\tnew\t\t\t\nStatus\t', 1)
+    KIT_mpp_parser.mpp_layouts.clear()
+    # the signature only sees the first line, both files share it
+    monkeypatch.setattr(KIT_mpp_parser, 'LAYOUT_SIGNATURE_CHARS', 40)
+
+    _, df, _ = get_mpp_data(content)
+    header_dict, longer_df, _ = get_mpp_data(longer)
+
+    assert header_dict['comment'] == 'new'
+    pd.testing.assert_frame_equal(longer_df, df)
+
+
+def test_layout_is_cached():
+    path = os.path.join(DATA_DIR, MPP_FILES[0][0])
+    mpp_layouts = KIT_mpp_parser.mpp_layouts
+    mpp_layouts.clear()
+
+    for _ in range(3):
+        with open(path) as f:
+            _, df, _ = read_mpp_data(f)
+
+    assert mpp_layouts.stats() == {'hits': 2, 'misses': 1, 'size': 1}
+    assert list(df.columns) == [
+        'Time Difference',
+        'Voltage',
+        'Current Density',
+        'Power',
+        'PCE',
+    ]
+
+
+@pytest.mark.parametrize('file_name, file_type', MPP_FILES)
+def test_resume_appended_rows(monkeypatch, upload_archive, file_name, file_type):
+    with open(os.path.join(DATA_DIR, file_name), 'rb') as f:
+        content = f.read()
+    directory = upload_archive.m_context.directory
+    path = os.path.join(directory, 'live.mpp.txt')
+    # stop in the middle of a line, like a file that is being written
+    cut = content.index(b'\n', len(content) // 2) + 4
+    with open(path, 'wb') as f:
+        f.write(content[:cut])
+
+    _, first, _ = read_mpp_file(upload_archive, 'live.mpp.txt', resumable=True)
+    with open(path, 'ab') as f:
+        f.write(content[cut:])
+    with open(path) as f:
+        expected_header, expected, _ = read_mpp_data(f)
+    parsed_rows = []
+    read_columns = KIT_mpp_parser._read_columns
+
+    def counting_read_columns(*args, **kwargs):
+        df = read_columns(*args, **kwargs)
+        parsed_rows.append(len(df))
+        return df
+
+    monkeypatch.setattr(KIT_mpp_parser, '_read_columns', counting_read_columns)
+    rewrites = []
+    monkeypatch.setattr(
+        KIT_mpp_parser, 'write_hdf5_arrays', lambda *args, **kw: rewrites.append(args)
+    )
+    # the encoding is kept, so the part read before is not read again
+    monkeypatch.setattr(raw_files, 'detect_encoding', pytest.fail)
+    header_dict, df, read_type = read_mpp_file(
+        upload_archive, 'live.mpp.txt', resumable=True
+    )
+
+    assert read_type == file_type
+    assert header_dict == expected_header
+    pd.testing.assert_frame_equal(df, expected)
+    assert len(first) < len(df)
+    assert parsed_rows == [len(df) - len(first) + 1]
+    # the kept rows are extended in place, not written again
+    assert rewrites == []
+    rows_file = os.path.join(directory, parsed_rows_file_name('live.mpp.txt'))
+    with h5py.File(rows_file, 'r') as h5:
+        assert h5.attrs['rows'] == len(df)
+        for i, column in enumerate(df.columns):
+            np.testing.assert_array_equal(h5[f'column_{i}'][()], df[column])
+
+
+def test_resume_rewritten_file(upload_archive):
+    with open(os.path.join(DATA_DIR, MPP_FILES[1][0]), 'rb') as f:
+        content = f.read()
+    path = os.path.join(upload_archive.m_context.directory, 'live.mpp.txt')
+    with open(path, 'wb') as f:
+        f.write(content)
+    read_mpp_file(upload_archive, 'live.mpp.txt', resumable=True)
+
+    rewritten = content.replace(b'Thu Jan 9', b'Fri Jan 10')
+    with open(path, 'wb') as f:
+        f.write(rewritten + b'1.0\t2.0\t3.0\t4.0\t5.0\t0\t100\n')
+    header_dict, df, _ = read_mpp_file(upload_archive, 'live.mpp.txt', resumable=True)
+
+    assert header_dict['datetime'].startswith('Fri Jan 10')
+    assert df['Time'].iloc[-1] == 1.0
+
+
+def test_text_column(monkeypatch):
+    filedata = (
+        'PURI IV Test Software Version: 1.0\n'
+        'Test start time: 20250109_17:10:21\n'
+        '\n'
+        'Time(s), Voltage(V), Status\n'
+        '0, 1.0, ok\n'
+        '1, 1.1, ok\n'
+        '2, 1.2, drift\n'
+    )
+    monkeypatch.setattr(KIT_mpp_parser, 'MPP_CHUNK_ROWS', 2)
+
+    header_dict, df, file_type = get_mpp_data(filedata)
+
+    assert file_type == 'tflpuri'
+    assert header_dict['test_start_time'] == '20250109_17:10:21'
+    assert list(df.columns) == ['Time(s)', 'Voltage(V)', 'Status']
+    assert df['Voltage(V)'].tolist() == [1.0, 1.1, 1.2]
+    assert df['Status'].tolist() == [' ok', ' ok', ' drift']
+
+
+def test_infer_column_map():
+    df = pd.DataFrame(
+        {
+            'Time(s)': [0.0, 1.0],
+            'Voltage(V)': [1.0, 1.1],
+            'Current density(mA/cm2)': ['20.1', 'n/a'],
+            'Power density(mW/cm2)': [20.1, 22.0],
+        }
+    )
+
+    column_map = infer_column_map('tflpuri', df)
+    values = numeric_columns(df, column_map, ['time', 'current', 'power'])
+
+    assert column_map == {
+        'time': 'Time(s)',
+        'voltage': 'Voltage(V)',
+        'current': 'Current density(mA/cm2)',
+        'power': 'Power density(mW/cm2)',
+    }
+    assert infer_column_map('tflpuri', df.head(1)) is column_map
+    assert values['current'].dtype == np.float64
+    assert np.isnan(values['current'][1])
+    assert values['power'].tolist() == [20.1, 22.0]
+
+
+def test_infer_column_map_by_value():
+    df = pd.DataFrame(
+        {
+            'index': [1, 2, 3],
+            'ms': [np.nan, 1.7e12, 1.7e12 + 1000],
+            'started': ['2025-01-09 17:10:21'] * 3,
+            'U': [1.0, 1.1, 1.2],
+        }
+    )
+
+    column_map = infer_column_map('puri', df)
+    # the same names with other values, the map of the first file does not fit
+    other = df.assign(ms=['2025-01-09 17:10:21'] * 3, started=[1.7e12] * 3)
+
+    assert column_map['timestamp'] == 'ms'
+    assert column_map['datetime'] == 'started'
+    assert column_map['power'] is None
+    assert infer_column_map('puri', other)['timestamp'] == 'started'
+    assert infer_column_map('puri', other)['datetime'] == 'ms'
+
+
+def test_puri_datetime_fallback():
+    df = pd.DataFrame(
+        {
+            'ms': [1.7e12, 1.7e12 + 1000],
+            'Date': ['09.01.2025 17:10', '09.01.2025 17:11'],
+            'Power': [20.0, 20.1],
+        }
+    )
+    track = SimpleNamespace()
+
+    get_mpp_archive({}, 'puri', df, track)
+
+    assert track.datetime == '09.01.2025 17:10'
+    assert track.time.tolist() == [0.0, 1.0]
+
+
+def test_unrecognized_file():
+    with pytest.raises(TypeError):
+        get_mpp_data('Time\tPower\n0\t1\n')
+
+
+def test_stability_metrics():
+    time = np.arange(0.0, 20_000.0, 2.0)
+    # a burn-in to 20 % within 100 s, then an exponential decay
+    efficiency = np.where(time < 100, 0.2 * time, 20 * np.exp(-1e-4 * (time - 100)))
+    efficiency[500] = np.nan
+
+    metrics = stability_metrics(time + 50, efficiency)
+
+    chunked = stability_metrics(time + 50, efficiency, chunk_rows=777)
+    assert metrics == pytest.approx(chunked)
+    assert metrics['maximum'] == 20
+    assert metrics['time_of_maximum'] == 100
+    # after the 5 min burn-in the 5 min mean peaks at 600 s, at the value of
+    # 450 s, and lags the decay by 150 s
+    smoothed_peak_time = 450
+    assert metrics['t95'] == pytest.approx(
+        smoothed_peak_time + 150 - np.log(0.95) * 1e4, abs=4
+    )
+    assert metrics['t80'] == pytest.approx(
+        smoothed_peak_time + 150 - np.log(0.8) * 1e4, abs=4
+    )
+    assert metrics['drift_rate'] < 0
+    last_hour = time >= time[-1] - 3600
+    assert metrics['final_mean'] == pytest.approx(efficiency[last_hour].mean() / 20)
+    assert stability_metrics(time, np.full_like(time, np.nan)) == {}
+
+
+def test_stability_ignores_spikes():
+    time = np.arange(0.0, 20_000.0, 2.0)
+    efficiency = 20 * np.exp(-1e-4 * time)
+    spiky = efficiency.copy()
+    # a burn-in overshoot and a single dropped point later on
+    spiky[:5] = 40
+    spiky[1_000] = 1
+
+    metrics = stability_metrics(time, spiky, chunk_rows=100)
+
+    expected = stability_metrics(time, efficiency)
+    assert metrics['t95'] == pytest.approx(expected['t95'], abs=4)
+    assert metrics['t80'] == pytest.approx(expected['t80'], abs=4)
+    assert metrics['t95'] > -np.log(0.95) * 1e4
+
+
+def test_stability_decay_rate():
+    time = np.linspace(0, 10_000, 1_000)
+
+    metrics = stability_metrics(time, 18 * np.exp(-2e-5 * time), chunk_rows=64)
+
+    assert metrics['decay_rate'] == pytest.approx(2e-5)
+    assert metrics['decay_r_squared'] == pytest.approx(1)
+    assert metrics['t80'] is None
+
+
+class Track(MSection):
+    data_file = Quantity(type=str)
+    time = Quantity(type=np.float64, shape=['*'], unit='s')
+    power_density = Quantity(type=np.float64, shape=['*'], unit='mW/cm^2')
+    efficiency = Quantity(type=np.float64, shape=['*'])
+    full_data_file = Quantity(type=str)
+    full_data_points = Quantity(type=int)
+    time_hdf5 = Quantity(type=HDF5Reference)
+
+
+def test_envelope_indices():
+    rng = np.random.default_rng(0)
+    power = rng.normal(20, 0.1, 100_000)
+    power[12_345] = 30
+    power[54_321] = np.nan
+    power[67_890] = 5
+    voltage = np.linspace(1.1, 0.9, 100_000)
+
+    indices = envelope_indices([power, voltage], 1_000)
+
+    assert len(indices) <= 1_000
+    assert {0, 12_345, 67_890, 99_999} <= set(indices)
+    assert np.all(np.diff(indices) > 0)
+    assert len(envelope_indices([power[:500]], 1_000)) == 500
+
+
+def test_decimate_mpp_archive(upload_archive):
+    time = np.arange(50_000.0)
+    power = 20 - time / 10_000
+    track = Track(
+        data_file='track.mpp.txt', time=time, power_density=power, efficiency=power
+    )
+
+    assert decimate_mpp_archive(upload_archive, track, 2_000)
+
+    assert track.full_data_file == 'track.mpp.txt.h5'
+    assert track.time_hdf5 == 'track.mpp.txt.h5#/time'
+    assert track.full_data_points == 50_000
+    assert len(track.time) <= 2_000
+    assert track.power_density[0].magnitude == power[0]
+    directory = upload_archive.m_context.directory
+    with h5py.File(os.path.join(directory, track.full_data_file)) as h5:
+        assert np.array_equal(h5['time'][()], time)
+        assert np.array_equal(h5['power_density'][()], power)
+        assert h5['time'].attrs['units'] == 'second'
+        assert 'units' not in h5['efficiency'].attrs
@@ -3,8 +3,10 @@ import os
 import nomad
 import pytest
 from nomad.client import normalize_all, parse
+from nomad.config import config
 
 from nomad_perotf.schema_packages.perotf_package import (
+    package_option,
     peroTF_CR_SolSimBox_JVmeasurement,
     peroTF_CR_SolSimBox_MPPTracking,
     peroTF_TFL_GammaBox_JVmeasurement,
@@ -84,6 +86,13 @@ def parsed_archive(request, monkeypatch):
     yield get_archive(request.param, monkeypatch)
 
 
+def test_package_option_without_plugins(monkeypatch):
+    monkeypatch.setattr(config, 'plugins', None)
+
+    assert package_option('hdf5_array_points', 0) == 0
+    assert package_option('resume_mpp_files') is None
+
+
 def test_normalize_all(parsed_archive, monkeypatch):
     normalize_all(parsed_archive)
     delete_json()
@@ -0,0 +1,217 @@
+import io
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from nomad_perotf.schema_packages.raw_files import (
+    ENCODING_PREFIX_BYTES,
+    JV_SCAN_INDEX_MAX_AGE,
+    PREFIX_HASH_BYTES,
+    complete_lines_end,
+    detect_encoding,
+    find_reverse_jv_scan,
+    io_counters,
+    open_raw_text,
+    prefix_hash,
+    read_raw_text,
+    reset_raw_file_cache,
+)
+
+DATA_DIR = os.path.join('tests', 'data')
+
+
+class CountingContext:
+    upload_id = 'test_upload'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.reads = {}
+        self.listings = 0
+
+    @property
+    def upload_files(self):
+        return self
+
+    def raw_directory_list(self):
+        self.listings += 1
+        return [SimpleNamespace(path=path) for path in os.listdir(self.directory)]
+
+    def raw_file(self, path, *args, **kwargs):
+        f = open(os.path.join(self.directory, path), *args, **kwargs)
+        read = f.read
+
+        def counting_read(*read_args):
+            self.reads[path] = self.reads.get(path, 0) + 1
+            return read(*read_args)
+
+        f.read = counting_read
+        return f
+
+
+class Archive:
+    def __init__(self, context):
+        self.m_context = context
+
+
+@pytest.fixture
+def archive():
+    reset_raw_file_cache()
+    yield Archive(CountingContext(DATA_DIR))
+    reset_raw_file_cache()
+
+
+@pytest.mark.parametrize(
+    'file_name',
+    [
+        'KIT_DaBa_20230202_Batch-1_0_7.px7_mid.jv.csv',
+        'UserGivenName_pX1_fwd_lt_lp0_20250109T164058.jv.txt',
+        'UserGivenName_pX1_MPPT_lt_lp0_20250109T171021.mpp.txt',
+    ],
+)
+def test_read_raw_text_matches_text_mode(archive, file_name):
+    with open(os.path.join(DATA_DIR, file_name), encoding='utf-8') as f:
+        expected = f.read()
+
+    assert read_raw_text(archive, file_name) == expected
+
+
+def test_one_read_per_file(archive):
+    from nomad_perotf.schema_packages.parsers.KIT_jv_parser import (
+        get_jv_data,
+        identify_file_type,
+    )
+
+    file_name = 'UserGivenName_pX1_fwd_lt_lp0_20250109T164058.jv.txt'
+    # what peroTF_JVmeasurement.normalize does with the forward scan
+    identify_file_type(read_raw_text(archive, file_name))
+    get_jv_data(read_raw_text(archive, file_name))
+
+    assert archive.m_context.reads == {file_name: 1}
+    assert io_counters['reads'] == 1
+    assert io_counters['cache_hits'] == 1
+
+
+def test_modified_file_is_read_again(archive, tmp_path):
+    archive.m_context.directory = tmp_path
+    path = tmp_path / 'sample.jv.txt'
+    path.write_text('first')
+    assert read_raw_text(archive, 'sample.jv.txt') == 'first'
+
+    path.write_text('second')
+    os.utime(path, ns=(0, 0))
+    assert read_raw_text(archive, 'sample.jv.txt') == 'second'
+    assert archive.m_context.reads == {'sample.jv.txt': 2}
+
+
+def test_find_reverse_jv_scan(archive):
+    forward = 'UserGivenName_pX1_fwd_lt_lp0_20250109T164058.jv.txt'
+
+    for _ in range(2):
+        reverse = find_reverse_jv_scan(archive, forward)
+        assert reverse == 'UserGivenName_pX1_rev_lt_lp0_20250109T164106.jv.txt'
+    assert archive.m_context.listings == 1
+
+
+def test_find_reverse_jv_scan_picks_closest(archive, tmp_path):
+    archive.m_context.directory = tmp_path
+    for name in [
+        'A_pX1_rev_lt_lp0_20250109T164000.jv.txt',
+        'A_pX1_rev_lt_lp0_20250109T164020.jv.txt',
+        'A_pX1_rev_lt_lp0_20250109T164030.jv.txt',
+        'A_pX1_rev_lt_lp0_20250109T164200.jv.txt',
+        'B_pX1_rev_lt_lp0_20250109T164011.jv.txt',
+    ]:
+        (tmp_path / name).touch()
+
+    forward = 'A_pX1_fwd_lt_lp0_20250109T164010.jv.txt'
+    reverse = find_reverse_jv_scan(archive, forward)
+
+    assert reverse == 'A_pX1_rev_lt_lp0_20250109T164000.jv.txt'
+    assert find_reverse_jv_scan(archive, 'C' + forward[1:]) is None
+    assert archive.m_context.listings == 1
+
+
+def test_find_reverse_jv_scan_expires(monkeypatch, archive, tmp_path):
+    archive.m_context.directory = tmp_path
+    (tmp_path / 'A_pX1_rev_lt_lp0_20250109T164030.jv.txt').touch()
+    forward = 'A_pX1_fwd_lt_lp0_20250109T164010.jv.txt'
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+
+    assert find_reverse_jv_scan(archive, forward).endswith('164030.jv.txt')
+    (tmp_path / 'A_pX1_rev_lt_lp0_20250109T164030.jv.txt').unlink()
+    (tmp_path / 'A_pX1_rev_lt_lp0_20250109T164015.jv.txt').touch()
+    now[0] += JV_SCAN_INDEX_MAX_AGE + 1
+
+    assert find_reverse_jv_scan(archive, forward).endswith('164015.jv.txt')
+    assert archive.m_context.listings == 2
+
+
+@pytest.mark.parametrize(
+    'file_name',
+    [
+        'KIT_DaBa_20230219_Experimnt-AB_2_2_MPP.1.mpp.csv',
+        'UserGivenName_pX1_MPPT_lt_lp0_20250109T171021.mpp.txt',
+    ],
+)
+def test_open_raw_text_matches_read_raw_text(archive, file_name):
+    with open_raw_text(archive, file_name) as f:
+        first_line = f.readline()
+        text = first_line + f.read()
+
+    assert text == read_raw_text(archive, file_name)
+    assert io_counters['bytes_read'] == 2 * os.path.getsize(
+        os.path.join(DATA_DIR, file_name)
+    )
+
+
+def test_complete_lines_end():
+    assert complete_lines_end(io.BytesIO(b'a\r\nb\n0.5\t1')) == 5
+    assert complete_lines_end(io.BytesIO(b'a\n')) == 2
+    assert complete_lines_end(io.BytesIO(b'x' * 100_000)) == 0
+
+
+def test_prefix_hash():
+    data = b'header\n' + b'1\t2\n' * PREFIX_HASH_BYTES
+    offset = len(data)
+    grown = io.BytesIO(data + b'3\t4\n')
+
+    assert prefix_hash(grown, offset) == prefix_hash(io.BytesIO(data), offset)
+    assert prefix_hash(grown, offset) != prefix_hash(grown, offset + 4)
+    for changed in (b'Header' + data[6:], data[:-2] + b'5\n'):
+        assert prefix_hash(io.BytesIO(changed), offset) != prefix_hash(grown, offset)
+
+
+def late_non_ascii_text():
+    # a PURI like log whose first non-ASCII character comes after the prefix
+    rows = ''.join(f'{i},0.5,1.2,18.1\n' for i in range(8_000))
+    return f'# Time,V,J,PCE\n{rows}# chamber at 25 °C\n1,0.5,1.2,18.1\n'
+
+
+def test_detect_encoding():
+    text = late_non_ascii_text()
+    assert text.index('°') > ENCODING_PREFIX_BYTES
+
+    assert detect_encoding(io.BytesIO(text.encode('utf-8'))).lower() == 'utf-8'
+    assert detect_encoding(io.BytesIO(b'a,b\n' * 50_000)) == 'utf-8'
+    assert detect_encoding(io.BytesIO(b''), 'latin-1') == 'latin-1'
+
+
+def test_read_late_non_ascii(tmp_path):
+    text = late_non_ascii_text()
+    (tmp_path / 'late.mpp.csv').write_bytes(text.encode('utf-8'))
+    reset_raw_file_cache()
+
+    assert (
+        read_raw_text(Archive(CountingContext(str(tmp_path))), 'late.mpp.csv') == text
+    )
+
+
+def test_open_late_non_ascii(tmp_path):
+    text = late_non_ascii_text()
+    (tmp_path / 'late.mpp.csv').write_bytes(text.encode('utf-8'))
+
+    with open_raw_text(Archive(CountingContext(str(tmp_path))), 'late.mpp.csv') as f:
+        assert f.read() == text
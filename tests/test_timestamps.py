@@ -0,0 +1,51 @@
+import pandas as pd
+
+from nomad_perotf.schema_packages.parsers.timestamps import (
+    JV_DATETIME_FORMATS,
+    TimestampResolver,
+    archive_datetime,
+    mpp_timestamps,
+)
+
+
+def test_learns_format_per_key():
+    resolver = TimestampResolver(JV_DATETIME_FORMATS)
+
+    parsed = resolver.parse('2024-05-01 13:30:00', key='labview')
+
+    assert archive_datetime(parsed) == '2024-05-01 13:30:00.000000'
+    assert resolver.candidates('labview')[0] == '%Y-%m-%d %H:%M:%S'
+    assert resolver.candidates('python') == JV_DATETIME_FORMATS
+    assert resolver.parse('01.05.2024', key='labview') is None
+    assert resolver.parse(None) is None
+
+
+def test_find_format():
+    resolver = TimestampResolver(JV_DATETIME_FORMATS)
+
+    assert resolver.find_format(' 2024-05-01 13:30:00', key='labview') == (
+        '%Y-%m-%d %H:%M:%S'
+    )
+    assert resolver.candidates('labview')[0] == '%Y-%m-%d %H:%M:%S'
+    assert resolver.find_format('01.05.2024') is None
+    assert resolver.find_format(None) is None
+
+
+def test_preferred_formats():
+    assert mpp_timestamps.candidates('tflpuri')[0] == '%Y%m%d_%H:%M:%S'
+    assert archive_datetime(
+        mpp_timestamps.parse('Thu Jan 9 17:10:21 2025', key='python')
+    ) == ('2025-01-09 17:10:21.000000')
+
+
+def test_parse_column():
+    resolver = TimestampResolver(['%d.%m.%Y %H:%M', '%Y-%m-%d %H:%M:%S'])
+    values = pd.Series([None, '2025-01-09 17:10:21 ', 'invalid', '2025-01-09 17:10:22'])
+
+    parsed = resolver.parse_column(values, key='puri')
+
+    assert resolver.candidates('puri')[0] == '%Y-%m-%d %H:%M:%S'
+    assert parsed.isna().tolist() == [True, False, True, False]
+    assert archive_datetime(parsed[1]) == '2025-01-09 17:10:21.000000'
+    assert archive_datetime(parsed[0]) is None
+    assert resolver.parse_column(['soon']).isna().all()